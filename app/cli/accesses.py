@@ -0,0 +1,65 @@
+"""
+Mantenimiento de las particiones mensuales de `resource_accesses`.
+
+Uso (por ejemplo, desde un cron diario):
+    python -m app.cli.accesses partitions [--ahead MESES]
+    python -m app.cli.accesses archive [--retention-months MESES] [--dir DIR] [--dry-run]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.config.settings import get_settings
+from app.db.connection import engine
+from app.db.partitions import archive_partitions, ensure_partitions
+
+settings = get_settings()
+
+
+def partitions(months_ahead: int) -> int:
+    created = ensure_partitions(engine, months_ahead)
+    for name in created:
+        print(f"Creada {name}")
+    if not created:
+        print("Las particiones ya existen")
+    return 0
+
+
+def archive(retention_months: int, archive_dir: Path, dry_run: bool) -> int:
+    archived = archive_partitions(engine, retention_months, archive_dir, dry_run)
+    for path in archived:
+        print(f"{'Se archivaría' if dry_run else 'Archivada'} en {path}")
+    if not archived:
+        print("No hay particiones fuera del periodo de retención")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Particiones de resource_accesses")
+    commands = parser.add_subparsers(dest="command", required=True)
+    partitions_parser = commands.add_parser(
+        "partitions", help="Crea las particiones del mes actual y siguientes"
+    )
+    partitions_parser.add_argument(
+        "--ahead", type=int, default=settings.access_partitions_ahead
+    )
+    archive_parser = commands.add_parser(
+        "archive", help="Archiva en .csv.gz y borra las particiones antiguas"
+    )
+    archive_parser.add_argument(
+        "--retention-months", type=int, default=settings.access_retention_months
+    )
+    archive_parser.add_argument(
+        "--dir", type=Path, default=Path(settings.access_archive_dir)
+    )
+    archive_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "partitions":
+        return partitions(args.ahead)
+    return archive(args.retention_months, args.dir, args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
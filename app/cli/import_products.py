@@ -0,0 +1,84 @@
+"""
+Importación masiva de productos con sus regiones y contenidos.
+
+El fichero es un array JSON o NDJSON (un producto por línea) con el mismo
+formato que `POST /api/v1/products/import`:
+    {"image": "...", "regions": ["ES"], "contents": [{"lan": "es-ES", "name": "...", "description": "..."}]}
+
+Uso:
+    python -m app.cli.import_products productos.json [--atomic] [--batch-size N]
+
+Por defecto todo el fichero se inserta en una sola transacción; con
+--batch-size se confirma cada N productos.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.db.connection import unit_of_work
+from app.repository.adapters import repository_for
+from app.repository.product_repository import ProductRepository
+from app.services.product_import import import_products, validate_products
+
+
+def read_items(path: Path) -> List[Any]:
+    content = path.read_text(encoding="utf-8")
+    if content.lstrip().startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+async def run(items: List[Any], atomic: bool, batch_size: Optional[int]) -> int:
+    # En modo atómico se valida todo el fichero antes de insertar el primer lote
+    if atomic:
+        _, errors = validate_products(items)
+        if errors:
+            for error in errors:
+                print(f"#{error.index}: {'; '.join(error.errors)}", file=sys.stderr)
+            print("No se ha importado ningún producto", file=sys.stderr)
+            return 1
+
+    batch_size = batch_size or max(len(items), 1)
+    imported = 0
+    failed = 0
+    for start in range(0, len(items), batch_size):
+        # Cada lote es una unidad de trabajo: se confirma entero o no se confirma
+        with unit_of_work() as db:
+            result = await import_products(
+                repository_for(db, ProductRepository),
+                items[start : start + batch_size],
+            )
+        imported += len(result.imported)
+        failed += len(result.errors)
+        for error in result.errors:
+            print(
+                f"#{start + error.index}: {'; '.join(error.errors)}",
+                file=sys.stderr,
+            )
+    print(f"Importados {imported} productos, {failed} con errores")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Importación masiva de productos")
+    parser.add_argument("file", type=Path, help="Fichero JSON o NDJSON")
+    parser.add_argument(
+        "--atomic",
+        action="store_true",
+        help="No importar nada si algún producto es inválido",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Productos por transacción (por defecto, todo el fichero)",
+    )
+    args = parser.parse_args()
+    return asyncio.run(run(read_items(args.file), args.atomic, args.batch_size))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
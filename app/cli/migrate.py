@@ -0,0 +1,93 @@
+"""
+Gestión de las migraciones versionadas del esquema.
+
+Uso:
+    python -m app.cli.migrate status
+    python -m app.cli.migrate upgrade [--to VERSION]
+    python -m app.cli.migrate baseline [--to VERSION]
+    python -m app.cli.migrate check-plans
+"""
+
+import argparse
+import sys
+
+from app.db.connection import create_new_db_session, engine
+from app.db.migrator import Migrator
+from app.db.query_plans import check_query_plans
+
+
+def status(migrator: Migrator) -> int:
+    for migration, applied in migrator.status():
+        if applied is None:
+            state = "pendiente"
+        elif applied.checksum != migration.checksum:
+            state = f"aplicada {applied.applied_at:%Y-%m-%d %H:%M} (MODIFICADA)"
+        else:
+            state = f"aplicada {applied.applied_at:%Y-%m-%d %H:%M}"
+        print(f"{migration.version}  {migration.name:<32} {state}")
+    return 0
+
+
+def upgrade(migrator: Migrator, target: str | None) -> int:
+    applied = migrator.upgrade(target)
+    for migration in applied:
+        print(f"Aplicada {migration.version}_{migration.name}")
+    if not applied:
+        print("No hay migraciones pendientes")
+    return 0
+
+
+def baseline(migrator: Migrator, target: str | None) -> int:
+    for migration in migrator.baseline(target):
+        print(f"Registrada sin ejecutar {migration.version}_{migration.name}")
+    return 0
+
+
+def check_plans() -> int:
+    db = create_new_db_session()
+    try:
+        results = check_query_plans(db)
+    finally:
+        db.close()
+
+    failures = 0
+    for result in results:
+        if result.ok:
+            print(f"OK    {result.name}")
+        else:
+            failures += 1
+            tables = ", ".join(result.sequential_scans)
+            print(f"FALLO {result.name}: Seq Scan en {tables}")
+            print(f"      {' '.join(result.statement.split())}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Migraciones del esquema")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Muestra las migraciones y su estado")
+    upgrade_parser = commands.add_parser("upgrade", help="Aplica las pendientes")
+    upgrade_parser.add_argument("--to", dest="target", help="Última versión a aplicar")
+    baseline_parser = commands.add_parser(
+        "baseline", help="Registra como aplicadas (BD creada con database.sql)"
+    )
+    baseline_parser.add_argument(
+        "--to", dest="target", help="Última versión a registrar"
+    )
+    commands.add_parser(
+        "check-plans", help="Comprueba con EXPLAIN que las consultas usan índices"
+    )
+    args = parser.parse_args()
+
+    migrator = Migrator(engine)
+    if args.command == "status":
+        return status(migrator)
+    if args.command == "upgrade":
+        return upgrade(migrator, args.target)
+    if args.command == "baseline":
+        return baseline(migrator, args.target)
+    return check_plans()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Genera datos sintéticos reproducibles para las pruebas de rendimiento.
+
+Uso:
+    python -m app.cli.seed --preset benchmark --truncate
+    python -m app.cli.seed --preset large --seed 7 --anchor 2026-01-01
+    python -m app.cli.seed --preset small --accesses 0
+
+Con la misma semilla, el mismo plan y la misma --anchor se generan exactamente
+las mismas filas. --truncate vacía antes todas las tablas de datos (usuarios
+incluidos; la cuenta admin@example.com se vuelve a crear).
+"""
+
+import argparse
+import sys
+from dataclasses import replace
+from datetime import date
+
+import psycopg2
+
+from app.db.connection import engine
+from app.db.schemas.models import utcnow
+from app.db.seeding import PRESETS, Seeder
+
+# Opción de la línea de comandos -> campo de SeedPlan
+_OVERRIDES = {
+    "users": "users",
+    "products": "products",
+    "blogs": "blogs",
+    "comments": "blog_comments",
+    "threads": "threads",
+    "thread_comments": "thread_comments",
+    "product_requests": "product_requests",
+    "blog_requests": "blog_requests",
+    "accesses": "resource_accesses",
+}
+
+
+def print_progress(table: str, rows: int, seconds: float) -> None:
+    rate = rows / seconds if seconds else 0.0
+    print(f"{table:<22} {rows:>11} filas  {seconds:8.1f} s  {rate:10.0f} filas/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    for option in _OVERRIDES:
+        parser.add_argument(
+            f"--{option.replace('_', '-')}", type=int, dest=option, default=None
+        )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--anchor",
+        type=date.fromisoformat,
+        default=utcnow().date(),
+        help="Fecha de referencia (por defecto hoy); los datos la preceden",
+    )
+    parser.add_argument("--days", type=int, default=365, help="Días de historia")
+    parser.add_argument("--password", default="seed-password")
+    parser.add_argument("--truncate", action="store_true")
+    args = parser.parse_args()
+
+    plan = replace(
+        PRESETS[args.preset],
+        **{
+            field: getattr(args, option)
+            for option, field in _OVERRIDES.items()
+            if getattr(args, option) is not None
+        },
+    )
+    try:
+        seeder = Seeder(engine, plan, args.seed, args.anchor, args.days, args.password)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    try:
+        counts = seeder.run(truncate=args.truncate, progress=print_progress)
+    except psycopg2.IntegrityError as e:
+        print(
+            f"{e.diag.message_primary}: ya hay datos de esta semilla "
+            "(usa --truncate u otra --seed)",
+            file=sys.stderr,
+        )
+        return 1
+    print(f"Total: {sum(counts.values())} filas (semilla {args.seed}, {args.anchor})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,9 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from app.services.logger_service import LoggerService
+from app.services.logger_service import get_logger_service
 
-logger = LoggerService()
+logger = get_logger_service()
 
 
 class Settings(BaseSettings):
@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     secret_key: str = "a_very_secret_key"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    principal_cache_size: int = 1024  # 0 desactiva la caché de usuarios autenticados
+    principal_cache_ttl: float = 30.0
+    bcrypt_rounds: int = 12  # Los hashes con otro coste se regeneran al hacer login
+    password_hash_workers: int = 2  # Procesos dedicados a bcrypt
 
     # Database settings
     db_host: str = "192.168.1.135"
@@ -28,6 +32,54 @@ class Settings(BaseSettings):
     db_name: str = "consume_nacional"
     db_user: str = "postgres"
     db_password: str = "password"
+    db_mode: str = "sync"  # "sync" (psycopg2 + threadpool) o "async" (asyncpg)
+
+    # Pagination settings
+    page_size_default: int = 50
+    page_size_max: int = 200
+    export_chunk_size: int = 1000  # Filas por bloque en las exportaciones en streaming
+
+    # Resource access ingestion settings
+    access_batch_max_size: int = 10000  # Accesos por petición en la ingesta por lotes
+    access_partitions_ahead: int = 3  # Particiones mensuales creadas por adelantado
+    access_retention_months: int = 12  # Meses completos que se conservan en la BD
+    access_archive_dir: str = "archive/resource_accesses"
+    access_rollup_write_behind: bool = True  # Contadores de accesos sueltos por lotes
+    access_rollup_flush_interval: float = 1.0
+
+    # Product import settings
+    product_import_max_size: int = 5000  # Productos por petición en la importación
+
+    # Metrics settings (Server-Timing y /metrics)
+    metrics_enabled: bool = False  # /metrics no tiene autenticación
+
+    # Slow query log settings (logs/slow_queries)
+    slow_query_threshold_ms: float = 500.0  # 0 desactiva el log
+    slow_query_sample_rate: float = 1.0  # Fracción de sentencias lentas registradas
+    slow_query_explain_rate: float = 0.0  # Fracción de esas con EXPLAIN ANALYZE
+
+    # Serialization settings
+    fast_json: bool = True  # Listados codificados por pydantic-core sin revalidar
+
+    # Response cache settings (GET del catálogo)
+    response_cache_enabled: bool = True
+    response_cache_ttl: float = 30.0
+    response_cache_stale_ttl: float = 300.0
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Search settings
+    search_backend: str = "postgres"  # "postgres" (tsvector + GIN) o "memory"
+
+    # Logging settings
+    log_buffered: bool = True
+    log_queue_size: int = 10000
+    log_batch_size: int = 500
+    log_flush_interval: float = 1.0
+    log_overflow_policy: str = "drop"  # "drop" o "block"
+
+    # Likes settings
+    like_write_behind: bool = False  # Acumular likes y escribirlos por lotes
+    like_flush_interval: float = 1.0
 
     # Blob storage settings
     blob_url: str = "https://bucket.lucantel.es/consume-images/"
@@ -51,6 +103,15 @@ class Settings(BaseSettings):
         )
         return postgres_url
 
+    @property
+    def async_database_url(self) -> str:
+        """Gets the asyncpg database URL used by the async engine.
+
+        Returns:
+            str: Async database URL
+        """
+        return self.database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,17 +1,25 @@
 import traceback
-from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from time import perf_counter
+from typing import AsyncIterator, Callable, Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.config.settings import get_settings
-from app.services.logger_service import LoggerService
+from app.db.slow_queries import is_slow, log_slow_statement
+from app.services.logger_service import get_logger_service
+from app.services.metrics import record_statement
 
 settings = get_settings()
-logger = LoggerService()
+logger = get_logger_service()
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
+SQLALCHEMY_ASYNC_DATABASE_URL = settings.async_database_url
 
 try:
     engine = create_engine(
@@ -21,6 +29,13 @@ try:
         max_overflow=20,  # Conexiones adicionales permitidas
         pool_recycle=3600,  # Recicla conexiones después de una hora
     )
+    async_engine = create_async_engine(
+        SQLALCHEMY_ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=3600,
+    )
 except Exception as e:
     logger.log(
         entry={
@@ -32,13 +47,81 @@ except Exception as e:
     )
     raise
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """
+    Mide cada sentencia enviada por el engine y la suma a la petición en curso.
+
+    Las que superan `slow_query_threshold_ms` se registran en el log de
+    sentencias lentas.
+
+    Args:
+        sync_engine (Engine): Engine síncrono (o el `sync_engine` del asíncrono)
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_start", []).append(perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_statement(conn, cursor, statement, parameters, context, executemany):
+        duration = perf_counter() - conn.info["statement_start"].pop()
+        record_statement(duration)
+        if is_slow(duration):
+            log_slow_statement(
+                conn, statement, parameters, context, executemany, duration
+            )
+
+
+if settings.metrics_enabled or settings.slow_query_threshold_ms > 0:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
+# Los valores por defecto (ids, fechas) se generan en el cliente: tras el commit
+# los objetos ya tienen todos sus valores y no hace falta volver a leerlos
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# Clave de `Session.info` con las acciones pendientes del commit
+AFTER_COMMIT_KEY = "after_commit"
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Ejecuta `callback` cuando se confirme la transacción actual de la sesión.
+
+    Los repositorios solo hacen flush; los efectos fuera de la base de datos
+    (invalidar cachés, actualizar el índice de búsqueda) se aplazan hasta que
+    el commit de la unidad de trabajo los hace visibles. Si la transacción se
+    deshace, se descartan.
+
+    Args:
+        db (Session): Sesión síncrona (también la de una `AsyncSession`)
+        callback (Callable[[], None]): Acción sin acceso a la base de datos
+    """
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(db: Session) -> None:
+    for callback in db.info.pop(AFTER_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(db: Session) -> None:
+    db.info.pop(AFTER_COMMIT_KEY, None)
+
+
 def get_db():
     """Dependency para obtener una sesión de base de datos."""
     db = SessionLocal()
@@ -58,10 +141,9 @@ def get_db():
         db.close()
 
 
-@asynccontextmanager
-async def get_async_db():
-    """Contexto asíncrono para obtener una sesión de base de datos."""
-    db = SessionLocal()
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency para obtener una sesión asíncrona (asyncpg) de base de datos."""
+    db = AsyncSessionLocal()
     try:
         yield db
     except SQLAlchemyError as e:
@@ -74,6 +156,67 @@ async def get_async_db():
             filename="db_errors",
         )
         raise
+    finally:
+        await db.close()
+
+
+async def get_session() -> AsyncIterator[Session | AsyncSession]:
+    """
+    Dependency que entrega la unidad de trabajo de la petición.
+
+    La sesión (síncrona o asíncrona según `db_mode`) se comparte entre todas las
+    dependencias y repositorios de la petición, que solo hacen flush: toda la
+    petición es una única transacción que se confirma al terminar la ruta y se
+    deshace si la ruta lanza una excepción.
+    """
+    if settings.db_mode == "async":
+        db: Session | AsyncSession = AsyncSessionLocal()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+        if db.in_transaction():
+            await _run_session(db, "commit")
+    except SQLAlchemyError as e:
+        await _run_session(db, "rollback")
+        logger.log(
+            entry={
+                "error": "Error en la sesión de base de datos",
+                "details": str(e),
+                "traceback": traceback.format_exc(),
+            },
+            filename="db_errors",
+        )
+        raise
+    except Exception:
+        await _run_session(db, "rollback")
+        raise
+    finally:
+        # Devolver la conexión al pool sin bloquear el bucle de eventos
+        await _run_session(db, "close")
+
+
+async def _run_session(db: Session | AsyncSession, method: str) -> None:
+    if isinstance(db, AsyncSession):
+        await getattr(db, method)()
+    else:
+        await run_in_threadpool(getattr(db, method))
+
+
+@contextmanager
+def unit_of_work() -> Iterator[Session]:
+    """
+    Sesión síncrona con una única transacción, para trabajos fuera de una petición.
+
+    Confirma al salir del bloque y deshace si se lanza una excepción.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -0,0 +1,8 @@
+-- Índices para la paginación por cursor (creation_date, id)
+CREATE INDEX IF NOT EXISTS ix_users_creation_date_id ON users (creation_date, id);
+CREATE INDEX IF NOT EXISTS ix_products_creation_date_id ON products (creation_date, id);
+CREATE INDEX IF NOT EXISTS ix_blogs_creation_date_id ON blogs (creation_date, id);
+CREATE INDEX IF NOT EXISTS ix_product_requests_creation_date_id ON product_requests (creation_date, id);
+CREATE INDEX IF NOT EXISTS ix_blog_requests_creation_date_id ON blog_requests (creation_date, id);
+CREATE INDEX IF NOT EXISTS ix_resource_accesses_access_date_id ON resource_accesses (access_date, id);
+CREATE INDEX IF NOT EXISTS ix_threads_region_id_creation_date_id ON threads (region_id, creation_date, id);
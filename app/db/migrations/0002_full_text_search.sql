@@ -0,0 +1,44 @@
+-- Búsqueda de texto completo sin distinguir acentos
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'en_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION en_unaccent (COPY = english);
+        ALTER TEXT SEARCH CONFIGURATION en_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, english_stem;
+    END IF;
+END
+$$;
+
+ALTER TABLE product_lan_contents ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        CASE lan
+            WHEN 'en-US' THEN
+                setweight(to_tsvector('en_unaccent', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('en_unaccent', coalesce(description, '')), 'B')
+            ELSE
+                setweight(to_tsvector('es_unaccent', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent', coalesce(description, '')), 'B')
+        END
+    ) STORED;
+
+ALTER TABLE blog_lan_contents ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        CASE lan
+            WHEN 'en-US' THEN
+                setweight(to_tsvector('en_unaccent', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('en_unaccent', coalesce(description, '')), 'B')
+            ELSE
+                setweight(to_tsvector('es_unaccent', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent', coalesce(description, '')), 'B')
+        END
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_product_lan_contents_search_vector ON product_lan_contents USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_blog_lan_contents_search_vector ON blog_lan_contents USING GIN (search_vector);
@@ -0,0 +1,32 @@
+-- migrate: no-transaction
+-- Índices sobre claves foráneas y columnas de filtro. Se crean con CONCURRENTLY
+-- para no bloquear las escrituras en una base de datos en producción.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_blog_comments_blog_id ON blog_comments (blog_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_thread_comments_thread_id ON thread_comments (thread_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_product_regions_region_code ON product_regions (region_code, product_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_product_lan_contents_product_id ON product_lan_contents (product_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_blog_lan_contents_blog_id ON blog_lan_contents (blog_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resource_accesses_user_id ON resource_accesses (user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resource_accesses_resource ON resource_accesses (resource_type, resource_id);
+-- El login busca por lower(email), así que el índice funcional es único: dos
+-- cuentas cuyo email solo cambia en mayúsculas harían ambigua la búsqueda. Si ya
+-- existen, la migración falla listándolas para unificarlas a mano.
+DO $$
+DECLARE
+    duplicates TEXT;
+BEGIN
+    SELECT string_agg(email, ', ' ORDER BY email) INTO duplicates
+    FROM (
+        SELECT lower(email) AS email
+        FROM users
+        GROUP BY lower(email)
+        HAVING count(*) > 1
+    ) AS repeated;
+    IF duplicates IS NOT NULL THEN
+        RAISE EXCEPTION USING
+            MESSAGE = 'Emails repetidos sin distinguir mayúsculas: ' || duplicates,
+            HINT = 'Unifica o renombra esas cuentas y vuelve a ejecutar la migración';
+    END IF;
+END
+$$;
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower ON users (lower(email));
@@ -0,0 +1,36 @@
+-- Contadores de accesos agregados por hora y por día
+CREATE TABLE IF NOT EXISTS resource_access_hourly (
+    bucket TIMESTAMP NOT NULL,
+    resource_type VARCHAR(255) NOT NULL,
+    resource_id UUID NOT NULL,
+    device_type VARCHAR(10) NOT NULL,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, resource_type, resource_id, device_type)
+);
+
+CREATE TABLE IF NOT EXISTS resource_access_daily (
+    bucket TIMESTAMP NOT NULL,
+    resource_type VARCHAR(255) NOT NULL,
+    resource_id UUID NOT NULL,
+    device_type VARCHAR(10) NOT NULL,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, resource_type, resource_id, device_type)
+);
+
+CREATE INDEX IF NOT EXISTS ix_resource_access_hourly_resource ON resource_access_hourly (resource_type, resource_id, bucket);
+CREATE INDEX IF NOT EXISTS ix_resource_access_daily_resource ON resource_access_daily (resource_type, resource_id, bucket);
+
+-- Rellenar los contadores con los accesos existentes
+INSERT INTO resource_access_hourly (bucket, resource_type, resource_id, device_type, access_count)
+SELECT date_trunc('hour', access_date), resource_type, resource_id, device_type, count(*)
+FROM resource_accesses
+WHERE device_type IS NOT NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT DO NOTHING;
+
+INSERT INTO resource_access_daily (bucket, resource_type, resource_id, device_type, access_count)
+SELECT date_trunc('day', access_date), resource_type, resource_id, device_type, count(*)
+FROM resource_accesses
+WHERE device_type IS NOT NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT DO NOTHING;
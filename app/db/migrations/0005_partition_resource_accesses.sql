@@ -0,0 +1,54 @@
+-- Particionar resource_accesses por mes de access_date. La tabla se recrea:
+-- la clave primaria tiene que incluir la clave de partición.
+LOCK TABLE resource_accesses IN ACCESS EXCLUSIVE MODE;
+ALTER TABLE resource_accesses RENAME TO resource_accesses_unpartitioned;
+
+CREATE TABLE resource_accesses (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID,
+    resource_type VARCHAR(255) NOT NULL,
+    resource_id UUID NOT NULL,
+    access_type VARCHAR(255) NOT NULL,
+    access_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    device_type VARCHAR(10),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
+    FOREIGN KEY (device_type) REFERENCES access_devices(device_type)
+) PARTITION BY RANGE (access_date);
+
+-- Recoge los accesos de meses sin partición hasta que se cree la suya
+CREATE TABLE resource_accesses_default PARTITION OF resource_accesses DEFAULT;
+
+-- Una partición por mes desde el acceso más antiguo hasta 3 meses en el futuro
+DO $$
+DECLARE
+    current_month DATE;
+    last_month DATE := (date_trunc('month', now()) + INTERVAL '3 months')::DATE;
+BEGIN
+    SELECT date_trunc('month', coalesce(min(access_date), now()))::DATE
+    INTO current_month
+    FROM resource_accesses_unpartitioned;
+
+    WHILE current_month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF resource_accesses FOR VALUES FROM (%L) TO (%L)',
+            'resource_accesses_' || to_char(current_month, '"y"YYYY"m"MM'),
+            current_month,
+            (current_month + INTERVAL '1 month')::DATE
+        );
+        current_month := (current_month + INTERVAL '1 month')::DATE;
+    END LOOP;
+END
+$$;
+
+INSERT INTO resource_accesses (id, user_id, resource_type, resource_id, access_type, access_date, device_type)
+SELECT id, user_id, resource_type, resource_id, access_type, coalesce(access_date, CURRENT_TIMESTAMP), device_type
+FROM resource_accesses_unpartitioned;
+
+DROP TABLE resource_accesses_unpartitioned;
+
+-- Índices particionados: cada partición tiene los suyos y se crean al adjuntarla
+ALTER TABLE resource_accesses ADD PRIMARY KEY (id, access_date);
+CREATE INDEX ix_resource_accesses_id ON resource_accesses (id);
+CREATE INDEX ix_resource_accesses_access_date_id ON resource_accesses (access_date, id);
+CREATE INDEX ix_resource_accesses_user_id ON resource_accesses (user_id);
+CREATE INDEX ix_resource_accesses_resource ON resource_accesses (resource_type, resource_id);
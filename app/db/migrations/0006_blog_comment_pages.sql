@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- Paginación de los comentarios de un blog por (creation_date, id). El índice
+-- también sirve los filtros por blog_id, así que sustituye al de la clave foránea.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_blog_comments_blog_id_creation_date_id ON blog_comments (blog_id, creation_date, id);
+DROP INDEX CONCURRENTLY IF EXISTS ix_blog_comments_blog_id;
@@ -0,0 +1,266 @@
+import hashlib
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Los ficheros con esta línea se ejecutan sentencia a sentencia en autocommit
+# (necesario, por ejemplo, para CREATE INDEX CONCURRENTLY)
+NO_TRANSACTION_DIRECTIVE = "-- migrate: no-transaction"
+
+# Identificador del advisory lock que serializa ejecuciones concurrentes
+MIGRATION_LOCK_ID = 7_316_001
+
+_FILENAME_RE = re.compile(r"^(?P<version>\d{4})_(?P<name>\w+)\.sql$")
+_DOLLAR_QUOTE_RE = re.compile(r"\$[A-Za-z_]*\$")
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(16) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class MigrationError(RuntimeError):
+    """Raised when the migrations on disk or in the database are inconsistent."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return NO_TRANSACTION_DIRECTIVE not in self.sql
+
+
+@dataclass(frozen=True)
+class AppliedMigration:
+    version: str
+    name: str
+    checksum: str
+    applied_at: datetime
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Lee las migraciones versionadas (`NNNN_nombre.sql`) ordenadas por versión.
+
+    Args:
+        directory (Path): Directorio con los ficheros SQL
+
+    Returns:
+        List[Migration]: Migraciones ordenadas
+    """
+    migrations: Dict[str, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise MigrationError(f"Nombre de migración no válido: {path.name}")
+        version = match["version"]
+        if version in migrations:
+            raise MigrationError(f"Versión de migración duplicada: {version}")
+        migrations[version] = Migration(
+            version=version, name=match["name"], sql=path.read_text()
+        )
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql: str) -> List[str]:
+    """Divide un script SQL en sentencias respetando comillas, comentarios y $$."""
+    statements: List[str] = []
+    current: List[str] = []
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = len(sql) if end == -1 else end
+            current.append(sql[i:end])
+            i = end
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = len(sql) if end == -1 else end + 2
+            current.append(sql[i:end])
+            i = end
+        elif char in ("'", '"'):
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == char:
+                    # Comilla duplicada = comilla escapada
+                    if end + 1 < len(sql) and sql[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i : end + 1])
+            i = end + 1
+        elif char == "$" and (match := _DOLLAR_QUOTE_RE.match(sql, i)):
+            tag = match.group()
+            end = sql.find(tag, match.end())
+            end = len(sql) if end == -1 else end + len(tag)
+            current.append(sql[i:end])
+            i = end
+        elif char == ";":
+            statements.append("".join(current))
+            current = []
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+    statements.append("".join(current))
+
+    # Descartar fragmentos vacíos o que solo contienen comentarios
+    result = []
+    for statement in statements:
+        code = "\n".join(
+            line for line in statement.splitlines() if not line.strip().startswith("--")
+        )
+        if code.strip():
+            result.append(statement.strip())
+    return result
+
+
+def _execute_script(conn: Connection, sql: str) -> None:
+    # Cursor DBAPI sin parámetros: el driver no interpreta los "%" del script
+    # (format() en bloques DO, LIKE 'a%'...)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(sql)
+    finally:
+        cursor.close()
+
+
+class Migrator:
+    def __init__(self, engine: Engine, migrations: Optional[List[Migration]] = None):
+        """
+        Aplica las migraciones versionadas y registra cuáles se han ejecutado en
+        la tabla `schema_migrations`.
+
+        Args:
+            engine (Engine): Engine síncrono de la base de datos
+            migrations (Optional[List[Migration]]): Migraciones a gestionar; por
+                defecto las de `app/db/migrations`
+        """
+        self.engine = engine
+        self.migrations = migrations if migrations is not None else load_migrations()
+
+    def applied(self) -> Dict[str, AppliedMigration]:
+        """Migraciones registradas en la base de datos."""
+        with self.engine.begin() as conn:
+            conn.execute(text(CREATE_MIGRATIONS_TABLE))
+            rows = conn.execute(
+                text(
+                    "SELECT version, name, checksum, applied_at "
+                    "FROM schema_migrations ORDER BY version"
+                )
+            )
+            return {row.version: AppliedMigration(*row) for row in rows}
+
+    def status(self) -> List[Tuple[Migration, Optional[AppliedMigration]]]:
+        """Cada migración conocida junto con su registro de aplicación, si lo hay."""
+        applied = self.applied()
+        return [
+            (migration, applied.get(migration.version)) for migration in self.migrations
+        ]
+
+    def pending(self, target: Optional[str] = None) -> List[Migration]:
+        applied = self.applied()
+        return [
+            migration
+            for migration in self.migrations
+            if migration.version not in applied
+            and (target is None or migration.version <= target)
+        ]
+
+    def upgrade(self, target: Optional[str] = None) -> List[Migration]:
+        """
+        Aplica las migraciones pendientes hasta `target` (incluida).
+
+        Cada migración transaccional se ejecuta junto con su registro en una sola
+        transacción. Las marcadas con `-- migrate: no-transaction` se ejecutan
+        sentencia a sentencia y solo se registran si todas terminan bien; deben
+        ser idempotentes (IF NOT EXISTS) para poder reintentarlas.
+
+        Args:
+            target (Optional[str]): Última versión a aplicar; todas si es None
+
+        Returns:
+            List[Migration]: Migraciones aplicadas
+        """
+        with self._locked():
+            pending = self.pending(target)
+            for migration in pending:
+                if migration.transactional:
+                    with self.engine.begin() as conn:
+                        _execute_script(conn, migration.sql)
+                        self._record(conn, migration)
+                else:
+                    with self.engine.connect() as conn:
+                        autocommit = conn.execution_options(
+                            isolation_level="AUTOCOMMIT"
+                        )
+                        for statement in split_statements(migration.sql):
+                            _execute_script(autocommit, statement)
+                    with self.engine.begin() as conn:
+                        self._record(conn, migration)
+            return pending
+
+    def baseline(self, target: Optional[str] = None) -> List[Migration]:
+        """
+        Registra migraciones como aplicadas sin ejecutarlas.
+
+        Pensado para bases de datos creadas con `database.sql`, que ya incluye el
+        esquema completo.
+        """
+        with self._locked():
+            pending = self.pending(target)
+            with self.engine.begin() as conn:
+                for migration in pending:
+                    self._record(conn, migration)
+            return pending
+
+    @staticmethod
+    def _record(conn: Connection, migration: Migration) -> None:
+        conn.execute(
+            text(
+                "INSERT INTO schema_migrations (version, name, checksum) "
+                "VALUES (:version, :name, :checksum)"
+            ),
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "checksum": migration.checksum,
+            },
+        )
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # Advisory lock de sesión: impide aplicar migraciones en paralelo
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(
+                text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID}
+            )
+            try:
+                yield
+            finally:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID}
+                )
@@ -0,0 +1,213 @@
+import gzip
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.schemas.models import utcnow
+
+PARENT_TABLE = "resource_accesses"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+# Identificador del advisory lock que serializa la gestión de particiones
+PARTITION_LOCK_ID = 7_316_002
+
+_BOUND_RE = re.compile(r"FROM \('(?P<start>[^']+)'\) TO \('(?P<end>[^']+)'\)")
+
+
+@dataclass(frozen=True)
+class AccessPartition:
+    name: str
+    start: datetime
+    end: datetime
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month = value.year * 12 + value.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def retention_cutoff(today: date, retention_months: int) -> datetime:
+    """Inicio del mes más antiguo que se conserva: el actual y `retention_months` completos."""
+    return datetime.combine(
+        add_months(month_start(today), -retention_months), datetime.min.time()
+    )
+
+
+def list_partitions(conn: Connection) -> List[AccessPartition]:
+    """
+    Particiones mensuales de `resource_accesses` ordenadas por fecha.
+
+    Args:
+        conn (Connection): Conexión síncrona
+
+    Returns:
+        List[AccessPartition]: Particiones con sus límites [start, end)
+    """
+    rows = conn.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound)
+        # La partición DEFAULT no tiene límites
+        if match:
+            partitions.append(
+                AccessPartition(
+                    name=name,
+                    start=datetime.fromisoformat(match["start"]),
+                    end=datetime.fromisoformat(match["end"]),
+                )
+            )
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def ensure_partitions(
+    engine: Engine, months_ahead: int, months_back: int = 0
+) -> List[str]:
+    """
+    Crea las particiones del mes actual y de los `months_ahead` siguientes.
+
+    Con `months_back` también las de los meses anteriores (para cargar accesos
+    históricos, por ejemplo al sembrar datos de prueba).
+
+    Si la partición DEFAULT contiene accesos del mes (porque se insertaron
+    antes de crear su partición), se mueven a la nueva partición en la misma
+    transacción en la que se adjunta.
+
+    Args:
+        engine (Engine): Engine síncrono de la base de datos
+        months_ahead (int): Meses a preparar por adelantado
+        months_back (int): Meses anteriores al actual a preparar
+
+    Returns:
+        List[str]: Nombres de las particiones creadas
+    """
+    current = month_start(utcnow().date())
+    created = []
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID}
+        )
+        existing = {partition.name for partition in list_partitions(conn)}
+        for offset in range(-months_back, months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            _create_partition(conn, name, month, add_months(month, 1))
+            created.append(name)
+    return created
+
+
+def archive_partitions(
+    engine: Engine,
+    retention_months: int,
+    archive_dir: Path,
+    dry_run: bool = False,
+) -> List[Path]:
+    """
+    Archiva y elimina las particiones anteriores al periodo de retención.
+
+    Cada partición se vuelca primero con COPY a `archive_dir/<partición>.csv.gz`
+    y, solo cuando el fichero está completo en disco, se desvincula y se borra.
+    Si el volcado falla, la partición sigue intacta. Los contadores agregados
+    (`resource_access_hourly` y `resource_access_daily`) no se tocan: la
+    analítica conserva el histórico completo.
+
+    Args:
+        engine (Engine): Engine síncrono (psycopg2) de la base de datos
+        retention_months (int): Meses completos a conservar además del actual
+        archive_dir (Path): Directorio de los ficheros archivados
+        dry_run (bool): Solo calcular qué particiones se archivarían
+
+    Returns:
+        List[Path]: Ficheros generados (o que se generarían con dry_run)
+    """
+    cutoff = retention_cutoff(utcnow().date(), retention_months)
+    with engine.connect() as conn:
+        expired = [
+            partition for partition in list_partitions(conn) if partition.end <= cutoff
+        ]
+
+    archived = []
+    for partition in expired:
+        path = archive_dir / f"{partition.name}.csv.gz"
+        archived.append(path)
+        if dry_run:
+            continue
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        _copy_to_file(engine, partition.name, path)
+        with engine.begin() as conn:
+            quoted = conn.dialect.identifier_preparer.quote(partition.name)
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {quoted}"))
+            conn.execute(text(f"DROP TABLE {quoted}"))
+    return archived
+
+
+def _create_partition(conn: Connection, name: str, start: date, end: date) -> None:
+    quoted = conn.dialect.identifier_preparer.quote(name)
+    conn.execute(
+        text(
+            f"CREATE TABLE {quoted} "
+            f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE access_date >= :start AND access_date < :end RETURNING *) "
+            f"INSERT INTO {quoted} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    # Los límites son literales: ATTACH PARTITION no admite parámetros
+    conn.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {quoted} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+
+
+def _copy_to_file(engine: Engine, name: str, path: Path) -> None:
+    partial = path.with_suffix(path.suffix + ".partial")
+    raw = engine.raw_connection()
+    try:
+        quoted = engine.dialect.identifier_preparer.quote(name)
+        with gzip.open(partial, "wb") as archive:
+            cursor = raw.cursor()
+            cursor.copy_expert(
+                f"COPY (SELECT * FROM {quoted} ORDER BY access_date, id) "
+                "TO STDOUT WITH (FORMAT csv, HEADER)",
+                archive,
+            )
+            cursor.close()
+        raw.commit()
+    finally:
+        raw.close()
+
+    # Asegurar que el fichero está en disco antes de borrar la partición
+    with open(partial, "rb") as archive:
+        os.fsync(archive.fileno())
+    partial.replace(path)
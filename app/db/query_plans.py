@@ -0,0 +1,144 @@
+import json
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.repository.blog_repository import BlogRepository
+from app.repository.forum_repository import ForumRepository
+from app.repository.product_repository import ProductRepository
+from app.repository.resource_repository import ResourceRepository
+from app.repository.user_repository import UserRepository
+
+# Primera tabla del FROM de una sentencia, para nombrar cada comprobación
+_MAIN_TABLE = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    statement: str
+    scans: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def sequential_scans(self) -> List[str]:
+        return [relation for node, relation in self.scans if node == "Seq Scan"]
+
+    @property
+    def ok(self) -> bool:
+        return not self.sequential_scans
+
+
+def hot_queries(db: Session) -> Sequence[Tuple[str, Callable[[], Any]]]:
+    """Consultas de repositorio que deben resolverse con índices."""
+    missing = uuid.uuid4()
+    return (
+        (
+            "UserRepository.get_by_email",
+            lambda: UserRepository(db).get_by_email("a@b.c"),
+        ),
+        (
+            "ForumRepository.get_threads_by_region",
+            lambda: ForumRepository(db).get_threads_by_region("ES-AN", 10),
+        ),
+        (
+            "ProductRepository.search(region)",
+            lambda: ProductRepository(db).search(region="ES-AN", limit=10),
+        ),
+        (
+            "ResourceRepository.get_by_resource",
+            lambda: ResourceRepository(db).get_by_resource("product", missing),
+        ),
+        (
+            "ResourceRepository.get_by_user_id",
+            lambda: ResourceRepository(db).get_by_user_id(missing),
+        ),
+        (
+            "BlogRepository.get_blog_comments",
+            lambda: BlogRepository(db).get_blog_comments(missing),
+        ),
+        (
+            "BlogRepository.get_comments",
+            lambda: BlogRepository(db).get_comments(missing, 10),
+        ),
+        (
+            "BlogRepository.get_all",
+            lambda: BlogRepository(db).get_all(10, comments_limit=10),
+        ),
+    )
+
+
+def check_query_plans(db: Session) -> List[PlanCheck]:
+    """
+    Ejecuta las consultas calientes de los repositorios y comprueba con EXPLAIN
+    que ninguna recorre una tabla entera.
+
+    Con `enable_seqscan = off` PostgreSQL solo elige un Seq Scan si no existe
+    ningún índice utilizable, así que el resultado no depende del volumen de
+    datos de la base de datos en la que se ejecute.
+
+    Args:
+        db (Session): Sesión síncrona; la transacción se deshace al terminar
+
+    Returns:
+        List[PlanCheck]: Plan de cada sentencia emitida por cada consulta
+    """
+    results: List[PlanCheck] = []
+    try:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, call in hot_queries(db):
+            statements = _captured_statements(db, call)
+            for index, (statement, parameters) in enumerate(statements, start=1):
+                plan = (
+                    db.connection()
+                    .exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                    .scalar_one()
+                )
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                results.append(
+                    PlanCheck(
+                        name=_statement_name(name, index, statements),
+                        statement=statement,
+                        scans=list(_scan_nodes(plan[0]["Plan"])),
+                    )
+                )
+    finally:
+        db.rollback()
+    return results
+
+
+def _captured_statements(db: Session, call: Callable[[], Any]) -> List[Tuple[str, Any]]:
+    captured: List[Tuple[str, Any]] = []
+    engine = db.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return captured
+
+
+def _statement_name(name: str, index: int, statements: Sequence[Any]) -> str:
+    # Las consultas que emiten varias sentencias (páginas con sus regiones,
+    # contenidos o comentarios) numeran cada una con la tabla principal que lee
+    if len(statements) == 1:
+        return name
+    match = _MAIN_TABLE.search(statements[index - 1][0])
+    table = f" {match.group(1)}" if match else ""
+    return f"{name} [{index}/{len(statements)}{table}]"
+
+
+def _scan_nodes(node: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    if "Relation Name" in node:
+        yield node["Node Type"], node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from _scan_nodes(child)
@@ -2,7 +2,17 @@ import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +23,33 @@ if TYPE_CHECKING:
     pass
 
 
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the TIMESTAMP columns."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def as_utc_naive(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC; naive values are assumed UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def search_vector_sql(title_column: str) -> str:
+    """Generated tsvector expression: title weighted A, description B, per language."""
+
+    def vector(config: str) -> str:
+        return (
+            f"setweight(to_tsvector('{config}', coalesce({title_column}, '')), 'A') || "
+            f"setweight(to_tsvector('{config}', coalesce(description, '')), 'B')"
+        )
+
+    return (
+        f"CASE lan WHEN '{Language.EN.value}' THEN {vector('en_unaccent')} "
+        f"ELSE {vector('es_unaccent')} END"
+    )
+
+
 class LanguageModel(Base):
     """Model to store languages."""
 
@@ -33,17 +70,19 @@ class User(Base):
     """Model to store users."""
 
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_creation_date_id", "creation_date", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
     email: Mapped[str] = mapped_column(String(length=255), unique=True, index=True)
     nick_name: Mapped[str] = mapped_column(String(length=255), unique=True, index=True)
-    role: Mapped[Role] = mapped_column()
+    # VARCHAR en la base de datos: sin native_enum asyncpg intentaría castear a "role"
+    role: Mapped[Role] = mapped_column(Enum(Role, native_enum=False, length=10))
     hashed_password: Mapped[str] = mapped_column(String(length=255))
     image: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
     is_blocked: Mapped[bool] = mapped_column(default=False)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     blog_comments: Mapped[List["BlogComment"]] = relationship(
@@ -63,16 +102,22 @@ class User(Base):
     )
 
 
+# Índice funcional para buscar usuarios por email sin distinguir mayúsculas; único
+# para que la búsqueda no sea ambigua
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+
+
 class Product(Base):
     """Model to store products."""
 
     __tablename__ = "products"
+    __table_args__ = (Index("ix_products_creation_date_id", "creation_date", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
     image: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     regions: Mapped[List["ProductRegion"]] = relationship(
@@ -93,6 +138,11 @@ class ProductRegion(Base):
     """Model to store product regions."""
 
     __tablename__ = "product_regions"
+    __table_args__ = (
+        # La clave primaria empieza por product_id; el filtro por región necesita
+        # su propio índice
+        Index("ix_product_regions_region_code", "region_code", "product_id"),
+    )
 
     product_id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -109,16 +159,29 @@ class ProductLanContent(Base):
     """Model to store product content in different languages."""
 
     __tablename__ = "product_lan_contents"
+    __table_args__ = (
+        Index(
+            "ix_product_lan_contents_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+    # No recuperar el tsvector generado con RETURNING en cada INSERT
+    __mapper_args__ = {"eager_defaults": False}
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
     product_id: Mapped[uuid.UUID] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE")
+        PGUUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), index=True
     )
     lan: Mapped[str] = mapped_column(String(5), ForeignKey("languages.language_code"))
     name: Mapped[str] = mapped_column(String(length=255))
     description: Mapped[str] = mapped_column(Text)
+    # Columna generada para la búsqueda de texto completo (índice GIN)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(search_vector_sql("name"), persisted=True), deferred=True
+    )
 
     # Relaciones
     product: Mapped[Product] = relationship(back_populates="product_lan_contents")
@@ -131,6 +194,7 @@ class Blog(Base):
     """Model to store blogs."""
 
     __tablename__ = "blogs"
+    __table_args__ = (Index("ix_blogs_creation_date_id", "creation_date", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
@@ -139,7 +203,7 @@ class Blog(Base):
         PGUUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE")
     )
     image: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     product: Mapped[Product] = relationship(back_populates="blogs")
@@ -155,6 +219,15 @@ class BlogComment(Base):
     """Model to store blog comments."""
 
     __tablename__ = "blog_comments"
+    __table_args__ = (
+        # Páginas de comentarios de un blog; sirve también para filtrar por blog_id
+        Index(
+            "ix_blog_comments_blog_id_creation_date_id",
+            "blog_id",
+            "creation_date",
+            "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
@@ -168,7 +241,7 @@ class BlogComment(Base):
     comment: Mapped[str] = mapped_column(Text)
     image: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
     n_likes: Mapped[int] = mapped_column(default=0)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     blog: Mapped[Blog] = relationship(back_populates="comments")
@@ -179,6 +252,9 @@ class BlogRequest(Base):
     """Model to store blog requests."""
 
     __tablename__ = "blog_requests"
+    __table_args__ = (
+        Index("ix_blog_requests_creation_date_id", "creation_date", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
@@ -192,7 +268,7 @@ class BlogRequest(Base):
         PGUUID(as_uuid=True), ForeignKey("products.id", ondelete="SET NULL")
     )
     image: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     user: Mapped[User] = relationship(back_populates="blog_requests")
@@ -203,6 +279,9 @@ class ProductRequest(Base):
     """Model to store product requests."""
 
     __tablename__ = "product_requests"
+    __table_args__ = (
+        Index("ix_product_requests_creation_date_id", "creation_date", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
@@ -213,7 +292,7 @@ class ProductRequest(Base):
     )
     image: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
     description: Mapped[str] = mapped_column(Text)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     user: Mapped[User] = relationship(back_populates="product_requests")
@@ -223,25 +302,76 @@ class ResourceAccess(Base):
     """Model to store resource accesses."""
 
     __tablename__ = "resource_accesses"
+    __table_args__ = (
+        Index("ix_resource_accesses_access_date_id", "access_date", "id"),
+        Index("ix_resource_accesses_resource", "resource_type", "resource_id"),
+        # Particionada por mes; las particiones las gestiona app/db/partitions.py
+        {"postgresql_partition_by": "RANGE (access_date)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
     user_id: Mapped[uuid.UUID | None] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL")
+        PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), index=True
     )
     resource_type: Mapped[str] = mapped_column(String(length=255), nullable=False)
     resource_id: Mapped[uuid.UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
     access_type: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    # Forma parte de la clave primaria porque es la clave de partición
     access_date: Mapped[datetime] = mapped_column(
-        default=lambda: datetime.now(UTC), nullable=False
+        primary_key=True, default=utcnow, nullable=False
+    )
+    device_type: Mapped[AccessDevice] = mapped_column(
+        Enum(AccessDevice, native_enum=False, length=10)
     )
-    device_type: Mapped[AccessDevice] = mapped_column()
 
     # Relaciones
     user: Mapped[User] = relationship(back_populates="resource_accesses")
 
 
+class ResourceAccessRollup:
+    """Columns shared by the pre-aggregated access count tables."""
+
+    bucket: Mapped[datetime] = mapped_column(primary_key=True)
+    resource_type: Mapped[str] = mapped_column(String(length=255), primary_key=True)
+    resource_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True
+    )
+    device_type: Mapped[AccessDevice] = mapped_column(
+        Enum(AccessDevice, native_enum=False, length=10), primary_key=True
+    )
+    access_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+class ResourceAccessHourly(ResourceAccessRollup, Base):
+    """Model to store resource access counts per hour."""
+
+    __tablename__ = "resource_access_hourly"
+    __table_args__ = (
+        Index(
+            "ix_resource_access_hourly_resource",
+            "resource_type",
+            "resource_id",
+            "bucket",
+        ),
+    )
+
+
+class ResourceAccessDaily(ResourceAccessRollup, Base):
+    """Model to store resource access counts per day."""
+
+    __tablename__ = "resource_access_daily"
+    __table_args__ = (
+        Index(
+            "ix_resource_access_daily_resource",
+            "resource_type",
+            "resource_id",
+            "bucket",
+        ),
+    )
+
+
 class Forum(Base):
     """Model to store forums."""
 
@@ -260,6 +390,11 @@ class Thread(Base):
     """Model to store threads."""
 
     __tablename__ = "threads"
+    __table_args__ = (
+        Index(
+            "ix_threads_region_id_creation_date_id", "region_id", "creation_date", "id"
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
@@ -267,10 +402,18 @@ class Thread(Base):
     region_id: Mapped[str] = mapped_column(
         String(length=10), ForeignKey("forums.region_id", ondelete="CASCADE")
     )
-    lan: Mapped[Language] = mapped_column()
+    # Se guarda el código del idioma ("es-ES"), no el nombre del enum
+    lan: Mapped[Language] = mapped_column(
+        Enum(
+            Language,
+            native_enum=False,
+            length=5,
+            values_callable=lambda enum: [member.value for member in enum],
+        )
+    )
     title: Mapped[str] = mapped_column(String(length=255))
     description: Mapped[str] = mapped_column(Text)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     forum: Mapped[Forum] = relationship(back_populates="threads")
@@ -288,13 +431,13 @@ class ThreadComment(Base):
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
     thread_id: Mapped[uuid.UUID] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("threads.id", ondelete="CASCADE")
+        PGUUID(as_uuid=True), ForeignKey("threads.id", ondelete="CASCADE"), index=True
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL")
     )
     content: Mapped[str] = mapped_column(Text)
-    creation_date: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    creation_date: Mapped[datetime] = mapped_column(default=utcnow)
 
     # Relaciones
     thread: Mapped[Thread] = relationship(back_populates="comments")
@@ -305,16 +448,29 @@ class BlogLanContent(Base):
     """Model to store blog content in different languages."""
 
     __tablename__ = "blog_lan_contents"
+    __table_args__ = (
+        Index(
+            "ix_blog_lan_contents_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+    # No recuperar el tsvector generado con RETURNING en cada INSERT
+    __mapper_args__ = {"eager_defaults": False}
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
     blog_id: Mapped[uuid.UUID] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("blogs.id", ondelete="CASCADE")
+        PGUUID(as_uuid=True), ForeignKey("blogs.id", ondelete="CASCADE"), index=True
     )
     lan: Mapped[str] = mapped_column(String(5), ForeignKey("languages.language_code"))
     title: Mapped[str] = mapped_column(String(length=255))
     description: Mapped[str] = mapped_column(Text)
+    # Columna generada para la búsqueda de texto completo (índice GIN)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(search_vector_sql("title"), persisted=True), deferred=True
+    )
 
     # Relaciones
     blog: Mapped[Blog] = relationship(back_populates="blog_lan_contents")
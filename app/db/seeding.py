@@ -0,0 +1,788 @@
+import hashlib
+import io
+import random
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.config.settings import get_settings
+from app.db.connection import unit_of_work
+from app.db.partitions import ensure_partitions, month_start
+from app.db.schemas.models import utcnow
+from app.models import AccessDevice, Language, Role
+from app.repository.resource_repository import ResourceRepository
+from app.services.password_service import pwd_context
+
+settings = get_settings()
+
+# Comunidades autónomas: foros y regiones de los productos
+FORUM_REGIONS: Sequence[Tuple[str, str]] = (
+    ("ES-AN", "Andalucía"),
+    ("ES-AR", "Aragón"),
+    ("ES-AS", "Asturias"),
+    ("ES-IB", "Illes Balears"),
+    ("ES-CN", "Canarias"),
+    ("ES-CB", "Cantabria"),
+    ("ES-CL", "Castilla y León"),
+    ("ES-CM", "Castilla-La Mancha"),
+    ("ES-CT", "Cataluña"),
+    ("ES-VC", "Comunitat Valenciana"),
+    ("ES-EX", "Extremadura"),
+    ("ES-GA", "Galicia"),
+    ("ES-MD", "Comunidad de Madrid"),
+    ("ES-MC", "Región de Murcia"),
+    ("ES-NC", "Navarra"),
+    ("ES-PV", "País Vasco"),
+    ("ES-RI", "La Rioja"),
+)
+
+# Cuenta de administración que usan los benchmarks (la misma que database.sql)
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_NICK_NAME = "admin"
+ADMIN_PASSWORD = "admin123"
+
+# Tablas que vacía `truncate`; las de referencia (roles, idiomas, foros) se conservan
+SEEDED_TABLES = (
+    "resource_access_hourly",
+    "resource_access_daily",
+    "resource_accesses",
+    "thread_comments",
+    "threads",
+    "blog_request_comments",
+    "blog_requests",
+    "product_requests",
+    "blog_comments",
+    "blog_lan_contents",
+    "blogs",
+    "product_lan_contents",
+    "product_regions",
+    "products",
+    "users",
+)
+
+_BCRYPT_SALT_ALPHABET = (
+    "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+)
+
+# Filas por cada COPY: acota la memoria sin multiplicar las sentencias
+COPY_CHUNK_ROWS = 50_000
+
+# Identificadores de entidades padre que se mantienen calculados
+ENTITY_CACHE_SIZE = 1 << 18
+
+# Pares español/inglés para que los contenidos de ambos idiomas se correspondan
+_FOODS = (
+    ("aceite de oliva", "olive oil"),
+    ("queso", "cheese"),
+    ("jamón", "ham"),
+    ("vino", "wine"),
+    ("miel", "honey"),
+    ("turrón", "nougat"),
+    ("chorizo", "chorizo"),
+    ("pimentón", "paprika"),
+    ("azafrán", "saffron"),
+    ("aceitunas", "olives"),
+    ("sobrasada", "sobrasada"),
+    ("cecina", "cured beef"),
+    ("lentejas", "lentils"),
+    ("garbanzos", "chickpeas"),
+    ("mermelada", "jam"),
+    ("conservas", "preserves"),
+    ("anchoas", "anchovies"),
+    ("cerveza", "beer"),
+    ("sidra", "cider"),
+    ("licor", "liqueur"),
+)
+_QUALITIES = (
+    ("artesano", "artisan"),
+    ("ecológico", "organic"),
+    ("curado", "cured"),
+    ("tradicional", "traditional"),
+    ("reserva", "reserve"),
+    ("casero", "homemade"),
+    ("de bellota", "acorn-fed"),
+    ("suave", "mild"),
+    ("intenso", "intense"),
+    ("ahumado", "smoked"),
+)
+_DESCRIPTIONS = (
+    (
+        "Elaborado por pequeños productores de {place}.",
+        "Made by small producers from {place}.",
+    ),
+    (
+        "Sin conservantes ni colorantes añadidos.",
+        "No added preservatives or colourings.",
+    ),
+    (
+        "Receta transmitida durante generaciones.",
+        "A recipe handed down for generations.",
+    ),
+    ("Producción limitada de temporada.", "Limited seasonal production."),
+    ("Ideal para acompañar con {food}.", "Perfect paired with {food}."),
+)
+_BLOG_TITLES = (
+    ("Cómo elegir un buen {food}", "How to choose a good {food}"),
+    ("Ruta del {food} por {place}", "A {food} route through {place}"),
+    ("Historia del {food} {quality}", "The story of {quality} {food}"),
+    ("Cinco recetas con {food}", "Five recipes with {food}"),
+)
+_COMMENTS = (
+    "Me encanta, lo compro cada mes.",
+    "Muy buena recomendación, gracias.",
+    "¿Dónde se puede comprar en {place}?",
+    "El de {place} es todavía mejor.",
+    "Lo probé el verano pasado y repetiré.",
+    "Buena calidad, aunque un poco caro.",
+    "Great article, thanks for sharing.",
+)
+_THREAD_TITLES = (
+    "Dónde comprar {food} en {place}",
+    "Mejores productores de {food}",
+    "Ferias de {food} este año",
+    "Where to buy {food} in {place}",
+)
+_RESOURCE_TYPES = (("product", 0.6), ("blog", 0.3), ("thread", 0.1))
+_ACCESS_TYPES = (("view", 0.85), ("click", 0.1), ("share", 0.05))
+
+# Sesgo de popularidad de cada entidad al elegirla como padre (ver `Zipf`)
+_POPULARITY = {
+    "users": 1.1,
+    "products": 1.1,
+    "blogs": 1.2,
+    "threads": 1.1,
+    "regions": 0.8,
+}
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """Number of rows to generate per table."""
+
+    users: int
+    products: int
+    blogs: int
+    blog_comments: int
+    threads: int
+    thread_comments: int
+    product_requests: int
+    blog_requests: int
+    resource_accesses: int
+
+
+PRESETS: Dict[str, SeedPlan] = {
+    "small": SeedPlan(
+        users=1_000,
+        products=1_000,
+        blogs=2_000,
+        blog_comments=10_000,
+        threads=1_000,
+        thread_comments=10_000,
+        product_requests=1_000,
+        blog_requests=1_000,
+        resource_accesses=100_000,
+    ),
+    # La escala mínima de benchmarks/api_suite.py
+    "benchmark": SeedPlan(
+        users=50_000,
+        products=10_000,
+        blogs=20_000,
+        blog_comments=100_000,
+        threads=10_000,
+        thread_comments=100_000,
+        product_requests=10_000,
+        blog_requests=10_000,
+        resource_accesses=5_000_000,
+    ),
+    "large": SeedPlan(
+        users=2_000_000,
+        products=1_000_000,
+        blogs=500_000,
+        blog_comments=10_000_000,
+        threads=200_000,
+        thread_comments=5_000_000,
+        product_requests=200_000,
+        blog_requests=200_000,
+        resource_accesses=50_000_000,
+    ),
+}
+
+
+class Zipf:
+    def __init__(self, n: int, exponent: float, rng: random.Random):
+        """
+        Elige índices en [0, n) con probabilidad proporcional a 1 / rango^exponent.
+
+        Unos pocos índices concentran la mayoría de las elecciones (productos
+        populares, usuarios que comentan mucho). El rango de cada índice se
+        reparte al azar para que los más populares no sean los primeros creados.
+
+        Args:
+            n (int): Número de elementos
+            exponent (float): Sesgo de la distribución (0 es uniforme)
+            rng (random.Random): Generador con el que se reparten los rangos
+        """
+        self._cumulative = array(
+            "d", accumulate(1 / rank**exponent for rank in range(1, n + 1))
+        )
+        self._indexes = array("q", range(n))
+        rng.shuffle(self._indexes)
+
+    def sample(self, rng: random.Random) -> int:
+        rank = bisect_left(self._cumulative, rng.random() * self._cumulative[-1])
+        return self._indexes[min(rank, len(self._indexes) - 1)]
+
+
+class Seeder:
+    def __init__(
+        self,
+        engine: Engine,
+        plan: SeedPlan,
+        seed: int,
+        anchor: date,
+        days: int,
+        password: str,
+    ):
+        """
+        Generador de datos sintéticos reproducibles.
+
+        Con la misma semilla, el mismo plan y la misma fecha de referencia se
+        generan exactamente las mismas filas: los identificadores y las fechas
+        de creación se derivan de la semilla y la posición de cada fila, y cada
+        tabla usa su propio generador aleatorio.
+
+        Args:
+            engine (Engine): Engine síncrono (psycopg2) de la base de datos
+            plan (SeedPlan): Filas a generar por tabla
+            seed (int): Semilla
+            anchor (date): Fecha de referencia; los datos cubren los `days` días anteriores
+            days (int): Días de historia
+            password (str): Contraseña de todos los usuarios generados
+
+        Raises:
+            ValueError: Si el plan tiene filas hijas sin filas padre
+        """
+        for child, parent in (
+            ("blogs", "products"),
+            ("blog_comments", "blogs"),
+            ("blog_comments", "users"),
+            ("thread_comments", "threads"),
+            ("thread_comments", "users"),
+            ("product_requests", "users"),
+            ("blog_requests", "users"),
+            ("blog_requests", "products"),
+            ("resource_accesses", "users"),
+        ):
+            if getattr(plan, child) and not getattr(plan, parent):
+                raise ValueError(f"No se pueden generar {child} sin {parent}")
+
+        self.engine = engine
+        self.plan = plan
+        self.seed = seed
+        self.end = datetime.combine(anchor, time.min)
+        self.start = self.end - timedelta(days=days)
+        self.password = password
+        self.regions = [code for code, _ in FORUM_REGIONS]
+        self._zipfs: Dict[str, Zipf] = {}
+        # Las entidades populares se eligen una y otra vez como padre
+        self._entity = lru_cache(maxsize=ENTITY_CACHE_SIZE)(self._derive_entity)
+
+    def run(
+        self,
+        truncate: bool = False,
+        progress: Optional[Callable[[str, int, float], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Genera todas las tablas con COPY en una única transacción.
+
+        Después recalcula los contadores agregados de accesos del periodo y
+        actualiza las estadísticas del planificador (ANALYZE).
+
+        Args:
+            truncate (bool): Vaciar antes las tablas de datos (`SEEDED_TABLES`)
+            progress (Optional[Callable[[str, int, float], None]]): Se llama al
+                terminar cada tabla con su nombre, filas y segundos
+
+        Returns:
+            Dict[str, int]: Filas insertadas por tabla
+        """
+        current = month_start(utcnow().date())
+        first = month_start(self.start.date())
+        months_back = max(
+            (current.year - first.year) * 12 + current.month - first.month, 0
+        )
+        ensure_partitions(self.engine, 0, months_back)
+
+        counts: Dict[str, int] = {}
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            # Si se cae el servidor se repite la siembra: no hace falta esperar al WAL
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            if truncate:
+                cursor.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)}")
+            self._reference_data(cursor)
+            for table, columns, rows in self._tables():
+                start = perf_counter()
+                counts[table] = _copy(cursor, table, columns, rows)
+                if progress:
+                    progress(table, counts[table], perf_counter() - start)
+            cursor.close()
+            raw.commit()
+        except BaseException:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+        if self.plan.resource_accesses:
+            with unit_of_work() as db:
+                ResourceRepository(db).rebuild_rollups(self.start, self.end)
+        with self.engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+                text(f"ANALYZE {', '.join(SEEDED_TABLES)}")
+            )
+        return counts
+
+    def _reference_data(self, cursor) -> None:
+        for region_id, region_name in FORUM_REGIONS:
+            cursor.execute(
+                "INSERT INTO forums (region_id, region_name) VALUES (%s, %s) "
+                "ON CONFLICT DO NOTHING",
+                (region_id, region_name),
+            )
+        cursor.execute(
+            "INSERT INTO users (id, email, nick_name, role, hashed_password, "
+            "is_blocked, creation_date) VALUES (%s, %s, %s, %s, %s, false, %s) "
+            "ON CONFLICT DO NOTHING",
+            (
+                self._entity("admin", 0)[0],
+                ADMIN_EMAIL,
+                ADMIN_NICK_NAME,
+                Role.EMPLOYEE.value,
+                self._password_hash(ADMIN_PASSWORD),
+                self.start,
+            ),
+        )
+
+    def _tables(self) -> Iterator[Tuple[str, Sequence[str], Iterable[Sequence]]]:
+        # De padres a hijas, por las claves foráneas
+        yield (
+            "users",
+            (
+                "id",
+                "email",
+                "nick_name",
+                "role",
+                "hashed_password",
+                "image",
+                "is_blocked",
+                "creation_date",
+            ),
+            self._users(),
+        )
+        yield "products", ("id", "image", "creation_date"), self._products()
+        yield "product_regions", ("product_id", "region_code"), self._product_regions()
+        yield (
+            "product_lan_contents",
+            ("id", "product_id", "lan", "name", "description"),
+            self._product_contents(),
+        )
+        yield "blogs", ("id", "product_id", "image", "creation_date"), self._blogs()
+        yield (
+            "blog_lan_contents",
+            ("id", "blog_id", "lan", "title", "description"),
+            self._blog_contents(),
+        )
+        yield (
+            "blog_comments",
+            (
+                "id",
+                "blog_id",
+                "user_id",
+                "comment",
+                "image",
+                "n_likes",
+                "creation_date",
+            ),
+            self._blog_comments(),
+        )
+        yield (
+            "threads",
+            ("id", "region_id", "lan", "title", "description", "creation_date"),
+            self._threads(),
+        )
+        yield (
+            "thread_comments",
+            ("id", "thread_id", "user_id", "content", "creation_date"),
+            self._thread_comments(),
+        )
+        yield (
+            "product_requests",
+            ("id", "name", "user_id", "image", "description", "creation_date"),
+            self._product_requests(),
+        )
+        yield (
+            "blog_requests",
+            (
+                "id",
+                "user_id",
+                "title",
+                "description",
+                "product_id",
+                "image",
+                "creation_date",
+            ),
+            self._blog_requests(),
+        )
+        yield (
+            "resource_accesses",
+            (
+                "id",
+                "user_id",
+                "resource_type",
+                "resource_id",
+                "access_type",
+                "access_date",
+                "device_type",
+            ),
+            self._accesses(),
+        )
+
+    def _users(self) -> Iterator[Sequence]:
+        rng = self._rng("users")
+        # Un único hash: bcrypt por usuario haría la siembra inviable
+        hashed_password = self._password_hash(self.password)
+        for index in range(self.plan.users):
+            user_id, created = self._entity("users", index)
+            yield (
+                user_id,
+                f"seed{self.seed}-user{index}@example.com",
+                f"seed{self.seed}_user{index}",
+                (Role.EMPLOYEE if rng.random() < 0.01 else Role.USER).value,
+                hashed_password,
+                f"https://images.example.com/users/{index}.jpg"
+                if rng.random() < 0.3
+                else None,
+                rng.random() < 0.01,
+                created,
+            )
+
+    def _products(self) -> Iterator[Sequence]:
+        for index in range(self.plan.products):
+            product_id, created = self._entity("products", index)
+            yield (
+                product_id,
+                f"https://images.example.com/products/{index}.jpg",
+                created,
+            )
+
+    def _product_regions(self) -> Iterator[Sequence]:
+        rng = self._rng("product_regions")
+        regions = self._zipf("regions")
+        for index in range(self.plan.products):
+            product_id = self._entity("products", index)[0]
+            codes = {
+                self.regions[regions.sample(rng)] for _ in range(rng.randint(1, 3))
+            }
+            for code in sorted(codes):
+                yield product_id, code
+
+    def _product_contents(self) -> Iterator[Sequence]:
+        rng = self._rng("product_lan_contents")
+        for index in range(self.plan.products):
+            product_id = self._entity("products", index)[0]
+            food = rng.randrange(len(_FOODS))
+            quality = rng.randrange(len(_QUALITIES))
+            place = rng.choice(FORUM_REGIONS)[1]
+            sentences = rng.sample(range(len(_DESCRIPTIONS)), 2)
+            pairing = rng.choice(_FOODS)
+            for lan, column in ((Language.ES, 0), (Language.EN, 1)):
+                # Todos en español; la mitad también en inglés
+                if lan == Language.EN and rng.random() < 0.5:
+                    continue
+                if lan == Language.ES:
+                    name = f"{_FOODS[food][0]} {_QUALITIES[quality][0]} de {place}"
+                else:
+                    name = f"{_QUALITIES[quality][1]} {_FOODS[food][1]} from {place}"
+                description = " ".join(
+                    _DESCRIPTIONS[sentence][column].format(
+                        place=place, food=pairing[column]
+                    )
+                    for sentence in sentences
+                )
+                yield (
+                    self._uuid(rng),
+                    product_id,
+                    lan.value,
+                    _sentence_case(name),
+                    (description),
+                )
+
+    def _blogs(self) -> Iterator[Sequence]:
+        rng = self._rng("blogs")
+        products = self._zipf("products")
+        for index in range(self.plan.blogs):
+            blog_id, created = self._entity("blogs", index)
+            product_id = self._entity("products", products.sample(rng))[0]
+            yield (
+                blog_id,
+                product_id,
+                f"https://images.example.com/blogs/{index}.jpg",
+                created,
+            )
+
+    def _blog_contents(self) -> Iterator[Sequence]:
+        rng = self._rng("blog_lan_contents")
+        for index in range(self.plan.blogs):
+            blog_id = self._entity("blogs", index)[0]
+            title = rng.choice(_BLOG_TITLES)
+            food = rng.choice(_FOODS)
+            quality = rng.choice(_QUALITIES)
+            place = rng.choice(FORUM_REGIONS)[1]
+            for lan, column in ((Language.ES, 0), (Language.EN, 1)):
+                if lan == Language.EN and rng.random() < 0.5:
+                    continue
+                words = {
+                    "food": food[column],
+                    "quality": quality[column],
+                    "place": place,
+                }
+                yield (
+                    self._uuid(rng),
+                    blog_id,
+                    lan.value,
+                    title[column].format(**words),
+                    " ".join(
+                        _DESCRIPTIONS[sentence][column].format(**words)
+                        for sentence in rng.sample(range(len(_DESCRIPTIONS)), 3)
+                    ),
+                )
+
+    def _blog_comments(self) -> Iterator[Sequence]:
+        rng = self._rng("blog_comments")
+        blogs = self._zipf("blogs")
+        users = self._zipf("users")
+        for _ in range(self.plan.blog_comments):
+            blog_id, blog_created = self._entity("blogs", blogs.sample(rng))
+            yield (
+                self._uuid(rng),
+                blog_id,
+                self._entity("users", users.sample(rng))[0],
+                self._comment(rng),
+                None,
+                # Casi todos sin likes y unos pocos con muchos
+                min(int(rng.paretovariate(1.2)) - 1, 10_000),
+                self._after(rng, blog_created),
+            )
+
+    def _threads(self) -> Iterator[Sequence]:
+        rng = self._rng("threads")
+        regions = self._zipf("regions")
+        for index in range(self.plan.threads):
+            thread_id, created = self._entity("threads", index)
+            words = {
+                "food": rng.choice(_FOODS)[0],
+                "place": rng.choice(FORUM_REGIONS)[1],
+            }
+            yield (
+                thread_id,
+                self.regions[regions.sample(rng)],
+                (Language.EN if rng.random() < 0.2 else Language.ES).value,
+                rng.choice(_THREAD_TITLES).format(**words),
+                self._comment(rng),
+                created,
+            )
+
+    def _thread_comments(self) -> Iterator[Sequence]:
+        rng = self._rng("thread_comments")
+        threads = self._zipf("threads")
+        users = self._zipf("users")
+        for _ in range(self.plan.thread_comments):
+            thread_id, thread_created = self._entity("threads", threads.sample(rng))
+            yield (
+                self._uuid(rng),
+                thread_id,
+                self._entity("users", users.sample(rng))[0],
+                self._comment(rng),
+                self._after(rng, thread_created),
+            )
+
+    def _product_requests(self) -> Iterator[Sequence]:
+        rng = self._rng("product_requests")
+        users = self._zipf("users")
+        for _ in range(self.plan.product_requests):
+            food, quality = rng.choice(_FOODS), rng.choice(_QUALITIES)
+            place = rng.choice(FORUM_REGIONS)[1]
+            yield (
+                self._uuid(rng),
+                _sentence_case(f"{food[0]} {quality[0]} de {place}"),
+                self._entity("users", users.sample(rng))[0],
+                None,
+                _DESCRIPTIONS[0][0].format(place=place),
+                self._after(rng, self.start),
+            )
+
+    def _blog_requests(self) -> Iterator[Sequence]:
+        rng = self._rng("blog_requests")
+        users = self._zipf("users")
+        products = self._zipf("products")
+        for _ in range(self.plan.blog_requests):
+            words = {
+                "food": rng.choice(_FOODS)[0],
+                "quality": rng.choice(_QUALITIES)[0],
+                "place": rng.choice(FORUM_REGIONS)[1],
+            }
+            yield (
+                self._uuid(rng),
+                self._entity("users", users.sample(rng))[0],
+                rng.choice(_BLOG_TITLES)[0].format(**words),
+                self._comment(rng),
+                self._entity("products", products.sample(rng))[0],
+                None,
+                self._after(rng, self.start),
+            )
+
+    def _accesses(self) -> Iterator[Sequence]:
+        rng = self._rng("resource_accesses")
+        users = self._zipf("users")
+        targets = [
+            (resource_type, self._zipf(kind), kind)
+            for resource_type, kind, count in (
+                ("product", "products", self.plan.products),
+                ("blog", "blogs", self.plan.blogs),
+                ("thread", "threads", self.plan.threads),
+            )
+            if count
+        ]
+        if not targets:
+            return
+        type_weights = list(
+            accumulate(dict(_RESOURCE_TYPES)[target[0]] for target in targets)
+        )
+        access_types = [name for name, _ in _ACCESS_TYPES]
+        access_weights = list(accumulate(weight for _, weight in _ACCESS_TYPES))
+        span = (self.end - self.start).total_seconds()
+        for _ in range(self.plan.resource_accesses):
+            resource_type, resources, kind = rng.choices(
+                targets, cum_weights=type_weights
+            )[0]
+            # Más accesos cuanto más recientes
+            age = (rng.expovariate(4.0) % 1.0) * span
+            yield (
+                self._uuid(rng),
+                self._entity("users", users.sample(rng))[0],
+                resource_type,
+                self._entity(kind, resources.sample(rng))[0],
+                rng.choices(access_types, cum_weights=access_weights)[0],
+                self.end - timedelta(seconds=max(age, 1.0)),
+                (
+                    AccessDevice.WEB if rng.random() < 0.55 else AccessDevice.MOBILE
+                ).value,
+            )
+
+    def _password_hash(self, password: str) -> str:
+        # Sal derivada de la semilla: con la aleatoria de bcrypt los usuarios
+        # cambiarían en cada siembra
+        digest = hashlib.blake2b(f"{self.seed}:password".encode(), digest_size=21)
+        salt = "".join(_BCRYPT_SALT_ALPHABET[byte % 64] for byte in digest.digest())
+        bcrypt = pwd_context.handler("bcrypt").using(
+            salt=salt + ".", rounds=settings.bcrypt_rounds
+        )
+        return bcrypt.hash(password)
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def _zipf(self, kind: str) -> Zipf:
+        # Compartido entre tablas: un producto popular lo es en blogs y en accesos
+        if kind not in self._zipfs:
+            n = len(self.regions) if kind == "regions" else getattr(self.plan, kind)
+            self._zipfs[kind] = Zipf(n, _POPULARITY[kind], self._rng(f"zipf:{kind}"))
+        return self._zipfs[kind]
+
+    def _derive_entity(self, kind: str, index: int) -> Tuple[str, datetime]:
+        # Identificador y fecha de creación a partir de la posición: se pueden
+        # recalcular al generar las filas hijas sin guardar todos en memoria
+        digest = hashlib.blake2b(
+            f"{self.seed}:{kind}:{index}".encode(), digest_size=16
+        ).digest()
+        count = getattr(self.plan, kind, 1) or 1
+        jitter = int.from_bytes(digest[:4], "big") / 2**32
+        created = self.start + (self.end - self.start) * ((index + jitter) / count)
+        return _format_uuid(int.from_bytes(digest, "big")), created
+
+    @staticmethod
+    def _uuid(rng: random.Random) -> str:
+        return _format_uuid(rng.getrandbits(128))
+
+    def _after(self, rng: random.Random, moment: datetime) -> datetime:
+        return moment + (self.end - moment) * rng.random()
+
+    @staticmethod
+    def _comment(rng: random.Random) -> str:
+        return rng.choice(_COMMENTS).format(place=rng.choice(FORUM_REGIONS)[1])
+
+
+def _copy(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buffer: List[str] = []
+    count = 0
+    for row in rows:
+        buffer.append("\t".join(map(_copy_value, row)))
+        count += 1
+        if len(buffer) == COPY_CHUNK_ROWS:
+            _copy_chunk(cursor, statement, buffer)
+            buffer = []
+    if buffer:
+        _copy_chunk(cursor, statement, buffer)
+    return count
+
+
+def _copy_chunk(cursor, statement: str, lines: List[str]) -> None:
+    cursor.copy_expert(statement, io.StringIO("\n".join(lines) + "\n"))
+
+
+def _sentence_case(value: str) -> str:
+    # Sin str.capitalize: pasaría a minúsculas los nombres de las regiones
+    return value[:1].upper() + value[1:]
+
+
+def _format_uuid(value: int) -> str:
+    # UUID versión 4 sin pasar por uuid.UUID, que domina el coste por fila
+    value = value & ~(0xC000 << 48) | 0x8000 << 48
+    value = value & ~(0xF000 << 64) | 4 << 76
+    digits = f"{value:032x}"
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def _copy_value(value) -> str:
+    # Formato de texto de COPY: \N es NULL y hay que escapar separadores
+    if type(value) is str:
+        if "\\" in value or "\t" in value or "\n" in value or "\r" in value:
+            return _escape(value)
+        return value
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return _escape(str(value))
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
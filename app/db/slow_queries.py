@@ -0,0 +1,161 @@
+import asyncio
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.config.settings import get_settings
+from app.services.logger_service import get_logger_service
+from app.services.metrics import current_query_stats
+
+settings = get_settings()
+
+SLOW_QUERIES_LOG = "slow_queries"
+
+# Longitud máxima de la sentencia guardada en el log
+MAX_STATEMENT_LENGTH = 4000
+
+# Los EXPLAIN se ejecutan de uno en uno, fuera de las peticiones
+_explain_executor: Optional[ThreadPoolExecutor] = None
+_explain_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def is_slow(duration: float) -> bool:
+    """Si una sentencia supera el umbral configurado (0 o negativo lo desactiva)."""
+    threshold = settings.slow_query_threshold_ms
+    return threshold > 0 and duration * 1000 >= threshold
+
+
+def log_slow_statement(
+    conn: Connection,
+    statement: str,
+    parameters: Any,
+    context: Optional[ExecutionContext],
+    executemany: bool,
+    duration: float,
+) -> None:
+    """
+    Registra en `slow_queries` una sentencia que ha superado el umbral.
+
+    Solo se registra una fracción (`slow_query_sample_rate`) de las sentencias
+    lentas y solo a una fracción de esas (`slow_query_explain_rate`) se le añade
+    el plan de `EXPLAIN (ANALYZE, BUFFERS)`: con la base de datos saturada, el
+    propio log no debe añadir carga. ANALYZE vuelve a ejecutar la sentencia,
+    así que solo se aplica a los SELECT de las peticiones, en segundo plano y
+    con otra conexión en una transacción de solo lectura: la petición no espera
+    al plan, y esas entradas se escriben cuando termina. De los parámetros se
+    guarda la forma (nombres y tipos), no los valores.
+
+    Args:
+        conn (Connection): Conexión que ejecutó la sentencia
+        statement (str): SQL compilado para el driver
+        parameters (Any): Parámetros de la sentencia
+        context (Optional[ExecutionContext]): Contexto de ejecución
+        executemany (bool): Si la sentencia se ejecutó por lotes
+        duration (float): Segundos que tardó la sentencia
+    """
+    if random.random() >= settings.slow_query_sample_rate:
+        return
+
+    stats = current_query_stats()
+    entry: Dict[str, Any] = {
+        "duration_ms": round(duration * 1000, 3),
+        "route": stats.route if stats else None,
+        "statement": " ".join(statement.split())[:MAX_STATEMENT_LENGTH],
+        "parameters": _parameters_shape(parameters, executemany),
+    }
+    # Solo sentencias de las rutas: las de mantenimiento (advisory locks,
+    # particiones) tienen efectos que ANALYZE repetiría
+    if (
+        stats is not None
+        and _explainable(statement, executemany)
+        and random.random() < settings.slow_query_explain_rate
+    ):
+        _schedule_explain(conn, entry, statement, parameters)
+        return
+    get_logger_service().log(entry=entry, filename=SLOW_QUERIES_LOG)
+
+
+def _explainable(statement: str, executemany: bool) -> bool:
+    # ANALYZE ejecuta la sentencia: solo lecturas
+    return not executemany and statement.lstrip().upper().startswith("SELECT")
+
+
+def _schedule_explain(
+    conn: Connection, entry: Dict[str, Any], statement: str, parameters: Any
+) -> None:
+    engine = conn.engine
+    if conn.dialect.is_async:
+        # asyncpg: la conexión nueva tiene que usarse desde el bucle de eventos
+        task = asyncio.get_running_loop().create_task(
+            greenlet_spawn(_explain_and_log, engine, entry, statement, parameters)
+        )
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+    else:
+        _get_explain_executor().submit(
+            _explain_and_log, engine, entry, statement, parameters
+        )
+
+
+def _get_explain_executor() -> ThreadPoolExecutor:
+    global _explain_executor
+    if _explain_executor is None:
+        _explain_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="slow-query-explain"
+        )
+    return _explain_executor
+
+
+def _explain_and_log(
+    engine: Engine, entry: Dict[str, Any], statement: str, parameters: Any
+) -> None:
+    try:
+        entry["plan"] = _explain(engine, statement, parameters)
+    except (DBAPIError, PoolTimeoutError) as e:
+        entry["plan_error"] = str(e)
+    get_logger_service().log(entry=entry, filename=SLOW_QUERIES_LOG)
+
+
+def _explain(engine: Engine, statement: str, parameters: Any) -> Any:
+    # Directamente sobre una conexión del driver: el SQL ya está compilado para
+    # él y así no se disparan de nuevo los eventos del engine. La transacción de
+    # solo lectura rechaza los SELECT ... FOR UPDATE y se deshace al terminar.
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        try:
+            cursor.execute("SET TRANSACTION READ ONLY")
+            cursor.execute(
+                "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+            )
+            plan = cursor.fetchone()[0]
+        except engine.dialect.loaded_dbapi.Error as e:
+            raise DBAPIError.instance(
+                statement, parameters, e, engine.dialect.loaded_dbapi.Error
+            ) from e
+        finally:
+            cursor.close()
+            raw.rollback()
+    finally:
+        raw.close()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _parameters_shape(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        rows = list(parameters or [])
+        return {
+            "rows": len(rows),
+            "row": _parameters_shape(rows[0], False) if rows else None,
+        }
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
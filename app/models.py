@@ -21,6 +21,16 @@ class AccessDevice(str, Enum):
     MOBILE = "MOBILE"
 
 
+class AnalyticsGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class User(BaseModel):
     id: UUID = uuid4()
     email: str
@@ -116,6 +126,22 @@ class CreateResourceAccess(BaseModel):
     deviceType: AccessDevice
 
 
+class TopResource(BaseModel):
+    resourceType: str
+    resourceId: UUID
+    accesses: int
+
+
+class DeviceAccesses(BaseModel):
+    deviceType: AccessDevice
+    accesses: int
+
+
+class AccessTimeBucket(BaseModel):
+    bucket: datetime
+    accesses: int
+
+
 class Forum(BaseModel):
     regionId: str
     regionName: str
@@ -172,6 +198,35 @@ class CreateProductContent(BaseModel):
     description: str
 
 
+class ImportProductContent(BaseModel):
+    lan: Language
+    name: str = Field(max_length=255)
+    description: str
+
+
+class ImportProduct(BaseModel):
+    """Product with its regions and contents, as accepted by the bulk import."""
+
+    image: Optional[str] = Field(None, max_length=255)
+    regions: List[str] = Field(min_length=1)
+    contents: List[ImportProductContent] = []
+
+
+class ImportedProduct(BaseModel):
+    index: int
+    id: UUID
+
+
+class ImportProductError(BaseModel):
+    index: int
+    errors: List[str]
+
+
+class ProductImportResult(BaseModel):
+    imported: List[ImportedProduct]
+    errors: List[ImportProductError]
+
+
 class CreateBlogComment(BaseModel):
     userId: UUID
     comment: str
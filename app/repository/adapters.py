@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import Any, Awaitable, Callable, Generic, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+RepositoryT = TypeVar("RepositoryT")
+
+
+class AsyncRepository(ABC, Generic[RepositoryT]):
+    """Expone los métodos de un repositorio como corrutinas.
+
+    Los repositorios se escriben una sola vez contra una `Session` síncrona; este
+    adaptador decide cómo ejecutarlos sin bloquear el bucle de eventos.
+    """
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        async def method(*args: Any, **kwargs: Any) -> Any:
+            return await self._run(name, *args, **kwargs)
+
+        return method
+
+    @abstractmethod
+    async def _run(self, method_name: str, /, *args: Any, **kwargs: Any) -> Any:
+        """Ejecuta `method_name` del repositorio con los argumentos dados."""
+
+
+class ThreadedRepository(AsyncRepository[RepositoryT]):
+    """Ejecuta un repositorio síncrono (psycopg2) en el threadpool."""
+
+    def __init__(self, repository: RepositoryT):
+        self.repository = repository
+
+    async def _run(self, method_name: str, /, *args: Any, **kwargs: Any) -> Any:
+        method = getattr(self.repository, method_name)
+        return await run_in_threadpool(partial(method, *args, **kwargs))
+
+
+class AsyncSessionRepository(AsyncRepository[RepositoryT]):
+    """Ejecuta un repositorio sobre una `AsyncSession` (asyncpg).
+
+    `AsyncSession.run_sync` ejecuta el código ORM síncrono dentro de un greenlet,
+    de modo que cada consulta cede el control al bucle mientras espera a la
+    base de datos y un mismo worker puede solapar muchas consultas.
+    """
+
+    def __init__(self, repository_cls: Type[RepositoryT], session: AsyncSession):
+        self.repository_cls = repository_cls
+        self.session = session
+
+    async def _run(self, method_name: str, /, *args: Any, **kwargs: Any) -> Any:
+        def call(sync_session: Session) -> Any:
+            repository = self.repository_cls(sync_session)  # type: ignore[call-arg]
+            return getattr(repository, method_name)(*args, **kwargs)
+
+        return await self.session.run_sync(call)
+
+
+def repository_for(
+    db: Session | AsyncSession, repository_cls: Type[RepositoryT]
+) -> AsyncRepository[RepositoryT]:
+    """Construye la versión asíncrona de un repositorio para la sesión dada.
+
+    Args:
+        db (Session | AsyncSession): Sesión obtenida de `get_session`
+        repository_cls (Type[RepositoryT]): Clase del repositorio síncrono
+
+    Returns:
+        AsyncRepository[RepositoryT]: Repositorio con métodos awaitables
+    """
+    if isinstance(db, AsyncSession):
+        return AsyncSessionRepository(repository_cls, db)
+    return ThreadedRepository(repository_cls(db))  # type: ignore[call-arg]
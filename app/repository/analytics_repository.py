@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.db.schemas.models import (
+    ResourceAccessDaily,
+    ResourceAccessHourly,
+    ResourceAccessRollup,
+)
+from app.models import AccessDevice, AnalyticsGranularity
+
+
+class AnalyticsRepository:
+    def __init__(self, db: Session):
+        """
+        Consultas de analítica sobre los contadores agregados de accesos.
+
+        Nunca lee `resource_accesses`: las tablas por hora y por día tienen una
+        fila por recurso, dispositivo e intervalo, de modo que un panel recorre
+        miles de filas en lugar de millones de accesos.
+        """
+        self.db = db
+
+    def top_resources(
+        self,
+        start: datetime,
+        end: datetime,
+        limit: int,
+        resource_type: Optional[str] = None,
+        device_type: Optional[AccessDevice] = None,
+    ) -> List[Row]:
+        """
+        Recursos con más accesos en el intervalo [start, end), redondeado a
+        horas completas.
+
+        Returns:
+            List[Row]: Filas (resource_type, resource_id, accesses)
+        """
+        model, start, end = self._bounds(start, end)
+        accesses = func.sum(model.access_count).label("accesses")
+        query = self._filtered(
+            model, start, end, resource_type=resource_type, device_type=device_type
+        )
+        return (
+            query.with_entities(model.resource_type, model.resource_id, accesses)
+            .group_by(model.resource_type, model.resource_id)
+            .order_by(accesses.desc(), model.resource_type, model.resource_id)
+            .limit(limit)
+            .all()
+        )
+
+    def device_split(
+        self,
+        start: datetime,
+        end: datetime,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[UUID] = None,
+    ) -> List[Row]:
+        """
+        Accesos por tipo de dispositivo en el intervalo [start, end), redondeado
+        a horas completas.
+
+        Returns:
+            List[Row]: Filas (device_type, accesses)
+        """
+        model, start, end = self._bounds(start, end)
+        accesses = func.sum(model.access_count).label("accesses")
+        query = self._filtered(
+            model, start, end, resource_type=resource_type, resource_id=resource_id
+        )
+        return (
+            query.with_entities(model.device_type, accesses)
+            .group_by(model.device_type)
+            .order_by(model.device_type)
+            .all()
+        )
+
+    def time_series(
+        self,
+        granularity: AnalyticsGranularity,
+        start: datetime,
+        end: datetime,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[UUID] = None,
+        device_type: Optional[AccessDevice] = None,
+    ) -> List[Row]:
+        """
+        Accesos por hora o por día en el intervalo [start, end).
+
+        Los límites se redondean a la hora o al día: cada punto de la serie
+        cuenta el intervalo completo. Los intervalos sin accesos no aparecen.
+
+        Returns:
+            List[Row]: Filas (bucket, accesses) ordenadas por fecha
+        """
+        if granularity == AnalyticsGranularity.DAY:
+            model: Type[ResourceAccessRollup] = ResourceAccessDaily
+            start, end = _floor(start, "day"), _ceil(end, "day")
+        else:
+            model = ResourceAccessHourly
+            start, end = _floor(start, "hour"), _ceil(end, "hour")
+        accesses = func.sum(model.access_count).label("accesses")
+        query = self._filtered(
+            model,
+            start,
+            end,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            device_type=device_type,
+        )
+        return (
+            query.with_entities(model.bucket, accesses)
+            .group_by(model.bucket)
+            .order_by(model.bucket)
+            .all()
+        )
+
+    def _filtered(
+        self,
+        model: Type[ResourceAccessRollup],
+        start: datetime,
+        end: datetime,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[UUID] = None,
+        device_type: Optional[AccessDevice] = None,
+    ):
+        query = self.db.query(model).filter(model.bucket >= start, model.bucket < end)
+        if resource_type is not None:
+            query = query.filter(model.resource_type == resource_type)
+        if resource_id is not None:
+            query = query.filter(model.resource_id == resource_id)
+        if device_type is not None:
+            query = query.filter(model.device_type == device_type)
+        return query
+
+    @staticmethod
+    def _bounds(
+        start: datetime, end: datetime
+    ) -> Tuple[Type[ResourceAccessRollup], datetime, datetime]:
+        # Los contadores diarios solo son exactos si el intervalo cubre días
+        # completos; en otro caso se suman las horas
+        if start == _floor(start, "day") and end == _floor(end, "day"):
+            return ResourceAccessDaily, start, end
+        return ResourceAccessHourly, _floor(start, "hour"), _ceil(end, "hour")
+
+
+def _floor(value: datetime, unit: str) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if unit == "day" else value
+
+
+def _ceil(value: datetime, unit: str) -> datetime:
+    floor = _floor(value, unit)
+    if floor == value:
+        return floor
+    return floor + (timedelta(days=1) if unit == "day" else timedelta(hours=1))
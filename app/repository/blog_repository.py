@@ -1,10 +1,30 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    Integer,
+    Row,
+    Select,
+    column,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Session
 
+from app.db.connection import after_commit, unit_of_work
 from app.db.schemas.models import Blog, BlogComment, BlogLanContent, User
-from app.models import CreateBlog, CreateBlogComment
+from app.models import CreateBlog, CreateBlogComment, Language
+from app.repository.pagination import Page, SortOrder, order_by_keys, paginate_rows
+from app.services.like_aggregator import get_like_aggregator
+from app.services.response_cache import TAG_BLOGS, get_response_cache
+from app.services.search_service import get_search_service
+
+# Clave de paginación de los comentarios de un blog
+COMMENT_KEYS = (BlogComment.creation_date, BlogComment.id)
 
 
 class BlogRepository:
@@ -12,29 +32,255 @@ class BlogRepository:
         self.db = db
 
     def get_by_id(self, blog_id: UUID) -> Optional[Blog]:
-        return (
-            self.db.query(Blog)
-            .options(joinedload(Blog.blog_lan_contents), joinedload(Blog.comments))
-            .filter(Blog.id == blog_id)
-            .first()
-        )
+        # Solo la entidad: las colecciones se cargan al acceder a ellas
+        return self.db.query(Blog).filter(Blog.id == blog_id).first()
+
+    def get_detail(
+        self, blog_id: UUID, comments_limit: int
+    ) -> Optional[Tuple[dict, Optional[str]]]:
+        """
+        Detalle de un blog con la primera página de sus comentarios.
+
+        El blog, sus contenidos y la página de comentarios (con sus autores) se
+        leen en consultas separadas, así que el coste no crece con el número de
+        comentarios del blog: el resto se pide con `get_comments` y el cursor.
+
+        Args:
+            blog_id (UUID): Identificador del blog
+            comments_limit (int): Comentarios incluidos, los más recientes
+
+        Returns:
+            Optional[Tuple[dict, Optional[str]]]: Blog con los campos del modelo
+                de respuesta `Blog` y cursor de la siguiente página de
+                comentarios, o None si no existe
+        """
+        row = self.db.execute(self._columns().where(Blog.id == blog_id)).first()
+        if not row:
+            return None
+
+        comments = self._comment_page(blog_id, comments_limit)
+        blog = self._response(row, self._contents([blog_id])[blog_id], comments.items)
+        return blog, comments.next_cursor
+
+    def get_comments(
+        self,
+        blog_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Optional[Page[dict]]:
+        """
+        Página de comentarios de un blog con sus autores.
+
+        Args:
+            blog_id (UUID): Identificador del blog
+            limit (int): Tamaño máximo de la página
+            cursor (Optional[str]): Cursor de la página anterior (o del detalle)
+            sort (SortOrder): Orden por fecha de creación
+
+        Returns:
+            Optional[Page[dict]]: Comentarios con los campos del modelo de
+                respuesta `BlogComment`, o None si el blog no existe
+        """
+        page = self._comment_page(blog_id, limit, cursor, sort)
+        # Una página vacía puede ser de un blog que no existe
+        if (
+            not page.items
+            and not self.db.query(Blog.id).filter(Blog.id == blog_id).first()
+        ):
+            return None
+        return page
 
     def get_all(
         self,
-    ) -> List[Blog]:
-        return (
-            self.db.query(Blog)
-            .options(joinedload(Blog.blog_lan_contents), joinedload(Blog.comments))
-            .all()
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+        *,
+        comments_limit: int,
+    ) -> Page[dict]:
+        page = paginate_rows(
+            self.db, self._columns(), (Blog.creation_date, Blog.id), limit, cursor, sort
+        )
+        return Page(
+            items=self._responses(page.items, comments_limit),
+            next_cursor=page.next_cursor,
         )
 
-    def search_by_title(self, title: str) -> List[Blog]:
-        return (
-            self.db.query(Blog)
-            .join(BlogLanContent)
-            .filter(BlogLanContent.title.ilike(f"%{title}%"))
-            .all()
+    def search(
+        self,
+        text: str,
+        lan: Optional[Language] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        *,
+        comments_limit: int,
+    ) -> Page[dict]:
+        """Busca blogs por título y descripción ordenados por relevancia."""
+        ranked = get_search_service().search_blogs(
+            self.db, text, lan=lan, limit=limit, cursor=cursor
+        )
+        if not ranked.items:
+            return Page(items=[], next_cursor=ranked.next_cursor)
+
+        rows = self.db.execute(self._columns().where(Blog.id.in_(ranked.items)))
+        # Mantener el orden de relevancia del motor de búsqueda
+        by_id = {row.id: row for row in rows}
+        return Page(
+            items=self._responses(
+                [by_id[blog_id] for blog_id in ranked.items if blog_id in by_id],
+                comments_limit,
+            ),
+            next_cursor=ranked.next_cursor,
+        )
+
+    @staticmethod
+    def _columns() -> Select:
+        return select(Blog.id, Blog.product_id, Blog.image, Blog.creation_date)
+
+    def _responses(self, rows: Sequence[Row], comments_limit: int) -> List[dict]:
+        """
+        Completa una página de blogs con sus contenidos y comentarios.
+
+        Camino de solo lectura de los listados: en lugar de entidades del ORM
+        con un joinedload (que repite cada blog por cada combinación de
+        contenido y comentario), se lee una consulta de columnas por colección
+        para toda la página y otra para los autores de los comentarios. De
+        cada blog solo se incluyen los `comments_limit` comentarios más
+        recientes; el resto se pagina con `get_comments`.
+
+        Args:
+            rows (Sequence[Row]): Filas de `_columns` en el orden de la respuesta
+            comments_limit (int): Comentarios incluidos por blog
+
+        Returns:
+            List[dict]: Blogs con los campos del modelo de respuesta `Blog`
+        """
+        if not rows:
+            return []
+        blog_ids = [row.id for row in rows]
+        contents = self._contents(blog_ids)
+
+        # Los más recientes de cada blog con un LATERAL ... LIMIT: cada blog lee
+        # solo sus primeras entradas del índice (blog_id, creation_date, id)
+        latest = (
+            self._comment_columns()
+            .where(BlogComment.blog_id == Blog.id)
+            .order_by(*order_by_keys(COMMENT_KEYS, SortOrder.NEWEST))
+            .limit(comments_limit)
+            .lateral("latest_comments")
+        )
+        comments = defaultdict(list)
+        for comment in self._comment_responses(
+            self.db.execute(
+                select(latest)
+                .select_from(Blog)
+                .join(latest, true())
+                .where(Blog.id.in_(blog_ids))
+                .order_by(
+                    latest.c.blog_id,
+                    latest.c.creation_date.desc(),
+                    latest.c.id.desc(),
+                )
+            ).all()
+        ):
+            comments[comment["blog_id"]].append(comment)
+
+        return [self._response(row, contents[row.id], comments[row.id]) for row in rows]
+
+    @staticmethod
+    def _response(row: Row, contents: List[dict], comments: List[dict]) -> dict:
+        return {
+            "id": row.id,
+            "product_id": row.product_id,
+            "image": row.image,
+            "blog_lan_contents": contents,
+            "comments": comments,
+            "creation_date": row.creation_date,
+        }
+
+    def _contents(self, blog_ids: Sequence[UUID]) -> Dict[UUID, List[dict]]:
+        contents = defaultdict(list)
+        for content in self.db.execute(
+            select(
+                BlogLanContent.blog_id,
+                BlogLanContent.lan,
+                BlogLanContent.title,
+                BlogLanContent.description,
+            )
+            .where(BlogLanContent.blog_id.in_(blog_ids))
+            .order_by(BlogLanContent.blog_id, BlogLanContent.lan)
+        ):
+            contents[content.blog_id].append(content._asdict())
+        return contents
+
+    @staticmethod
+    def _comment_columns() -> Select:
+        # Los comentarios de usuarios borrados (user_id a NULL) no tienen autor:
+        # se descartan en la consulta para que no acorten las páginas
+        return select(
+            BlogComment.id,
+            BlogComment.blog_id,
+            BlogComment.user_id,
+            BlogComment.comment,
+            BlogComment.image,
+            BlogComment.n_likes,
+            BlogComment.creation_date,
+        ).where(BlogComment.user_id.is_not(None))
+
+    def _comment_page(
+        self,
+        blog_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[dict]:
+        # Recorre el índice (blog_id, creation_date, id) desde el cursor
+        page = paginate_rows(
+            self.db,
+            self._comment_columns().where(BlogComment.blog_id == blog_id),
+            COMMENT_KEYS,
+            limit,
+            cursor,
+            sort,
+        )
+        return Page(
+            items=self._comment_responses(page.items), next_cursor=page.next_cursor
+        )
+
+    def _comment_responses(self, rows: Sequence[Row]) -> List[dict]:
+        # Los autores de todos los comentarios en una consulta, cada uno una vez
+        authors = self._authors({row.user_id for row in rows})
+        return [
+            {
+                "id": row.id,
+                "blog_id": row.blog_id,
+                "user": authors[row.user_id],
+                "comment": row.comment,
+                "image": row.image,
+                "n_likes": row.n_likes,
+                "creation_date": row.creation_date,
+            }
+            for row in rows
+            # Autor borrado entre la consulta de comentarios y la de autores
+            if row.user_id in authors
+        ]
+
+    def _authors(self, user_ids: Set[UUID]) -> Dict[UUID, dict]:
+        if not user_ids:
+            return {}
+        rows = self.db.execute(
+            select(
+                User.id,
+                User.email,
+                User.nick_name,
+                User.role,
+                User.image,
+                User.is_blocked,
+                User.creation_date,
+            ).where(User.id.in_(user_ids))
         )
+        return {row.id: row._asdict() for row in rows}
 
     def search_by_product(self, product_id: UUID) -> List[Blog]:
         return self.db.query(Blog).filter(Blog.product_id == product_id).all()
@@ -42,7 +288,8 @@ class BlogRepository:
     def add_comment(
         self, blog_id: UUID, comment_data: CreateBlogComment, user_id: UUID
     ) -> Optional[BlogComment]:
-        blog = self.get_by_id(blog_id)
+        # Solo comprobar que existe: sin cargar contenidos ni comentarios
+        blog = self.db.query(Blog.id).filter(Blog.id == blog_id).first()
         if not blog:
             return None
 
@@ -54,42 +301,84 @@ class BlogRepository:
             n_likes=0,
         )
         self.db.add(new_comment)
-        self.db.commit()
-        self.db.refresh(new_comment)
+        self.db.flush()
+        after_commit(self.db, lambda: get_response_cache().invalidate(TAG_BLOGS))
         return new_comment
 
     def like_comment(self, comment_id: UUID, user_id: UUID) -> bool:
-        comment = (
-            self.db.query(BlogComment).filter(BlogComment.id == comment_id).first()
+        like_aggregator = get_like_aggregator()
+        if like_aggregator.running:
+            # Escritura diferida: se acumula y se vuelca por lotes, y solo si la
+            # transacción que lo registra llega a confirmarse
+            exists = (
+                self.db.query(BlogComment.id)
+                .filter(BlogComment.id == comment_id)
+                .first()
+            )
+            if not exists:
+                return False
+            after_commit(self.db, lambda: like_aggregator.add(comment_id))
+            return True
+
+        # Incremento atómico en la base de datos: sin leer la fila ni perder likes
+        updated = (
+            self.db.query(BlogComment)
+            .filter(BlogComment.id == comment_id)
+            .update(
+                {BlogComment.n_likes: BlogComment.n_likes + 1},
+                synchronize_session=False,
+            )
         )
-        if not comment:
+        if not updated:
             return False
 
-        comment.n_likes += 1
-        self.db.commit()
+        # El detalle del blog muestra el número de likes
+        after_commit(self.db, lambda: get_response_cache().invalidate(TAG_BLOGS))
         return True
 
+    def increment_likes(self, deltas: Mapping[UUID, int]) -> int:
+        """Suma los likes de varios comentarios con un único UPDATE ... FROM (VALUES ...)."""
+        if not deltas:
+            return 0
+
+        # Orden estable de filas para que dos workers no se bloqueen mutuamente
+        rows = sorted(deltas.items())
+        likes = values(
+            column("id", PGUUID(as_uuid=True)), column("delta", Integer), name="likes"
+        ).data(rows)
+        result = self.db.execute(
+            update(BlogComment)
+            .where(BlogComment.id == likes.c.id)
+            .values(n_likes=BlogComment.n_likes + likes.c.delta)
+            .execution_options(synchronize_session=False)
+        )
+        after_commit(self.db, lambda: get_response_cache().invalidate(TAG_BLOGS))
+        return result.rowcount
+
     def create(self, blog_data: CreateBlog) -> Blog:
-        # Crear el blog base
+        # El blog y sus contenidos se insertan juntos en el flush; las colecciones
+        # quedan cargadas en memoria para el índice de búsqueda
         blog = Blog(
             product_id=blog_data.productId,
             image=blog_data.image,
+            blog_lan_contents=[
+                BlogLanContent(
+                    lan=content.lan.value,
+                    title=content.title,
+                    description=content.description,
+                )
+                for content in blog_data.contents
+            ],
+            comments=[],
         )
         self.db.add(blog)
-        self.db.flush()  # Para obtener el ID del blog
-
-        # Crear los contenidos en diferentes idiomas
-        for content in blog_data.contents:
-            blog_content = BlogLanContent(
-                blog_id=blog.id,
-                lan=content.lan,
-                title=content.title,
-                description=content.description,
-            )
-            self.db.add(blog_content)
+        self.db.flush()
+
+        def publish() -> None:
+            get_search_service().index_blog(blog)
+            get_response_cache().invalidate(TAG_BLOGS)
 
-        self.db.commit()
-        self.db.refresh(blog)
+        after_commit(self.db, publish)
         return blog
 
     def delete(self, blog_id: UUID) -> bool:
@@ -98,7 +387,13 @@ class BlogRepository:
             return False
 
         self.db.delete(blog)
-        self.db.commit()
+        self.db.flush()
+
+        def publish() -> None:
+            get_search_service().remove_blog(blog_id)
+            get_response_cache().invalidate(TAG_BLOGS)
+
+        after_commit(self.db, publish)
         return True
 
     def get_blog_lan_contents(self, blog_id: UUID) -> List[BlogLanContent]:
@@ -113,3 +408,9 @@ class BlogRepository:
 
     def get_user_by_blog_id(self, user_id: UUID) -> Optional[User]:
         return self.db.query(User).filter(User.id == user_id).first()
+
+
+def apply_like_deltas(deltas: Mapping[UUID, int]) -> None:
+    """Vuelca los likes acumulados por `LikeAggregator` con una sesión propia."""
+    with unit_of_work() as db:
+        BlogRepository(db).increment_likes(deltas)
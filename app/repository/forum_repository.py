@@ -1,24 +1,50 @@
-from typing import List, Optional
+from typing import Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.schemas.models import Forum, Thread, ThreadComment
+from app.db.connection import after_commit
+from app.db.schemas.models import Thread, ThreadComment
 from app.models import CreateThreadComment, Language
+from app.repository.pagination import Page, SortOrder, paginate
+from app.services.forum_registry import (
+    ForumRegion,
+    ForumRegistry,
+    get_forum_registry,
+)
+from app.services.response_cache import TAG_FORUMS, get_response_cache
 
 
 class ForumRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all_forums(self) -> List[Forum]:
-        return self.db.query(Forum).all()
+    def _registry(self) -> ForumRegistry:
+        # Las regiones se sirven desde memoria; solo se consultan si no se cargaron
+        registry = get_forum_registry()
+        if not registry.loaded:
+            registry.load(self.db)
+        return registry
 
-    def get_forum_by_region(self, region_id: str) -> Optional[Forum]:
-        return self.db.query(Forum).filter(Forum.region_id == region_id).first()
+    def get_all_forums(self) -> Tuple[ForumRegion, ...]:
+        return self._registry().all()
 
-    def get_threads_by_region(self, region_id: str) -> List[Thread]:
-        return self.db.query(Thread).filter(Thread.region_id == region_id).all()
+    def get_forum_by_region(self, region_id: str) -> Optional[ForumRegion]:
+        return self._registry().get(region_id)
+
+    def get_threads_by_region(
+        self,
+        region_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[Thread]:
+        query = (
+            self.db.query(Thread)
+            .options(selectinload(Thread.comments).selectinload(ThreadComment.user))
+            .filter(Thread.region_id == region_id)
+        )
+        return paginate(query, (Thread.creation_date, Thread.id), limit, cursor, sort)
 
     def create_thread(
         self,
@@ -38,14 +64,14 @@ class ForumRepository:
             description=description,
         )
         self.db.add(thread)
-        self.db.commit()
-        self.db.refresh(thread)
+        self.db.flush()
+        after_commit(self.db, lambda: get_response_cache().invalidate(TAG_FORUMS))
         return thread
 
     def add_thread_comment(
         self, thread_id: UUID, comment_data: CreateThreadComment, user_id: UUID
     ) -> Optional[ThreadComment]:
-        thread = self.db.query(Thread).filter(Thread.id == thread_id).first()
+        thread = self.db.query(Thread.id).filter(Thread.id == thread_id).first()
         if not thread:
             return None
 
@@ -55,8 +81,7 @@ class ForumRepository:
             content=comment_data.content,
         )
         self.db.add(comment)
-        self.db.commit()
-        self.db.refresh(comment)
+        self.db.flush()
         return comment
 
     def get_thread_by_id(self, thread_id: UUID) -> Optional[Thread]:
@@ -68,7 +93,7 @@ class ForumRepository:
             return False
 
         self.db.delete(thread)
-        self.db.commit()
+        self.db.flush()
         return True
 
     def delete_comment(self, comment_id: UUID) -> bool:
@@ -79,5 +104,5 @@ class ForumRepository:
             return False
 
         self.db.delete(comment)
-        self.db.commit()
+        self.db.flush()
         return True
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, Row, Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class SortOrder(str, Enum):
+    NEWEST = "newest"
+    OLDEST = "oldest"
+
+    @property
+    def descending(self) -> bool:
+        return self != SortOrder.OLDEST
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(order: str, values: Sequence[Any]) -> str:
+    """Serializa la clave de la última fila en un cursor opaco."""
+    payload = json.dumps(
+        {"s": order, "k": [str(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str, types: Sequence[type]) -> List[Any]:
+    """Recupera la clave de un cursor convirtiendo cada valor al tipo indicado."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        raw_values = payload["k"]
+        if payload["s"] != order or len(raw_values) != len(types):
+            raise InvalidCursor("Cursor does not match the requested sort")
+
+        values = []
+        for python_type, raw in zip(types, raw_values):
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(raw))
+            else:
+                values.append(python_type(raw))
+        return values
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def order_by_keys(
+    keys: Sequence[InstrumentedAttribute], sort: SortOrder
+) -> List[ColumnElement]:
+    """Cláusulas ORDER BY de la clave de paginación en el orden solicitado."""
+    return [key.desc() if sort.descending else key.asc() for key in keys]
+
+
+def _keyset_filter(
+    keys: Sequence[InstrumentedAttribute], cursor: str, sort: SortOrder
+) -> ColumnElement[bool]:
+    """Condición que deja solo las filas posteriores a la clave del cursor."""
+    values = decode_cursor(cursor, sort.value, [key.type.python_type for key in keys])
+    row = tuple_(*keys)
+    bound = tuple_(*(literal(value, key.type) for key, value in zip(keys, values)))
+    return row < bound if sort.descending else row > bound
+
+
+def paginate(
+    query: Query,
+    keys: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: Optional[str] = None,
+    sort: SortOrder = SortOrder.NEWEST,
+) -> Page:
+    """Aplica paginación por clave (keyset) a una consulta ORM.
+
+    Las filas se ordenan por `keys` (la última debe ser única, normalmente el id)
+    y la página siguiente empieza justo después de la clave guardada en el cursor,
+    de modo que el coste no depende de la profundidad de la página como con OFFSET.
+
+    Args:
+        query (Query): Consulta sobre una única entidad
+        keys (Sequence[InstrumentedAttribute]): Columnas que forman la clave de orden
+        limit (int): Tamaño máximo de la página
+        cursor (Optional[str]): Cursor devuelto por la página anterior
+        sort (SortOrder): Orden solicitado
+
+    Returns:
+        Page: Elementos de la página y cursor de la siguiente, si la hay
+    """
+    if cursor:
+        query = query.filter(_keyset_filter(keys, cursor, sort))
+
+    items = query.order_by(*order_by_keys(keys, sort)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort.value, [getattr(last, key.key) for key in keys]
+        )
+
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def paginate_rows(
+    db: Session,
+    statement: Select,
+    keys: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: Optional[str] = None,
+    sort: SortOrder = SortOrder.NEWEST,
+) -> Page[Row]:
+    """Paginación por clave de una consulta de columnas (Core).
+
+    Igual que `paginate`, pero las filas se devuelven tal cual (`Row`): no se
+    construyen entidades ni pasan por el identity map de la sesión, así que es
+    el camino de lectura de los listados que solo se serializan. Las columnas
+    de `keys` deben estar entre las seleccionadas, con o sin etiqueta.
+
+    Args:
+        db (Session): Sesión con la que se ejecuta la consulta
+        statement (Select): Columnas a leer, con sus filtros
+        keys (Sequence[InstrumentedAttribute]): Columnas que forman la clave de orden
+        limit (int): Tamaño máximo de la página
+        cursor (Optional[str]): Cursor devuelto por la página anterior
+        sort (SortOrder): Orden solicitado
+
+    Returns:
+        Page[Row]: Filas de la página y cursor de la siguiente, si la hay
+    """
+    # Posición de cada columna de la clave en la fila (puede ir etiquetada)
+    selected = list(statement.selected_columns)
+    positions = [
+        next(
+            index
+            for index, column in enumerate(selected)
+            if column.shares_lineage(key.expression)
+        )
+        for key in keys
+    ]
+    if cursor:
+        statement = statement.where(_keyset_filter(keys, cursor, sort))
+
+    rows = db.execute(
+        statement.order_by(*order_by_keys(keys, sort)).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort.value, [last[index] for index in positions])
+
+    return Page(items=rows, next_cursor=next_cursor)
@@ -1,10 +1,16 @@
-from typing import List, Optional
-from uuid import UUID
+from collections import defaultdict
+from typing import List, Optional, Sequence
+from uuid import UUID, uuid4
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, insert, select
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.schemas.models import Product, ProductLanContent, ProductRegion
-from app.models import CreateProductBase, CreateProductContent
+from app.db.connection import after_commit
+from app.db.schemas.models import Product, ProductLanContent, ProductRegion, utcnow
+from app.models import CreateProductBase, CreateProductContent, ImportProduct, Language
+from app.repository.pagination import Page, SortOrder, paginate_rows
+from app.services.response_cache import TAG_BLOGS, TAG_PRODUCTS, get_response_cache
+from app.services.search_service import get_search_service
 
 
 class ProductRepository:
@@ -12,45 +18,191 @@ class ProductRepository:
         self.db = db
 
     def create(self, product_data: CreateProductBase) -> Product:
+        # El producto y sus regiones se insertan juntos en el flush; las
+        # colecciones quedan cargadas en memoria para el índice de búsqueda
         db_product = Product(
             image=product_data.image,
+            regions=[
+                ProductRegion(region_code=region_code)
+                for region_code in product_data.regions
+            ],
+            product_lan_contents=[],
         )
         self.db.add(db_product)
         self.db.flush()
+        after_commit(self.db, lambda: self._publish(db_product))
+        return db_product
+
+    def import_products(self, products_data: List[ImportProduct]) -> List[UUID]:
+        """
+        Inserta un lote de productos con sus regiones y contenidos.
+
+        Los identificadores y las fechas se generan en el cliente, así que cada
+        tabla se rellena con un único INSERT por lotes (executemany) sin
+        recuperar filas. Todo el lote va en una sola transacción: si falla la
+        base de datos no se inserta ningún producto.
+
+        Args:
+            products_data (List[ImportProduct]): Productos ya validados
 
-        # Crear regiones
-        for region_code in product_data.regions:
-            db_region = ProductRegion(
-                product_id=db_product.id,
-                region_code=region_code,
+        Returns:
+            List[UUID]: Identificadores de los productos, en el mismo orden
+        """
+        now = utcnow()
+        product_ids = [uuid4() for _ in products_data]
+        products = []
+        regions = []
+        contents = []
+        for product_id, product_data in zip(product_ids, products_data):
+            products.append(
+                {"id": product_id, "image": product_data.image, "creation_date": now}
             )
-            self.db.add(db_region)
+            regions.extend(
+                {"product_id": product_id, "region_code": region_code}
+                for region_code in product_data.regions
+            )
+            contents.extend(
+                {
+                    "id": uuid4(),
+                    "product_id": product_id,
+                    "lan": content.lan.value,
+                    "name": content.name,
+                    "description": content.description,
+                }
+                for content in product_data.contents
+            )
+        if not products:
+            return []
 
-        self.db.commit()
-        self.db.refresh(db_product)
-        return db_product
+        self.db.execute(insert(Product.__table__), products)
+        self.db.execute(insert(ProductRegion.__table__), regions)
+        if contents:
+            self.db.execute(insert(ProductLanContent.__table__), contents)
 
-    def get_by_id(self, product_id: UUID) -> Optional[Product]:
-        return self.db.query(Product).filter(Product.id == product_id).first()
+        def publish() -> None:
+            search_service = get_search_service()
+            for product_id, product_data in zip(product_ids, products_data):
+                search_service.index_product_contents(
+                    product_id,
+                    product_data.regions,
+                    [
+                        (content.lan.value, content.name, content.description)
+                        for content in product_data.contents
+                    ],
+                )
+            get_response_cache().invalidate(TAG_PRODUCTS)
 
-    def get_all(self) -> List[Product]:
-        return self.db.query(Product).all()
+        after_commit(self.db, publish)
+        return product_ids
 
-    def search_by_name(self, name: str) -> List[Product]:
-        return (
-            self.db.query(Product)
-            .join(Product.product_lan_contents)
-            .filter(ProductLanContent.name.ilike(f"%{name}%"))
-            .all()
+    def _query(self):
+        # Cargar regiones y contenidos por adelantado: las respuestas siempre los usan
+        return self.db.query(Product).options(
+            selectinload(Product.regions), selectinload(Product.product_lan_contents)
         )
 
-    def search_by_region(self, region: str) -> List[Product]:
-        return (
-            self.db.query(Product)
-            .join(Product.regions)
-            .filter(ProductRegion.region_code == region)
-            .all()
+    def get_by_id(self, product_id: UUID) -> Optional[Product]:
+        return self._query().filter(Product.id == product_id).first()
+
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[dict]:
+        return self.search(limit=limit, cursor=cursor, sort=sort)
+
+    def search(
+        self,
+        name: Optional[str] = None,
+        region: Optional[str] = None,
+        lan: Optional[Language] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[dict]:
+        """Filtra productos por texto y/o región.
+
+        Con `name` se usa el motor de búsqueda de texto completo y los resultados
+        se ordenan por relevancia (el cursor es de relevancia y `sort` se ignora);
+        sin él se pagina por fecha con un EXISTS sobre las regiones.
+
+        Es un camino de solo lectura: se leen únicamente las columnas de la
+        respuesta como filas Core, sin construir entidades del ORM, y cada
+        producto se devuelve como diccionario con los campos de
+        `ProductResponse`. Una página cuesta una consulta más una para las
+        regiones y otra para los contenidos de todos sus productos.
+        """
+        columns = select(Product.id, Product.image, Product.creation_date)
+        if name:
+            ranked = get_search_service().search_products(
+                self.db, name, lan=lan, region=region, limit=limit, cursor=cursor
+            )
+            if not ranked.items:
+                return Page(items=[], next_cursor=ranked.next_cursor)
+
+            rows = self.db.execute(columns.where(Product.id.in_(ranked.items)))
+            # Mantener el orden de relevancia del motor de búsqueda
+            by_id = {row.id: row for row in rows}
+            return Page(
+                items=self._responses(
+                    [
+                        by_id[product_id]
+                        for product_id in ranked.items
+                        if product_id in by_id
+                    ]
+                ),
+                next_cursor=ranked.next_cursor,
+            )
+
+        if region:
+            columns = columns.where(
+                Product.regions.any(ProductRegion.region_code == region)
+            )
+        page = paginate_rows(
+            self.db, columns, (Product.creation_date, Product.id), limit, cursor, sort
         )
+        return Page(items=self._responses(page.items), next_cursor=page.next_cursor)
+
+    def _responses(self, rows: Sequence[Row]) -> List[dict]:
+        # Regiones y contenidos de toda la página, una consulta para cada uno
+        if not rows:
+            return []
+        product_ids = [row.id for row in rows]
+
+        regions = defaultdict(list)
+        for product_id, region_code in self.db.execute(
+            select(ProductRegion.product_id, ProductRegion.region_code)
+            .where(ProductRegion.product_id.in_(product_ids))
+            .order_by(ProductRegion.product_id, ProductRegion.region_code)
+        ):
+            regions[product_id].append(region_code)
+
+        contents = defaultdict(list)
+        for product_id, lan, name, description in self.db.execute(
+            select(
+                ProductLanContent.product_id,
+                ProductLanContent.lan,
+                ProductLanContent.name,
+                ProductLanContent.description,
+            )
+            .where(ProductLanContent.product_id.in_(product_ids))
+            .order_by(ProductLanContent.product_id, ProductLanContent.lan)
+        ):
+            contents[product_id].append(
+                {"lan": lan, "name": name, "description": description}
+            )
+
+        return [
+            {
+                "id": row.id,
+                "image": row.image,
+                "creationDate": row.creation_date,
+                "regions": regions[row.id],
+                "productLanContents": contents[row.id],
+            }
+            for row in rows
+        ]
 
     def add_content(
         self, product_id: UUID, content_data: CreateProductContent
@@ -59,14 +211,14 @@ class ProductRepository:
         if not product:
             return None
 
-        # Verificar si ya existe contenido para ese idioma
-        existing_content = (
-            self.db.query(ProductLanContent)
-            .filter(
-                ProductLanContent.product_id == product_id,
-                ProductLanContent.lan == content_data.lan.value,
-            )
-            .first()
+        # Verificar si ya existe contenido para ese idioma (ya cargados con el producto)
+        existing_content = next(
+            (
+                content
+                for content in product.product_lan_contents
+                if content.lan == content_data.lan.value
+            ),
+            None,
         )
 
         if existing_content:
@@ -75,16 +227,16 @@ class ProductRepository:
             existing_content.description = content_data.description
         else:
             # Crear nuevo contenido
-            new_content = ProductLanContent(
-                product_id=product_id,
-                lan=content_data.lan.value,
-                name=content_data.name,
-                description=content_data.description,
+            product.product_lan_contents.append(
+                ProductLanContent(
+                    lan=content_data.lan.value,
+                    name=content_data.name,
+                    description=content_data.description,
+                )
             )
-            self.db.add(new_content)
 
-        self.db.commit()
-        self.db.refresh(product)
+        self.db.flush()
+        after_commit(self.db, lambda: self._publish(product))
         return product
 
     def delete(self, product_id: UUID) -> bool:
@@ -93,5 +245,17 @@ class ProductRepository:
             return False
 
         self.db.delete(product)
-        self.db.commit()
+        self.db.flush()
+
+        def publish() -> None:
+            get_search_service().remove_product(product_id)
+            # Los blogs del producto se borran en cascada
+            get_response_cache().invalidate(TAG_PRODUCTS, TAG_BLOGS)
+
+        after_commit(self.db, publish)
         return True
+
+    @staticmethod
+    def _publish(product: Product) -> None:
+        get_search_service().index_product(product)
+        get_response_cache().invalidate(TAG_PRODUCTS)
@@ -1,10 +1,12 @@
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
 from app.db.schemas.models import BlogRequest, ProductRequest
 from app.models import CreateBlogRequest, CreateProductRequest
+from app.repository.pagination import Page, SortOrder, order_by_keys, paginate
 
 
 class RequestRepository:
@@ -21,12 +23,36 @@ class RequestRepository:
             description=request_data.description,
         )
         self.db.add(request)
-        self.db.commit()
-        self.db.refresh(request)
+        self.db.flush()
         return request
 
-    def get_product_requests(self) -> List[ProductRequest]:
-        return self.db.query(ProductRequest).all()
+    def get_product_requests(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[ProductRequest]:
+        return paginate(
+            self.db.query(ProductRequest),
+            (ProductRequest.creation_date, ProductRequest.id),
+            limit,
+            cursor,
+            sort,
+        )
+
+    @staticmethod
+    def export_product_requests_select(sort: SortOrder = SortOrder.NEWEST) -> Select:
+        """Columnas de las solicitudes de productos para exportarlas en streaming."""
+        return select(
+            ProductRequest.id.label("id"),
+            ProductRequest.name.label("name"),
+            ProductRequest.user_id.label("userId"),
+            ProductRequest.image.label("image"),
+            ProductRequest.description.label("description"),
+            ProductRequest.creation_date.label("creationDate"),
+        ).order_by(
+            *order_by_keys((ProductRequest.creation_date, ProductRequest.id), sort)
+        )
 
     def create_blog_request(
         self, request_data: CreateBlogRequest, user_id: UUID
@@ -39,12 +65,22 @@ class RequestRepository:
             image=request_data.image,
         )
         self.db.add(request)
-        self.db.commit()
-        self.db.refresh(request)
+        self.db.flush()
         return request
 
-    def get_blog_requests(self) -> List[BlogRequest]:
-        return self.db.query(BlogRequest).all()
+    def get_blog_requests(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[BlogRequest]:
+        return paginate(
+            self.db.query(BlogRequest),
+            (BlogRequest.creation_date, BlogRequest.id),
+            limit,
+            cursor,
+            sort,
+        )
 
     def get_blog_request_by_id(self, request_id: UUID) -> Optional[BlogRequest]:
         return self.db.query(BlogRequest).filter(BlogRequest.id == request_id).first()
@@ -59,7 +95,7 @@ class RequestRepository:
             return False
 
         self.db.delete(request)
-        self.db.commit()
+        self.db.flush()
         return True
 
     def delete_blog_request(self, request_id: UUID) -> bool:
@@ -68,5 +104,5 @@ class RequestRepository:
             return False
 
         self.db.delete(request)
-        self.db.commit()
+        self.db.flush()
         return True
@@ -1,10 +1,27 @@
-from typing import List, Optional
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, List, Mapping, Optional, Tuple, Type
 from uuid import UUID
 
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.db.schemas.models import ResourceAccess
-from app.models import CreateResourceAccess
+from app.db.connection import after_commit, unit_of_work
+from app.db.schemas.models import (
+    ResourceAccess,
+    ResourceAccessDaily,
+    ResourceAccessHourly,
+    ResourceAccessRollup,
+    utcnow,
+)
+from app.models import AccessDevice, CreateResourceAccess
+from app.repository.pagination import Page, SortOrder, order_by_keys, paginate_rows
+from app.services.rollup_aggregator import RollupKey, get_rollup_aggregator
+
+# Accesos por (intervalo, tipo de recurso, recurso, dispositivo)
+RollupCounts = Counter[RollupKey]
 
 
 class ResourceRepository:
@@ -17,14 +34,133 @@ class ResourceRepository:
             resource_type=resource_data.resourceType,
             resource_id=resource_data.resourceId,
             access_type=resource_data.accessType,
+            access_date=utcnow(),
+            device_type=resource_data.deviceType,
         )
         self.db.add(resource)
-        self.db.commit()
-        self.db.refresh(resource)
+        self.db.flush()
+
+        rollup_aggregator = get_rollup_aggregator()
+        if rollup_aggregator.running:
+            # Escritura diferida: los contadores se suman por lotes fuera de la
+            # petición, y solo si el acceso llega a confirmarse
+            counts = _hourly_counts(
+                [
+                    (
+                        resource.access_date,
+                        resource.resource_type,
+                        resource.resource_id,
+                        resource.device_type,
+                    )
+                ],
+                sign=1,
+            )
+            after_commit(self.db, lambda: rollup_aggregator.add_many(counts))
+        else:
+            # El acceso y sus contadores agregados se guardan en la misma transacción
+            self.update_rollups([resource])
         return resource
 
-    def get_all(self) -> List[ResourceAccess]:
-        return self.db.query(ResourceAccess).all()
+    def create_many(self, resources_data: List[CreateResourceAccess]) -> int:
+        """
+        Registra un lote de accesos en una sola transacción.
+
+        En lugar de un add + commit + refresh por acceso, las filas se insertan
+        con sentencias INSERT de varias filas y los contadores agregados se
+        actualizan una vez para todo el lote. Los ids y la fecha se generan
+        aquí, así que no hace falta RETURNING.
+
+        Args:
+            resources_data (List[CreateResourceAccess]): Accesos a registrar
+
+        Returns:
+            int: Número de accesos insertados
+        """
+        if not resources_data:
+            return 0
+
+        access_date = utcnow()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": resource_data.userId,
+                "resource_type": resource_data.resourceType,
+                "resource_id": resource_data.resourceId,
+                "access_type": resource_data.accessType,
+                "access_date": access_date,
+                "device_type": resource_data.deviceType,
+            }
+            for resource_data in resources_data
+        ]
+        # executemany sobre la tabla: la sentencia se compila una vez (caché) y
+        # el driver la envía como INSERT de varias filas por bloques
+        self.db.execute(insert(ResourceAccess.__table__), rows)
+        self._update_rollup_counts(
+            (
+                (
+                    row["access_date"],
+                    row["resource_type"],
+                    row["resource_id"],
+                    row["device_type"],
+                )
+                for row in rows
+            ),
+            sign=1,
+        )
+        return len(rows)
+
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Page[dict]:
+        # Solo lectura: filas con las columnas de la respuesta, sin entidades
+        page = paginate_rows(
+            self.db,
+            self._columns(start, end),
+            (ResourceAccess.access_date, ResourceAccess.id),
+            limit,
+            cursor,
+            sort,
+        )
+        return Page(
+            items=[row._asdict() for row in page.items], next_cursor=page.next_cursor
+        )
+
+    @staticmethod
+    def _columns(
+        start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Select:
+        """Columnas de los accesos con los nombres de la respuesta."""
+        statement = select(
+            ResourceAccess.id.label("id"),
+            ResourceAccess.user_id.label("userId"),
+            ResourceAccess.resource_type.label("resourceType"),
+            ResourceAccess.resource_id.label("resourceId"),
+            ResourceAccess.access_type.label("accessType"),
+            ResourceAccess.access_date.label("accessDate"),
+            ResourceAccess.device_type.label("deviceType"),
+        )
+        # Filtrar por access_date permite descartar las particiones fuera del rango
+        if start is not None:
+            statement = statement.where(ResourceAccess.access_date >= start)
+        if end is not None:
+            statement = statement.where(ResourceAccess.access_date < end)
+        return statement
+
+    @staticmethod
+    def export_select(
+        sort: SortOrder = SortOrder.NEWEST,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Select:
+        """Columnas de los accesos para exportarlos en streaming."""
+        return ResourceRepository._columns(start, end).order_by(
+            *order_by_keys((ResourceAccess.access_date, ResourceAccess.id), sort)
+        )
 
     def get_by_id(self, id: UUID) -> Optional[ResourceAccess]:
         return self.db.query(ResourceAccess).filter(ResourceAccess.id == id).first()
@@ -54,5 +190,166 @@ class ResourceRepository:
             return False
 
         self.db.delete(resource)
-        self.db.commit()
+        self.update_rollups([resource], sign=-1)
+        self.db.flush()
         return True
+
+    def update_rollups(self, accesses: Iterable[ResourceAccess], sign: int = 1) -> None:
+        """
+        Suma (o resta) los accesos a los contadores por hora y por día.
+
+        Los accesos se agrupan antes de escribir, de modo que un lote de N
+        accesos se traduce en un único INSERT ... ON CONFLICT por tabla. No hace
+        commit: se ejecuta dentro de la transacción que inserta los accesos.
+
+        Args:
+            accesses (Iterable[ResourceAccess]): Accesos a contabilizar
+            sign (int): 1 al registrar accesos, -1 al borrarlos
+        """
+        self._update_rollup_counts(
+            (
+                (
+                    access.access_date,
+                    access.resource_type,
+                    access.resource_id,
+                    access.device_type,
+                )
+                for access in accesses
+            ),
+            sign,
+        )
+
+    def rebuild_rollups(self, start: datetime, end: datetime) -> None:
+        """
+        Recalcula los contadores agregados a partir de los accesos en bruto.
+
+        Sirve para corregir desviaciones o rellenar los contadores de accesos
+        cargados por otras vías. `start` y `end` se redondean al día completo.
+
+        Args:
+            start (datetime): Inicio del intervalo (incluido)
+            end (datetime): Fin del intervalo (excluido)
+        """
+        start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if end != end.replace(hour=0, minute=0, second=0, microsecond=0):
+            end = end.replace(hour=0, minute=0, second=0, microsecond=0)
+            end += timedelta(days=1)
+
+        for model, unit in (
+            (ResourceAccessHourly, "hour"),
+            (ResourceAccessDaily, "day"),
+        ):
+            bucket = func.date_trunc(unit, ResourceAccess.access_date)
+            self.db.execute(
+                delete(model).where(model.bucket >= start, model.bucket < end)
+            )
+            self.db.execute(
+                insert(model).from_select(
+                    [
+                        "bucket",
+                        "resource_type",
+                        "resource_id",
+                        "device_type",
+                        "access_count",
+                    ],
+                    select(
+                        bucket,
+                        ResourceAccess.resource_type,
+                        ResourceAccess.resource_id,
+                        ResourceAccess.device_type,
+                        func.count(),
+                    )
+                    .where(
+                        ResourceAccess.access_date >= start,
+                        ResourceAccess.access_date < end,
+                        ResourceAccess.device_type.is_not(None),
+                    )
+                    .group_by(
+                        bucket,
+                        ResourceAccess.resource_type,
+                        ResourceAccess.resource_id,
+                        ResourceAccess.device_type,
+                    ),
+                )
+            )
+
+    def add_rollup_counts(self, counts: Mapping[RollupKey, int]) -> None:
+        """
+        Suma accesos ya agrupados por hora a los contadores por hora y por día.
+
+        Es lo que aplica el volcado de `RollupAggregator`. No hace commit.
+
+        Args:
+            counts (Mapping[RollupKey, int]): Accesos por (hora, tipo de
+                recurso, recurso, dispositivo)
+        """
+        daily: RollupCounts = Counter()
+        for (hour, resource_type, resource_id, device_type), count in counts.items():
+            day = hour.replace(hour=0)
+            daily[(day, resource_type, resource_id, device_type)] += count
+
+        self._upsert_counts(ResourceAccessHourly, counts)
+        self._upsert_counts(ResourceAccessDaily, daily)
+
+    def _update_rollup_counts(
+        self,
+        keys: Iterable[Tuple[datetime, str, UUID, Optional[AccessDevice]]],
+        sign: int,
+    ) -> None:
+        self.add_rollup_counts(_hourly_counts(keys, sign))
+
+    def _upsert_counts(
+        self,
+        model: Type[ResourceAccessRollup],
+        counts: Mapping[RollupKey, int],
+    ) -> None:
+        if not counts:
+            return
+        # Orden fijo de claves: dos lotes concurrentes bloquean las filas en el
+        # mismo orden y no se interbloquean
+        rows = [
+            {
+                "bucket": bucket,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "device_type": device_type,
+                "access_count": count,
+            }
+            for (bucket, resource_type, resource_id, device_type), count in sorted(
+                counts.items(), key=lambda item: tuple(map(str, item[0]))
+            )
+        ]
+        statement = insert(model.__table__)
+        self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    model.bucket,
+                    model.resource_type,
+                    model.resource_id,
+                    model.device_type,
+                ],
+                set_={
+                    "access_count": model.access_count + statement.excluded.access_count
+                },
+            ),
+            rows,
+        )
+
+
+def _hourly_counts(
+    keys: Iterable[Tuple[datetime, str, UUID, Optional[AccessDevice]]], sign: int
+) -> RollupCounts:
+    counts: RollupCounts = Counter()
+    for access_date, resource_type, resource_id, device_type in keys:
+        # Sin dispositivo no se puede atribuir a ninguna serie
+        if device_type is None:
+            continue
+        hour = access_date.replace(minute=0, second=0, microsecond=0)
+        counts[(hour, resource_type, resource_id, device_type)] += sign
+    return counts
+
+
+def apply_rollup_deltas(deltas: Mapping[RollupKey, int]) -> None:
+    """Vuelca los contadores acumulados por `RollupAggregator` con una sesión propia."""
+    with unit_of_work() as db:
+        ResourceRepository(db).add_rollup_counts(deltas)
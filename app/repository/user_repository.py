@@ -1,11 +1,15 @@
 from typing import List, Optional
 from uuid import UUID
 
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
+from app.db.connection import after_commit
 from app.db.schemas.models import User
 from app.models import Role, UserRegister
+from app.repository.pagination import Page, SortOrder, order_by_keys, paginate_rows
 from app.services.password_service import PasswordService
+from app.services.principal_cache import get_principal_cache
 
 
 class UserRepository:
@@ -13,7 +17,10 @@ class UserRepository:
         self.db = db
 
     def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+        # lower() en ambos lados para usar el índice ix_users_email_lower
+        return (
+            self.db.query(User).filter(func.lower(User.email) == email.lower()).first()
+        )
 
     def get_by_nickname(self, nickname: str) -> Optional[User]:
         return self.db.query(User).filter(User.nick_name == nickname).first()
@@ -21,7 +28,12 @@ class UserRepository:
     def get_by_id(self, user_id: UUID) -> Optional[User]:
         return self.db.query(User).filter(User.id == user_id).first()
 
-    def create(self, user: UserRegister, skip_password_hash: bool = False) -> User:
+    def create(
+        self,
+        user: UserRegister,
+        skip_password_hash: bool = False,
+        hashed_password: Optional[str] = None,
+    ) -> User:
         db_user_data = {
             "email": user.email,
             "nick_name": user.nick_name,
@@ -30,7 +42,10 @@ class UserRepository:
             "is_blocked": False,
         }
 
-        if not skip_password_hash:
+        if hashed_password:
+            # Hash ya calculado fuera (pool de bcrypt)
+            db_user_data["hashed_password"] = hashed_password
+        elif not skip_password_hash:
             if not user.password:
                 raise ValueError("Password is required when not skipping hash.")
             db_user_data["hashed_password"] = PasswordService.get_password_hash(
@@ -41,8 +56,7 @@ class UserRepository:
 
         db_user = User(**db_user_data)
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        self.db.flush()
         return db_user
 
     def update(self, user_id: UUID, user_data: dict) -> Optional[User]:
@@ -55,11 +69,17 @@ class UserRepository:
                 user_data.pop("password")
             )
 
+        previous_email = db_user.email
         for field, value in user_data.items():
             setattr(db_user, field, value)
 
-        self.db.commit()
-        self.db.refresh(db_user)
+        self.db.flush()
+        # Los principals en caché se invalidan cuando el cambio es visible
+        new_email = db_user.email
+        after_commit(
+            self.db,
+            lambda: get_principal_cache().invalidate(previous_email, new_email),
+        )
         return db_user
 
     def delete(self, user_id: UUID) -> bool:
@@ -67,12 +87,45 @@ class UserRepository:
         if not db_user:
             return False
 
+        email = db_user.email
         self.db.delete(db_user)
-        self.db.commit()
+        self.db.flush()
+        after_commit(self.db, lambda: get_principal_cache().invalidate(email))
         return True
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
-        return self.db.query(User).offset(skip).limit(limit).all()
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: SortOrder = SortOrder.NEWEST,
+    ) -> Page[dict]:
+        # Solo lectura: filas con las columnas de la respuesta, sin entidades
+        page = paginate_rows(
+            self.db, self._columns(), (User.creation_date, User.id), limit, cursor, sort
+        )
+        return Page(
+            items=[row._asdict() for row in page.items], next_cursor=page.next_cursor
+        )
+
+    @staticmethod
+    def _columns() -> Select:
+        """Columnas públicas de los usuarios (sin la contraseña)."""
+        return select(
+            User.id.label("id"),
+            User.email.label("email"),
+            User.nick_name.label("nick_name"),
+            User.role.label("role"),
+            User.image.label("image"),
+            User.is_blocked.label("is_blocked"),
+            User.creation_date.label("creation_date"),
+        )
+
+    @staticmethod
+    def export_select(sort: SortOrder = SortOrder.NEWEST) -> Select:
+        """Columnas de los usuarios para exportarlos en streaming."""
+        return UserRepository._columns().order_by(
+            *order_by_keys((User.creation_date, User.id), sort)
+        )
 
     def get_users_by_role(self, role: Role) -> List[User]:
         return self.db.query(User).filter(User.role == role).all()
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.connection import get_session
+from app.db.schemas.models import as_utc_naive, utcnow
+from app.models import (
+    AccessDevice,
+    AccessTimeBucket,
+    AnalyticsGranularity,
+    DeviceAccesses,
+    Role,
+    TopResource,
+    User,
+)
+from app.repository.adapters import AsyncRepository, repository_for
+from app.repository.analytics_repository import AnalyticsRepository
+from app.services.auth_service import get_current_active_user
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# Intervalo por defecto cuando no se indica `start`
+DEFAULT_RANGE = timedelta(days=7)
+
+
+def get_analytics_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[AnalyticsRepository]:
+    return repository_for(db, AnalyticsRepository)
+
+
+async def get_current_employee(
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    if current_user.role != Role.EMPLOYEE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return current_user
+
+
+class TimeRange:
+    """Intervalo [start, end) de las consultas de analítica, en UTC."""
+
+    def __init__(
+        self,
+        start: Optional[datetime] = Query(
+            None, description="Inicio (incluido); por defecto, 7 días antes de end"
+        ),
+        end: Optional[datetime] = Query(
+            None, description="Fin (excluido); por defecto, ahora"
+        ),
+    ):
+        # Las columnas son TIMESTAMP sin zona horaria y guardan la hora UTC
+        self.end = as_utc_naive(end) if end else utcnow()
+        self.start = as_utc_naive(start) if start else self.end - DEFAULT_RANGE
+        if self.start >= self.end:
+            raise HTTPException(status_code=400, detail="start must be before end")
+
+
+@router.get("/accesses/top", response_model=List[TopResource])
+async def get_top_resources(
+    time_range: TimeRange = Depends(),
+    resource_type: Optional[str] = Query(None, alias="resourceType"),
+    device_type: Optional[AccessDevice] = Query(None, alias="deviceType"),
+    limit: int = Query(10, ge=1, le=100),
+    _: User = Depends(get_current_employee),
+    analytics_repository: AsyncRepository[AnalyticsRepository] = Depends(
+        get_analytics_repository
+    ),
+):
+    rows = await analytics_repository.top_resources(
+        time_range.start,
+        time_range.end,
+        limit,
+        resource_type=resource_type,
+        device_type=device_type,
+    )
+    return [
+        {
+            "resourceType": row.resource_type,
+            "resourceId": row.resource_id,
+            "accesses": row.accesses,
+        }
+        for row in rows
+    ]
+
+
+@router.get("/accesses/devices", response_model=List[DeviceAccesses])
+async def get_device_split(
+    time_range: TimeRange = Depends(),
+    resource_type: Optional[str] = Query(None, alias="resourceType"),
+    resource_id: Optional[UUID] = Query(None, alias="resourceId"),
+    _: User = Depends(get_current_employee),
+    analytics_repository: AsyncRepository[AnalyticsRepository] = Depends(
+        get_analytics_repository
+    ),
+):
+    rows = await analytics_repository.device_split(
+        time_range.start,
+        time_range.end,
+        resource_type=resource_type,
+        resource_id=resource_id,
+    )
+    return [{"deviceType": row.device_type, "accesses": row.accesses} for row in rows]
+
+
+@router.get("/accesses/timeseries", response_model=List[AccessTimeBucket])
+async def get_access_time_series(
+    time_range: TimeRange = Depends(),
+    granularity: AnalyticsGranularity = AnalyticsGranularity.HOUR,
+    resource_type: Optional[str] = Query(None, alias="resourceType"),
+    resource_id: Optional[UUID] = Query(None, alias="resourceId"),
+    device_type: Optional[AccessDevice] = Query(None, alias="deviceType"),
+    _: User = Depends(get_current_employee),
+    analytics_repository: AsyncRepository[AnalyticsRepository] = Depends(
+        get_analytics_repository
+    ),
+):
+    rows = await analytics_repository.time_series(
+        granularity,
+        time_range.start,
+        time_range.end,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        device_type=device_type,
+    )
+    return [{"bucket": row.bucket, "accesses": row.accesses} for row in rows]
@@ -1,32 +1,41 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.connection import get_db
+from app.config.settings import get_settings
+from app.db.connection import get_session
 from app.models import (
     Blog,
+    BlogComment,
     CreateBlog,
     CreateBlogComment,
     Language,
     User,
 )
+from app.repository.adapters import AsyncRepository, repository_for
 from app.repository.blog_repository import BlogRepository
+from app.routers.pagination import NEXT_CURSOR_HEADER, PageParams, set_page_headers
 from app.services.auth_service import get_current_active_user
+from app.services.serialization import BLOG_COMMENT_LIST, BLOG_LIST
 
 router = APIRouter(tags=["blogs"])
+settings = get_settings()
 
 
-def get_blog_repository(db: Session = Depends(get_db)) -> BlogRepository:
-    return BlogRepository(db)
+def get_blog_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[BlogRepository]:
+    return repository_for(db, BlogRepository)
 
 
 @router.post("/blogs", status_code=201, operation_id="create_blog")
-def create_blog(
+async def create_blog(
     blog_data: CreateBlog,
     current_user: User = Depends(get_current_active_user),
-    blog_repository: BlogRepository = Depends(get_blog_repository),
+    blog_repository: AsyncRepository[BlogRepository] = Depends(get_blog_repository),
 ):
     # Verificar que el usuario es un empleado
     if current_user.role != "EMPLOYEE":
@@ -42,22 +51,22 @@ def create_blog(
         )
 
     # Crear el blog con sus contenidos
-    blog = blog_repository.create(blog_data)
+    blog = await blog_repository.create(blog_data)
     return {"id": str(blog.id)}
 
 
 @router.post("/blogs/{id}/comments", status_code=201)
-def add_blog_comment(
+async def add_blog_comment(
     id: UUID,
     comment_data: CreateBlogComment,
     current_user: User = Depends(get_current_active_user),
-    blog_repository: BlogRepository = Depends(get_blog_repository),
+    blog_repository: AsyncRepository[BlogRepository] = Depends(get_blog_repository),
 ):
     # Verificar que el usuario que hace el comentario es el mismo que está autenticado
     if comment_data.userId != current_user.id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    comment = blog_repository.add_comment(id, comment_data, current_user.id)
+    comment = await blog_repository.add_comment(id, comment_data, current_user.id)
     if not comment:
         raise HTTPException(status_code=404, detail="Blog not found")
 
@@ -65,33 +74,84 @@ def add_blog_comment(
 
 
 @router.post("/blogs/comments/{id}/like", status_code=201)
-def like_blog_comment(
+async def like_blog_comment(
     id: UUID,
     current_user: User = Depends(get_current_active_user),
-    blog_repository: BlogRepository = Depends(get_blog_repository),
+    blog_repository: AsyncRepository[BlogRepository] = Depends(get_blog_repository),
 ):
-    if not blog_repository.like_comment(id, current_user.id):
+    if not await blog_repository.like_comment(id, current_user.id):
         raise HTTPException(status_code=404, detail="Comment not found")
 
     return {"message": "Like added"}
 
 
 @router.get("/blogs/{id}", response_model=Blog)
-def get_blog_by_id(
+async def get_blog_by_id(
     id: UUID,
-    blog_repository: BlogRepository = Depends(get_blog_repository),
+    response: Response,
+    comments_limit: int = Query(
+        settings.page_size_default,
+        ge=1,
+        le=settings.page_size_max,
+        description="Comentarios incluidos (los más recientes); el resto se "
+        f"pide a GET /blogs/{{id}}/comments con la cabecera {NEXT_CURSOR_HEADER}",
+    ),
+    blog_repository: AsyncRepository[BlogRepository] = Depends(get_blog_repository),
 ):
-    blog = blog_repository.get_by_id(id)
-    if not blog:
+    detail = await blog_repository.get_detail(id, comments_limit)
+    if not detail:
         raise HTTPException(status_code=404, detail="Blog not found")
 
+    blog, next_cursor = detail
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return blog
 
 
+@router.get("/blogs/{id}/comments", response_model=List[BlogComment])
+async def get_blog_comments(
+    id: UUID,
+    response: Response,
+    page_params: PageParams = Depends(),
+    blog_repository: AsyncRepository[BlogRepository] = Depends(get_blog_repository),
+):
+    page = await blog_repository.get_comments(
+        id, page_params.limit, page_params.cursor, page_params.sort
+    )
+    if page is None:
+        raise HTTPException(status_code=404, detail="Blog not found")
+    set_page_headers(response, page)
+
+    return BLOG_COMMENT_LIST.response(page.items, response)
+
+
 @router.get("/blogs", response_model=List[Blog])
-def search_blogs(
-    blog_repository: BlogRepository = Depends(get_blog_repository),
+async def search_blogs(
+    response: Response,
+    q: Optional[str] = None,
+    lan: Optional[Language] = None,
+    page_params: PageParams = Depends(),
+    comments_limit: int = Query(
+        settings.page_size_default,
+        ge=1,
+        le=settings.page_size_max,
+        description="Comentarios incluidos por blog (los más recientes); el "
+        "resto se pide a GET /blogs/{id}/comments",
+    ),
+    blog_repository: AsyncRepository[BlogRepository] = Depends(get_blog_repository),
 ):
-    blogs = blog_repository.get_all()
+    if q:
+        # Búsqueda de texto completo ordenada por relevancia
+        page = await blog_repository.search(
+            q, lan, page_params.limit, page_params.cursor, comments_limit=comments_limit
+        )
+    else:
+        page = await blog_repository.get_all(
+            page_params.limit,
+            page_params.cursor,
+            page_params.sort,
+            comments_limit=comments_limit,
+        )
+    set_page_headers(response, page)
 
-    return blogs
+    return BLOG_LIST.response(page.items, response)
@@ -1,9 +1,11 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.connection import get_db
+from app.db.connection import get_session
+from app.db.schemas import models as db_models
 from app.models import (
     CreateThread,
     CreateThreadComment,
@@ -11,41 +13,62 @@ from app.models import (
     Thread,
     User,
 )
+from app.repository.adapters import AsyncRepository, repository_for
 from app.repository.forum_repository import ForumRepository
-from app.services.auth_service import get_auth_service
+from app.routers.pagination import PageParams, set_page_headers
+from app.services.auth_service import get_current_active_user
+from app.services.forum_registry import ForumRegistry, get_loaded_forum_registry
+from app.services.serialization import THREAD_LIST
 
 router = APIRouter(tags=["forums"])
 
 
-def get_forum_repository(db: Session = Depends(get_db)) -> ForumRepository:
-    return ForumRepository(db)
+def get_forum_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[ForumRepository]:
+    return repository_for(db, ForumRepository)
 
 
 @router.get("/forums", response_model=List[Forum])
-def get_all_forums(
-    forum_repository: ForumRepository = Depends(get_forum_repository),
+async def get_all_forums(
+    forum_registry: ForumRegistry = Depends(get_loaded_forum_registry),
 ):
-    return forum_repository.get_all_forums()
+    # Datos de referencia en memoria: no se consulta la base de datos
+    return [
+        Forum(regionId=forum.region_id, regionName=forum.region_name)
+        for forum in forum_registry.all()
+    ]
 
 
 @router.get("/threads/{regionId}", response_model=List[Thread])
-def get_threads_by_region(
+async def get_threads_by_region(
     regionId: str,
-    forum_repository: ForumRepository = Depends(get_forum_repository),
+    response: Response,
+    page_params: PageParams = Depends(),
+    forum_registry: ForumRegistry = Depends(get_loaded_forum_registry),
+    forum_repository: AsyncRepository[ForumRepository] = Depends(get_forum_repository),
 ):
-    if not forum_repository.get_forum_by_region(regionId):
+    if regionId not in forum_registry:
         raise HTTPException(status_code=404, detail="Region not found")
 
-    return forum_repository.get_threads_by_region(regionId)
+    page = await forum_repository.get_threads_by_region(
+        regionId, page_params.limit, page_params.cursor, page_params.sort
+    )
+    set_page_headers(response, page)
+
+    # Convertir los hilos al formato de respuesta
+    return THREAD_LIST.response(
+        [_thread_response(thread) for thread in page.items], response
+    )
 
 
 @router.post("/threads", status_code=201)
-def create_thread(
+async def create_thread(
     thread_data: CreateThread,
-    current_user: User = Depends(get_auth_service().get_current_active_user),
-    forum_repository: ForumRepository = Depends(get_forum_repository),
+    current_user: User = Depends(get_current_active_user),
+    forum_repository: AsyncRepository[ForumRepository] = Depends(get_forum_repository),
 ):
-    thread = forum_repository.create_thread(
+    thread = await forum_repository.create_thread(
         region_id=thread_data.regionId,
         lan=thread_data.lan,
         title=thread_data.title,
@@ -58,19 +81,41 @@ def create_thread(
 
 
 @router.post("/threads/comments", status_code=201)
-def add_thread_comment(
+async def add_thread_comment(
     comment_data: CreateThreadComment,
-    current_user: User = Depends(get_auth_service().get_current_active_user),
-    forum_repository: ForumRepository = Depends(get_forum_repository),
+    current_user: User = Depends(get_current_active_user),
+    forum_repository: AsyncRepository[ForumRepository] = Depends(get_forum_repository),
 ):
     # Verificar que el usuario que hace el comentario es el mismo que está autenticado
     if comment_data.userId != current_user.id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    comment = forum_repository.add_thread_comment(
+    comment = await forum_repository.add_thread_comment(
         comment_data.threadId, comment_data, current_user.id
     )
     if not comment:
         raise HTTPException(status_code=404, detail="Thread not found")
 
     return {"id": str(comment.id)}
+
+
+def _thread_response(thread: db_models.Thread) -> dict:
+    return {
+        "id": thread.id,
+        "regionId": thread.region_id,
+        "lan": thread.lan,
+        "title": thread.title,
+        "description": thread.description,
+        "comments": [
+            {
+                "id": comment.id,
+                "threadId": comment.thread_id,
+                # Se valida desde los atributos del ORM junto con el resto
+                "user": comment.user,
+                "content": comment.content,
+                "creationDate": comment.creation_date,
+            }
+            for comment in thread.comments
+        ],
+        "creationDate": thread.creation_date,
+    }
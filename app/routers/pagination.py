@@ -0,0 +1,32 @@
+from typing import Optional
+
+from fastapi import Query, Response
+
+from app.config.settings import get_settings
+from app.repository.pagination import Page, SortOrder
+
+settings = get_settings()
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """Parámetros comunes de paginación por cursor para los listados."""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+        cursor: Optional[str] = Query(
+            None, description=f"Valor de la cabecera {NEXT_CURSOR_HEADER}"
+        ),
+        sort: SortOrder = SortOrder.NEWEST,
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+
+
+def set_page_headers(response: Response, page: Page) -> None:
+    """Expone el cursor de la página siguiente en la respuesta."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
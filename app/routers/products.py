@@ -1,74 +1,89 @@
-from typing import List, Optional
+from typing import Annotated, Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.connection import get_db
+from app.config.settings import get_settings
+from app.db.connection import get_session
 from app.models import (
     CreateProductBase,
     CreateProductContent,
-    ProductRequestResponse,
+    Language,
+    ProductImportResult,
     ProductResponse,
     User,
 )
+from app.repository.adapters import AsyncRepository, repository_for
 from app.repository.product_repository import ProductRepository
-from app.repository.request_repository import RequestRepository
+from app.routers.pagination import PageParams, set_page_headers
 from app.services.auth_service import get_current_active_user
+from app.services.product_import import import_products
+from app.services.serialization import PRODUCT_LIST
 
 router = APIRouter(tags=["products"])
+settings = get_settings()
 
 
-def get_product_repository(db: Session = Depends(get_db)) -> ProductRepository:
-    return ProductRepository(db)
-
-
-def get_request_repository(db: Session = Depends(get_db)) -> RequestRepository:
-    return RequestRepository(db)
+def get_product_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[ProductRepository]:
+    return repository_for(db, ProductRepository)
 
 
 @router.post("/products", status_code=201)
 async def create_product(
     product_data: CreateProductBase,
     _: User = Depends(get_current_active_user),
-    product_repository: ProductRepository = Depends(get_product_repository),
+    product_repository: AsyncRepository[ProductRepository] = Depends(
+        get_product_repository
+    ),
 ):
-    product = product_repository.create(product_data)
+    product = await product_repository.create(product_data)
     return {"id": str(product.id)}
 
 
+@router.post("/products/import", response_model=ProductImportResult)
+async def import_product_batch(
+    # Cada elemento se valida por separado para informar de sus errores
+    items: Annotated[
+        List[Any],
+        Body(min_length=1, max_length=settings.product_import_max_size),
+    ],
+    atomic: bool = False,
+    _: User = Depends(get_current_active_user),
+    product_repository: AsyncRepository[ProductRepository] = Depends(
+        get_product_repository
+    ),
+):
+    return await import_products(product_repository, items, atomic=atomic)
+
+
 @router.get("/products", response_model=List[ProductResponse])
 async def search_products(
+    response: Response,
     name: Optional[str] = None,
     region: Optional[str] = None,
-    product_repository: ProductRepository = Depends(get_product_repository),
+    lan: Optional[Language] = None,
+    page_params: PageParams = Depends(),
+    product_repository: AsyncRepository[ProductRepository] = Depends(
+        get_product_repository
+    ),
 ):
-    if name and region:
-        # Buscar por nombre y región
-        products_by_name = set(product_repository.search_by_name(name))
-        products_by_region = set(product_repository.search_by_region(region))
-        products = list(products_by_name.intersection(products_by_region))
-    elif name:
-        # Buscar solo por nombre
-        products = product_repository.search_by_name(name)
-    elif region:
-        # Buscar solo por región
-        products = product_repository.search_by_region(region)
-    else:
-        # Devolver todos los productos
-        products = product_repository.get_all()
-
-    # Convertir los productos al formato de respuesta
-    return [
-        {
-            "id": product.id,
-            "image": product.image,
-            "creationDate": product.creation_date,
-            "regions": [region.region_code for region in product.regions],
-            "productLanContents": product.product_lan_contents,
-        }
-        for product in products
-    ]
+    # Buscar por texto (ordenado por relevancia) y/o región
+    page = await product_repository.search(
+        name=name,
+        region=region,
+        lan=lan,
+        limit=page_params.limit,
+        cursor=page_params.cursor,
+        sort=page_params.sort,
+    )
+    set_page_headers(response, page)
+
+    # El repositorio ya devuelve los productos con los campos de la respuesta
+    return PRODUCT_LIST.response(page.items, response)
 
 
 @router.post("/products/{id}/product-content", status_code=201)
@@ -76,9 +91,11 @@ async def add_product_content(
     id: UUID,
     content_data: CreateProductContent,
     _: User = Depends(get_current_active_user),
-    product_repository: ProductRepository = Depends(get_product_repository),
+    product_repository: AsyncRepository[ProductRepository] = Depends(
+        get_product_repository
+    ),
 ):
-    product = product_repository.add_content(id, content_data)
+    product = await product_repository.add_content(id, content_data)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -88,9 +105,11 @@ async def add_product_content(
 @router.get("/products/{id}", response_model=ProductResponse)
 async def get_product_by_id(
     id: UUID,
-    product_repository: ProductRepository = Depends(get_product_repository),
+    product_repository: AsyncRepository[ProductRepository] = Depends(
+        get_product_repository
+    ),
 ):
-    product = product_repository.get_by_id(id)
+    product = await product_repository.get_by_id(id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -103,11 +122,3 @@ async def get_product_by_id(
         "regions": regions,
         "productLanContents": product.product_lan_contents,
     }
-
-
-@router.get("/requests/products", response_model=List[ProductRequestResponse])
-async def get_product_requests(
-    _: User = Depends(get_current_active_user),
-    request_repository: RequestRepository = Depends(get_request_repository),
-):
-    return request_repository.get_product_requests()
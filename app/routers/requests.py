@@ -1,39 +1,51 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.connection import get_db
+from app.db.connection import get_session
 from app.models import (
     BlogRequestResponse,
     CreateBlogRequest,
     CreateBlogRequestComment,
     CreateProductRequest,
+    ExportFormat,
     ProductRequestResponse,
     User,
 )
+from app.repository.adapters import AsyncRepository, repository_for
+from app.repository.pagination import SortOrder
 from app.repository.request_repository import RequestRepository
+from app.routers.pagination import PageParams, set_page_headers
 from app.services.auth_service import get_current_active_user
+from app.services.export_service import export_response
 
 router = APIRouter(prefix="/requests", tags=["requests"])
 
 
-def get_request_repository(db: Session = Depends(get_db)) -> RequestRepository:
-    return RequestRepository(db)
+def get_request_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[RequestRepository]:
+    return repository_for(db, RequestRepository)
 
 
 @router.post("/products", status_code=201, operation_id="submit_product_request")
 async def submit_product_request(
     request_data: CreateProductRequest,
     current_user: User = Depends(get_current_active_user),
-    request_repository: RequestRepository = Depends(get_request_repository),
+    request_repository: AsyncRepository[RequestRepository] = Depends(
+        get_request_repository
+    ),
 ):
     # Verificar que el usuario que hace la solicitud es el mismo que está autenticado
     if request_data.userId != current_user.id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    request = request_repository.create_product_request(request_data, current_user.id)
+    request = await request_repository.create_product_request(
+        request_data, current_user.id
+    )
     return {"id": str(request.id)}
 
 
@@ -43,32 +55,86 @@ async def submit_product_request(
     operation_id="get_product_requests_list",
 )
 async def get_product_requests(
+    response: Response,
+    page_params: PageParams = Depends(),
     _: User = Depends(get_current_active_user),
-    request_repository: RequestRepository = Depends(get_request_repository),
+    request_repository: AsyncRepository[RequestRepository] = Depends(
+        get_request_repository
+    ),
 ):
-    return request_repository.get_product_requests()
+    page = await request_repository.get_product_requests(
+        page_params.limit, page_params.cursor, page_params.sort
+    )
+    set_page_headers(response, page)
+    return [
+        {
+            "id": request.id,
+            "name": request.name,
+            "userId": request.user_id,
+            "image": request.image,
+            "description": request.description,
+            "creationDate": request.creation_date,
+        }
+        for request in page.items
+    ]
+
+
+@router.get("/products/export", operation_id="export_product_requests")
+async def export_product_requests(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    sort: SortOrder = SortOrder.NEWEST,
+    _: User = Depends(get_current_active_user),
+):
+    return export_response(
+        RequestRepository.export_product_requests_select(sort),
+        export_format,
+        "product_requests",
+    )
 
 
 @router.post("/blogs", status_code=201, operation_id="submit_blog_request")
 async def submit_blog_request(
     request_data: CreateBlogRequest,
     current_user: User = Depends(get_current_active_user),
-    request_repository: RequestRepository = Depends(get_request_repository),
+    request_repository: AsyncRepository[RequestRepository] = Depends(
+        get_request_repository
+    ),
 ):
     # Verificar que el usuario que hace la solicitud es el mismo que está autenticado
     if request_data.userId != current_user.id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    request = request_repository.create_blog_request(request_data, current_user.id)
+    request = await request_repository.create_blog_request(
+        request_data, current_user.id
+    )
     return {"id": str(request.id)}
 
 
 @router.get("/blogs", response_model=List[BlogRequestResponse])
 async def get_blog_requests(
+    response: Response,
+    page_params: PageParams = Depends(),
     _: User = Depends(get_current_active_user),
-    request_repository: RequestRepository = Depends(get_request_repository),
+    request_repository: AsyncRepository[RequestRepository] = Depends(
+        get_request_repository
+    ),
 ):
-    return request_repository.get_blog_requests()
+    page = await request_repository.get_blog_requests(
+        page_params.limit, page_params.cursor, page_params.sort
+    )
+    set_page_headers(response, page)
+    return [
+        {
+            "id": request.id,
+            "userId": request.user_id,
+            "title": request.title,
+            "description": request.description,
+            "productId": request.product_id,
+            "image": request.image,
+            "creationDate": request.creation_date,
+        }
+        for request in page.items
+    ]
 
 
 @router.post(
@@ -78,14 +144,16 @@ async def add_comment_to_blog_request(
     id: UUID,
     comment_data: CreateBlogRequestComment,
     current_user: User = Depends(get_current_active_user),
-    request_repository: RequestRepository = Depends(get_request_repository),
+    request_repository: AsyncRepository[RequestRepository] = Depends(
+        get_request_repository
+    ),
 ):
     # Verificar que el usuario que hace el comentario es el mismo que está autenticado
     if comment_data.userId != current_user.id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     # Verificar que la solicitud de blog existe
-    if not request_repository.get_blog_request_by_id(id):
+    if not await request_repository.get_blog_request_by_id(id):
         raise HTTPException(status_code=404, detail="Blog request not found")
 
     # TODO: Implementar sistema de comentarios para solicitudes de blog
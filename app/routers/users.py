@@ -1,11 +1,17 @@
-from typing import List
+from datetime import datetime
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.connection import get_db
+from app.config.settings import get_settings
+from app.db.connection import get_session
+from app.db.schemas.models import as_utc_naive
 from app.models import (
+    CreateResourceAccess,
+    ExportFormat,
     LoginResponse,
     ResourceAccess,
     Role,
@@ -13,35 +19,46 @@ from app.models import (
     UserLogin,
     UserRegister,
 )
+from app.repository.adapters import AsyncRepository, repository_for
+from app.repository.pagination import SortOrder
 from app.repository.resource_repository import ResourceRepository
 from app.repository.user_repository import UserRepository
+from app.routers.pagination import PageParams, set_page_headers
 from app.services.auth_service import (
     AuthService,
     get_auth_service,
     get_current_active_user,
     get_current_user,
 )
+from app.services.export_service import export_response
+from app.services.password_service import PasswordService
+from app.services.serialization import ACCESS_LIST, USER_LIST
 
 router = APIRouter(prefix="/users", tags=["users"])
+settings = get_settings()
 
 
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
-    return UserRepository(db)
+def get_user_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[UserRepository]:
+    return repository_for(db, UserRepository)
 
 
-def get_resource_repository(db: Session = Depends(get_db)) -> ResourceRepository:
-    return ResourceRepository(db)
+def get_resource_repository(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AsyncRepository[ResourceRepository]:
+    return repository_for(db, ResourceRepository)
 
 
 @router.post("/auth/register", status_code=201)
-def register_user(
+async def register_user(
     user_data: UserRegister,
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: AsyncRepository[UserRepository] = Depends(get_user_repository),
 ):
     # Verificar si el correo electrónico o el nombre de usuario ya existen
-    if user_repository.get_by_email(user_data.email):
+    if await user_repository.get_by_email(user_data.email):
         raise HTTPException(status_code=400, detail="Email already exists")
-    if user_repository.get_by_nickname(user_data.nick_name):
+    if await user_repository.get_by_nickname(user_data.nick_name):
         raise HTTPException(status_code=400, detail="Nickname already exists")
 
     # Verificar permisos para roles de empleado
@@ -50,18 +67,19 @@ def register_user(
             status_code=401, detail="Unauthorized to create EMPLOYEE role"
         )
 
-    # Crear nuevo usuario
-    user_repository.create(user_data)
+    # Crear nuevo usuario (bcrypt se ejecuta en su propio pool)
+    hashed_password = await PasswordService.aget_password_hash(user_data.password)
+    await user_repository.create(user_data, hashed_password=hashed_password)
 
     return {"message": "User created successfully"}
 
 
 @router.post("/auth/login", response_model=LoginResponse)
-def login_user(
+async def login_user(
     login_data: UserLogin,
     auth_service: AuthService = Depends(get_auth_service),
 ):
-    user = auth_service.authenticate_user(login_data.email, login_data.password)
+    user = await auth_service.authenticate_user(login_data.email, login_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -75,30 +93,30 @@ def login_user(
 
 
 @router.put("/{id}/block", status_code=201)
-def block_user(
+async def block_user(
     id: UUID,
     _: User = Depends(get_current_active_user),
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: AsyncRepository[UserRepository] = Depends(get_user_repository),
 ):
-    user = user_repository.get_by_id(id)
+    user = await user_repository.get_by_id(id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_repository.block_user(id)
+    await user_repository.block_user(id)
     return {"message": "User blocked"}
 
 
 @router.put("/{id}/unblock", status_code=201)
-def unblock_user(
+async def unblock_user(
     id: UUID,
     _: User = Depends(get_current_active_user),
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: AsyncRepository[UserRepository] = Depends(get_user_repository),
 ):
-    user = user_repository.get_by_id(id)
+    user = await user_repository.get_by_id(id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_repository.unblock_user(id)
+    await user_repository.unblock_user(id)
     return {"message": "User unblocked"}
 
 
@@ -109,32 +127,87 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 @router.get("/", response_model=List[User])
 async def get_users(
+    response: Response,
+    page_params: PageParams = Depends(),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    user_repository: AsyncRepository[UserRepository] = Depends(get_user_repository),
 ):
     if current_user.role != Role.EMPLOYEE:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    users = UserRepository(db).get_all()
-    return [
-        User(
-            id=user.id,
-            email=user.email,
-            nick_name=user.nick_name,
-            role=user.role,
-            image=user.image,
-            is_blocked=user.is_blocked,
-            creation_date=user.creation_date,
+    page = await user_repository.get_all(
+        page_params.limit, page_params.cursor, page_params.sort
+    )
+    set_page_headers(response, page)
+    # Las filas ya tienen las columnas (y nombres) del modelo de respuesta
+    return USER_LIST.response(page.items, response)
+
+
+@router.get("/export")
+async def export_users(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    sort: SortOrder = SortOrder.NEWEST,
+    current_user: User = Depends(get_current_active_user),
+):
+    if current_user.role != Role.EMPLOYEE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
         )
-        for user in users
-    ]
+    return export_response(UserRepository.export_select(sort), export_format, "users")
 
 
 @router.get("/accesses", response_model=List[ResourceAccess])
 async def get_resource_accesses(
+    response: Response,
+    page_params: PageParams = Depends(),
+    start: Optional[datetime] = Query(None, description="Desde (incluido)"),
+    end: Optional[datetime] = Query(None, description="Hasta (excluido)"),
+    _: User = Depends(get_current_active_user),
+    resource_repository: AsyncRepository[ResourceRepository] = Depends(
+        get_resource_repository
+    ),
+):
+    page = await resource_repository.get_all(
+        page_params.limit,
+        page_params.cursor,
+        page_params.sort,
+        start=as_utc_naive(start) if start else None,
+        end=as_utc_naive(end) if end else None,
+    )
+    set_page_headers(response, page)
+    return ACCESS_LIST.response(page.items, response)
+
+
+@router.post("/accesses/batch", status_code=201)
+async def create_resource_accesses(
+    accesses: Annotated[
+        List[CreateResourceAccess],
+        Body(min_length=1, max_length=settings.access_batch_max_size),
+    ],
+    _: User = Depends(get_current_active_user),
+    resource_repository: AsyncRepository[ResourceRepository] = Depends(
+        get_resource_repository
+    ),
+):
+    # Todo el lote se inserta en una sola transacción: o entran todos o ninguno
+    inserted = await resource_repository.create_many(accesses)
+    return {"inserted": inserted}
+
+
+@router.get("/accesses/export")
+async def export_resource_accesses(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    sort: SortOrder = SortOrder.NEWEST,
+    start: Optional[datetime] = Query(None, description="Desde (incluido)"),
+    end: Optional[datetime] = Query(None, description="Hasta (excluido)"),
     _: User = Depends(get_current_active_user),
-    resource_repository: ResourceRepository = Depends(get_resource_repository),
 ):
-    return resource_repository.get_all()
+    statement = ResourceRepository.export_select(
+        sort,
+        start=as_utc_naive(start) if start else None,
+        end=as_utc_naive(end) if end else None,
+    )
+    return export_response(statement, export_format, "resource_accesses")
@@ -4,30 +4,41 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config.settings import get_settings
-from app.db.connection import get_db
+from app.db.connection import get_session
 from app.db.schemas.auth import TokenData
 from app.models import User as UserModel
+from app.repository.adapters import repository_for
 from app.repository.user_repository import UserRepository
 from app.services.password_service import PasswordService
+from app.services.principal_cache import get_principal_cache
 
 settings = get_settings()
 security = HTTPBearer(auto_error=False)
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
-        self.user_repository = UserRepository(db)
+        self.user_repository = repository_for(db, UserRepository)
 
-    def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
-        user = self.user_repository.get_by_email(email)
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
+        user = await self.user_repository.get_by_email(email)
         if not user or not user.hashed_password:
             return None
-        if not PasswordService.verify_password(password, user.hashed_password):
+        # bcrypt es costoso: se ejecuta en su propio pool, fuera del bucle de eventos
+        if not await PasswordService.averify_password(password, user.hashed_password):
             return None
+
+        # Regenerar de forma transparente los hashes con un coste desactualizado
+        if PasswordService.needs_rehash(user.hashed_password):
+            hashed_password = await PasswordService.aget_password_hash(password)
+            await self.user_repository.update(
+                user.id, {"hashed_password": hashed_password}
+            )
         return UserModel(
             id=user.id,
             email=user.email,
@@ -70,10 +81,18 @@ class AuthService:
             token_data = TokenData(email=email)
             if not token_data.email:
                 raise credentials_exception
-            user = self.user_repository.get_by_email(token_data.email)
+
+            # Evitar la consulta a la tabla users en las peticiones repetidas
+            principal_cache = get_principal_cache()
+            principal = principal_cache.get(token_data.email)
+            if principal is not None:
+                return principal
+
+            generation = principal_cache.generation
+            user = await self.user_repository.get_by_email(token_data.email)
             if user is None:
                 raise credentials_exception
-            return UserModel(
+            principal = UserModel(
                 id=user.id,
                 email=user.email,
                 nick_name=user.nick_name,
@@ -82,6 +101,8 @@ class AuthService:
                 is_blocked=user.is_blocked,
                 creation_date=datetime.now(),
             )
+            principal_cache.set(token_data.email, principal, generation)
+            return principal
         except JWTError:
             raise credentials_exception
 
@@ -93,7 +114,9 @@ class AuthService:
         return current_user
 
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+def get_auth_service(
+    db: Session | AsyncSession = Depends(get_session),
+) -> AuthService:
     return AuthService(db)
 
 
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Iterator, Sequence
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.engine import Row
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.config.settings import get_settings
+from app.db.connection import AsyncSessionLocal, SessionLocal
+from app.models import ExportFormat
+
+settings = get_settings()
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def export_response(
+    statement: Select, export_format: ExportFormat, filename: str
+) -> StreamingResponse:
+    """
+    Respuesta que envía el resultado de una consulta a medida que se lee.
+
+    Las filas se leen con un cursor de servidor (`yield_per`) en bloques de
+    `export_chunk_size` y cada bloque se codifica y se envía antes de leer el
+    siguiente, así que la memoria no depende del número de filas. La consulta
+    usa su propia sesión: la de la petición se cierra antes de empezar a enviar
+    el cuerpo.
+
+    Args:
+        statement (Select): Consulta de columnas; las etiquetas de las columnas
+            son los nombres de los campos exportados
+        export_format (ExportFormat): NDJSON (un objeto JSON por línea) o CSV
+        filename (str): Nombre del fichero descargado, sin extensión
+
+    Returns:
+        StreamingResponse: Respuesta en streaming
+    """
+    fields = [column.name for column in statement.selected_columns]
+    chunks = _row_chunks(statement)
+    if export_format == ExportFormat.CSV:
+        body = _encode_csv(chunks, fields)
+    else:
+        body = _encode_ndjson(chunks)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{export_format.value}"'
+            )
+        },
+    )
+
+
+async def _row_chunks(statement: Select) -> AsyncIterator[Sequence[Row]]:
+    statement = statement.execution_options(yield_per=settings.export_chunk_size)
+    if settings.db_mode == "async":
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(statement)
+            async for chunk in result.partitions():
+                yield chunk
+        return
+
+    rows = _sync_row_chunks(statement)
+    try:
+        async for chunk in iterate_in_threadpool(rows):
+            yield chunk
+    finally:
+        # Si el cliente corta la descarga, cerrar el cursor y la sesión
+        await run_in_threadpool(rows.close)
+
+
+def _sync_row_chunks(statement: Select) -> Iterator[Sequence[Row]]:
+    db = SessionLocal()
+    try:
+        yield from db.execute(statement).partitions()
+    finally:
+        db.close()
+
+
+async def _encode_ndjson(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    async for chunk in chunks:
+        yield "".join(
+            json.dumps(dict(row._mapping), default=_json_default) + "\n"
+            for row in chunk
+        )
+
+
+async def _encode_csv(
+    chunks: AsyncIterator[Sequence[Row]], fields: Sequence[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for chunk in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Solo la cabecera si no hay filas
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Tipo no exportable: {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,107 @@
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.connection import create_new_db_session
+from app.db.schemas.models import Forum
+from app.services.response_cache import TAG_FORUMS, get_response_cache
+
+
+@dataclass(frozen=True)
+class ForumRegion:
+    region_id: str
+    region_name: str
+
+
+class ForumRegistry:
+    """
+    Registro inmutable en memoria de los foros por región.
+
+    Las regiones son datos de referencia estáticos: se cargan una vez al arrancar
+    y cada recarga sustituye el registro completo, de modo que los lectores nunca
+    ven un estado a medias y no necesitan bloqueo.
+    """
+
+    def __init__(self):
+        self._regions: Optional[Mapping[str, ForumRegion]] = None
+        self._forums: Tuple[ForumRegion, ...] = ()
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._regions is not None
+
+    def load(self, db: Session) -> None:
+        """
+        Carga (o recarga) las regiones desde la base de datos.
+
+        Args:
+            db (Session): Sesión síncrona con la que leer la tabla forums
+        """
+        with self._load_lock:
+            rows = db.query(Forum.region_id, Forum.region_name).order_by(
+                Forum.region_id
+            )
+            forums = tuple(ForumRegion(row.region_id, row.region_name) for row in rows)
+            regions = MappingProxyType({forum.region_id: forum for forum in forums})
+            # Publicar primero la tupla: quien vea el nuevo mapa ya tiene la lista
+            self._forums = forums
+            self._regions = regions
+
+    def all(self) -> Tuple[ForumRegion, ...]:
+        return self._forums
+
+    def get(self, region_id: str) -> Optional[ForumRegion]:
+        regions = self._regions
+        return regions.get(region_id) if regions is not None else None
+
+    def __contains__(self, region_id: object) -> bool:
+        regions = self._regions
+        return regions is not None and region_id in regions
+
+
+@lru_cache
+def get_forum_registry() -> ForumRegistry:
+    """
+    Obtiene el registro de foros compartido por la aplicación.
+
+    Returns:
+        ForumRegistry: Registro de regiones (puede no estar cargado todavía)
+    """
+    return ForumRegistry()
+
+
+async def refresh_forum_registry() -> ForumRegistry:
+    """
+    Recarga el registro de foros desde la base de datos.
+
+    Se ejecuta al arrancar y sirve de hook explícito cuando cambian los foros.
+
+    Returns:
+        ForumRegistry: Registro recargado
+    """
+    registry = get_forum_registry()
+
+    def load() -> None:
+        db = create_new_db_session()
+        try:
+            registry.load(db)
+        finally:
+            db.close()
+
+    await run_in_threadpool(load)
+    get_response_cache().invalidate(TAG_FORUMS)
+    return registry
+
+
+async def get_loaded_forum_registry() -> ForumRegistry:
+    """Dependency que devuelve el registro, cargándolo si el arranque no pudo."""
+    registry = get_forum_registry()
+    if not registry.loaded:
+        await refresh_forum_registry()
+    return registry
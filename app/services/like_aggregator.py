@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Dict
+from uuid import UUID
+
+from app.services.write_behind import WriteBehindCounter
+
+LikeDeltas = Dict[UUID, int]
+
+
+class LikeAggregator(WriteBehindCounter[UUID]):
+    def __init__(self):
+        """
+        Acumula en memoria los likes de los comentarios y los escribe por lotes.
+
+        Un comentario viral deja de provocar una actualización (y un bloqueo de
+        fila) por like: cada intervalo se aplica un único UPDATE con la suma de
+        likes de todos los comentarios afectados.
+        """
+        super().__init__("los likes acumulados")
+
+
+@lru_cache
+def get_like_aggregator() -> LikeAggregator:
+    """
+    Obtiene el acumulador de likes compartido por la aplicación.
+
+    Returns:
+        LikeAggregator: Acumulador (inactivo hasta llamar a start)
+    """
+    return LikeAggregator()
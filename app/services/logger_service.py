@@ -1,7 +1,15 @@
+import asyncio
 import json
 import os
+import threading
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Políticas cuando la cola del escritor en segundo plano está llena
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
 
 
 class LoggerService:
@@ -15,6 +23,64 @@ class LoggerService:
         self.base_dir = base_dir
         os.makedirs(base_dir, exist_ok=True)
 
+        # Estado del modo con cola (inactivo hasta llamar a start)
+        self._queue: Optional[asyncio.Queue[Tuple[str, Dict[str, Any]]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.Task[None]] = None
+        self._batch_size = 500
+        self._flush_interval = 1.0
+        self._overflow = OVERFLOW_DROP
+        self._file_lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def buffered(self) -> bool:
+        """Indica si las entradas se están encolando para el escritor en segundo plano."""
+        return self._writer is not None and not self._writer.done()
+
+    async def start(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = OVERFLOW_DROP,
+    ) -> None:
+        """
+        Activa el modo con cola: las entradas se acumulan en memoria y una tarea
+        en segundo plano las escribe por lotes.
+
+        Args:
+            max_queue_size (int): Número máximo de entradas pendientes
+            batch_size (int): Entradas que provocan una escritura inmediata
+            flush_interval (float): Segundos máximos que una entrada espera en cola
+            overflow (str): "drop" descarta entradas con la cola llena,
+                "block" hace esperar a los llamadores asíncronos
+        """
+        if self.buffered:
+            return
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Política de desbordamiento no válida: {overflow}")
+
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow = overflow
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=max_queue_size)
+        self._writer = asyncio.create_task(self._run_writer())
+
+    async def stop(self) -> None:
+        """Detiene el escritor en segundo plano escribiendo antes todas las entradas pendientes."""
+        if self._writer is None:
+            return
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        self._queue = None
+        self._loop = None
+
     def log(self, entry: Dict[str, Any], filename: str) -> None:
         """
         Registra una entrada en el archivo de log especificado.
@@ -27,12 +93,33 @@ class LoggerService:
         if "timestamp" not in entry:
             entry["timestamp"] = datetime.now().isoformat()
 
-        # Construir la ruta completa del archivo
-        filepath = os.path.join(self.base_dir, f"{filename}.txt")
+        if not self.buffered:
+            self._write_batch([(filename, entry)])
+            return
 
-        # Escribir en el archivo
-        with open(filepath, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        self._submit((filename, entry))
+
+    async def alog(self, entry: Dict[str, Any], filename: str) -> None:
+        """
+        Variante asíncrona de log que aplica la política "block" esperando a que
+        haya hueco en la cola.
+
+        Args:
+            entry (Dict[str, Any]): Diccionario con la información a registrar
+            filename (str): Nombre del archivo de log (sin extensión)
+        """
+        if "timestamp" not in entry:
+            entry["timestamp"] = datetime.now().isoformat()
+
+        if not self.buffered:
+            self._write_batch([(filename, entry)])
+            return
+
+        assert self._queue is not None
+        if self._overflow == OVERFLOW_BLOCK:
+            await self._queue.put((filename, entry))
+        else:
+            self._enqueue_nowait((filename, entry))
 
     def log_access(
         self, path: str, method: str, device_type: str, user_agent: str
@@ -46,11 +133,116 @@ class LoggerService:
             device_type (str): Tipo de dispositivo
             user_agent (str): User-Agent del cliente
         """
-        entry = {
+        self.log(self._access_entry(path, method, device_type, user_agent), "access")
+
+    async def alog_access(
+        self, path: str, method: str, device_type: str, user_agent: str
+    ) -> None:
+        """
+        Variante asíncrona de log_access pensada para el middleware de la API.
+
+        Args:
+            path (str): Ruta accedida
+            method (str): Método HTTP
+            device_type (str): Tipo de dispositivo
+            user_agent (str): User-Agent del cliente
+        """
+        await self.alog(
+            self._access_entry(path, method, device_type, user_agent), "access"
+        )
+
+    @staticmethod
+    def _access_entry(
+        path: str, method: str, device_type: str, user_agent: str
+    ) -> Dict[str, Any]:
+        return {
             "timestamp": datetime.now().isoformat(),
             "path": path,
             "method": method,
             "device_type": device_type,
             "user_agent": user_agent,
         }
-        self.log(entry, "access")
+
+    def _submit(self, item: Tuple[str, Dict[str, Any]]) -> None:
+        # asyncio.Queue no es thread-safe: desde el threadpool se delega al bucle.
+        # Copia local: stop() puede dejar _loop a None desde el bucle mientras
+        # un hilo registra una entrada
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._write_batch([item])
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            self._enqueue_nowait(item)
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue_nowait, item)
+        except RuntimeError:
+            # El bucle se ha cerrado entre la comprobación y la llamada
+            self._write_batch([item])
+
+    def _enqueue_nowait(self, item: Tuple[str, Dict[str, Any]]) -> None:
+        if self._queue is None:
+            self._write_batch([item])
+            return
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run_writer(self) -> None:
+        assert self._queue is not None and self._loop is not None
+        queue = self._queue
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                deadline = self._loop.time() + self._flush_interval
+                # Agrupar hasta llenar el lote o agotar el intervalo
+                while len(batch) < self._batch_size:
+                    timeout = deadline - self._loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except TimeoutError:
+                        break
+
+                pending, batch = batch, []
+                await asyncio.to_thread(self._write_batch, pending)
+        except asyncio.CancelledError:
+            # Vaciar lo pendiente antes de terminar
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            self._write_batch(batch)
+            raise
+
+    def _write_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        if not items:
+            return
+
+        lines: Dict[str, List[str]] = defaultdict(list)
+        for filename, entry in items:
+            lines[filename].append(json.dumps(entry, default=str) + "\n")
+
+        # Una única escritura por archivo y lote
+        with self._file_lock:
+            for filename, file_lines in lines.items():
+                filepath = os.path.join(self.base_dir, f"{filename}.txt")
+                with open(filepath, "a") as f:
+                    f.write("".join(file_lines))
+
+
+@lru_cache
+def get_logger_service() -> LoggerService:
+    """
+    Obtiene la instancia compartida del servicio de logs.
+
+    Returns:
+        LoggerService: Servicio de logs compartido por toda la aplicación
+    """
+    return LoggerService()
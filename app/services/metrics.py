@@ -0,0 +1,280 @@
+import bisect
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.principal_cache import get_principal_cache
+from app.services.response_cache import get_response_cache
+
+METRICS_PATH = "/metrics"
+
+# Etiqueta de las peticiones que no corresponden a ninguna ruta (404)
+UNMATCHED_ROUTE = "unmatched"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Claves de `stats()` de las cachés que son contadores (el resto son medidas)
+_CACHE_COUNTERS = {"hits", "misses", "stale_hits"}
+
+
+@dataclass
+class QueryStats:
+    """Sentencias SQL ejecutadas y tiempo en la base de datos de una petición."""
+
+    statements: int = 0
+    db_time: float = 0.0
+    scope: Optional[Scope] = field(default=None, repr=False)
+
+    @property
+    def route(self) -> Optional[str]:
+        """Método y plantilla de la ruta de la petición."""
+        if self.scope is None:
+            return None
+        return f"{self.scope['method']} {route_template(self.scope)}"
+
+    def server_timing(self, total: float) -> str:
+        db_ms = self.db_time * 1000
+        app_ms = max(total * 1000 - db_ms, 0.0)
+        return (
+            f'db;dur={db_ms:.1f};desc="{self.statements} statements", '
+            f"app;dur={app_ms:.1f}, total;dur={total * 1000:.1f}"
+        )
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Estadísticas de la petición en curso (None fuera de una petición)."""
+    return _request_stats.get()
+
+
+def record_statement(duration: float) -> None:
+    """
+    Suma una sentencia a la petición en curso.
+
+    Se llama desde los eventos del engine. El contexto se propaga al threadpool
+    y a los greenlets de asyncpg, así que funciona en ambos modos de `db_mode`.
+
+    Args:
+        duration (float): Segundos entre el envío de la sentencia y su respuesta
+    """
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += duration
+
+
+class Histogram:
+    """Histograma acumulado por etiquetas con el formato de Prometheus."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float],
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            counts, total = self._series.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            # Cada observación cuenta en el primer bucket que la contiene;
+            # los acumulados se calculan al exportar
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in sorted(self._series.items())
+            ]
+        for labels, counts, total in series:
+            label_text = _labels(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield (
+                    f'{self.name}_bucket{{{label_text},le="{bound:g}"}} {cumulative}'
+                )
+            cumulative += counts[-1]
+            yield f'{self.name}_bucket{{{label_text},le="+Inf"}} {cumulative}'
+            yield f"{self.name}_sum{{{label_text}}} {total!r}"
+            yield f"{self.name}_count{{{label_text}}} {cumulative}"
+
+
+class Metrics:
+    """Métricas de las peticiones HTTP del proceso."""
+
+    def __init__(self):
+        labels = ("method", "route")
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Duración de las peticiones HTTP.",
+            labels,
+            DURATION_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Tiempo de cada petición esperando a la base de datos.",
+            labels,
+            DURATION_BUCKETS,
+        )
+        self.db_statements = Histogram(
+            "http_request_db_statements",
+            "Sentencias SQL ejecutadas por petición.",
+            labels,
+            STATEMENT_BUCKETS,
+        )
+        self._responses: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        stats: QueryStats,
+    ) -> None:
+        labels = (method, route)
+        self.request_duration.observe(labels, duration)
+        self.db_duration.observe(labels, stats.db_time)
+        self.db_statements.observe(labels, stats.statements)
+        with self._lock:
+            key = (method, route, str(status))
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Todas las métricas en el formato de texto de Prometheus."""
+        lines: List[str] = [
+            "# HELP http_responses_total Respuestas HTTP por ruta y código.",
+            "# TYPE http_responses_total counter",
+        ]
+        with self._lock:
+            responses = sorted(self._responses.items())
+        for (method, route, status), count in responses:
+            label_text = _labels(
+                (("method", method), ("route", route), ("status", status))
+            )
+            lines.append(f"http_responses_total{{{label_text}}} {count}")
+
+        for histogram in (self.request_duration, self.db_duration, self.db_statements):
+            lines.extend(histogram.render())
+
+        for prefix, stats in (
+            ("principal_cache", get_principal_cache().stats()),
+            ("response_cache", get_response_cache().stats()),
+        ):
+            for key, value in stats.items():
+                if key in _CACHE_COUNTERS:
+                    name, kind = f"{prefix}_{key}_total", "counter"
+                else:
+                    name, kind = f"{prefix}_{key}", "gauge"
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición.
+
+    Añade la cabecera `Server-Timing` (tiempo en la base de datos, en Python y
+    total hasta enviar las cabeceras) y registra la duración, el tiempo en la
+    base de datos y el número de sentencias por plantilla de ruta
+    (`/api/v1/products/{id}`), no por URL, para acotar las series.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope=scope)
+        token = _request_stats.set(stats)
+        start = perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing(perf_counter() - start)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            self.metrics.observe_request(
+                scope["method"],
+                route_template(scope),
+                status,
+                perf_counter() - start,
+                stats,
+            )
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Plantilla de la ruta de la petición.
+
+    FastAPI la deja en el scope al enrutar; las respuestas servidas por la caché
+    no llegan al router, así que en ese caso se busca la ruta que corresponde.
+    """
+    route = scope.get("route")
+    if route is None:
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+@lru_cache
+def get_metrics() -> Metrics:
+    """
+    Obtiene las métricas compartidas por la aplicación.
+
+    Returns:
+        Metrics: Instancia única
+    """
+    return Metrics()
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,6 +1,45 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds
+)
+
+# Pool de procesos propio y acotado para bcrypt. El backend de passlib (crypt del
+# sistema) no libera el GIL, así que un hilo calculando un hash congelaría el
+# bucle de eventos y el resto de peticiones durante toda la operación.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """
+    Detiene el pool de bcrypt (se llama al apagar la aplicación).
+
+    Espera a que terminen los procesos, así que desde código asíncrono hay que
+    llamarla en un hilo (`run_in_threadpool`).
+    """
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True, cancel_futures=True)
+        _hash_executor = None
 
 
 class PasswordService:
@@ -11,3 +50,27 @@ class PasswordService:
     @staticmethod
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Indica si el hash se generó con un coste distinto de `bcrypt_rounds`."""
+        return pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    async def averify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verifica la contraseña en el pool de bcrypt sin bloquear el bucle."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_hash_executor(),
+            PasswordService.verify_password,
+            plain_password,
+            hashed_password,
+        )
+
+    @staticmethod
+    async def aget_password_hash(password: str) -> str:
+        """Calcula el hash en el pool de bcrypt sin bloquear el bucle."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_hash_executor(), PasswordService.get_password_hash, password
+        )
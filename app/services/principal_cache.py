@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from app.config.settings import get_settings
+from app.models import User as UserModel
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0):
+        """
+        Caché LRU con caducidad de los usuarios autenticados, indexada por email.
+
+        Las escrituras sobre un usuario la invalidan en este proceso; el TTL acota
+        cuánto tarda en verse un cambio hecho desde otro worker.
+
+        Args:
+            max_size (int): Número máximo de usuarios en caché (0 la desactiva)
+            ttl (float): Segundos que una entrada se considera válida
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, UserModel]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    @property
+    def generation(self) -> int:
+        """Contador de invalidaciones; se toma antes de consultar la base de datos."""
+        return self._generation
+
+    def get(self, email: str) -> Optional[UserModel]:
+        """
+        Devuelve el usuario en caché si no ha caducado.
+
+        Args:
+            email (str): Email del usuario (claim "sub" del token)
+
+        Returns:
+            Optional[UserModel]: Usuario en caché o None si hay que ir a la base de datos
+        """
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, email: str, principal: UserModel, generation: int) -> None:
+        """
+        Guarda un usuario leído de la base de datos.
+
+        Si ha habido alguna invalidación desde que se tomó `generation`, el valor
+        puede estar desfasado y no se guarda.
+
+        Args:
+            email (str): Email del usuario
+            principal (UserModel): Usuario resuelto
+            generation (int): Valor de `generation` antes de la consulta
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[email] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *emails: str) -> None:
+        """Elimina los usuarios indicados tras modificarlos o borrarlos."""
+        with self._lock:
+            self._generation += 1
+            for email in emails:
+                self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos y fallos y tamaño actual de la caché."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+@lru_cache
+def get_principal_cache() -> PrincipalCache:
+    """
+    Obtiene la caché de usuarios autenticados compartida por la aplicación.
+
+    Returns:
+        PrincipalCache: Caché configurada con `principal_cache_size` y `principal_cache_ttl`
+    """
+    settings = get_settings()
+    return PrincipalCache(
+        max_size=settings.principal_cache_size, ttl=settings.principal_cache_ttl
+    )
@@ -0,0 +1,110 @@
+from typing import Any, List, Sequence, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.models import (
+    ImportedProduct,
+    ImportProduct,
+    ImportProductError,
+    ProductImportResult,
+)
+from app.repository.adapters import AsyncRepository
+from app.repository.product_repository import ProductRepository
+
+# Longitud de product_regions.region_code
+REGION_CODE_MAX_LENGTH = 10
+
+_import_product = TypeAdapter(ImportProduct)
+
+
+def validate_products(
+    items: Sequence[Any],
+) -> Tuple[List[Tuple[int, ImportProduct]], List[ImportProductError]]:
+    """
+    Valida cada elemento de una importación por separado.
+
+    Además del esquema se comprueban las restricciones de la base de datos que
+    harían fallar el lote entero: longitud de los códigos de región y regiones
+    o idiomas repetidos dentro del mismo producto.
+
+    Args:
+        items (Sequence[Any]): Elementos sin validar (objetos JSON)
+
+    Returns:
+        Tuple[List[Tuple[int, ImportProduct]], List[ImportProductError]]:
+            Productos válidos con su posición y errores por posición
+    """
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            product = _import_product.validate_python(item)
+        except ValidationError as exc:
+            errors.append(
+                ImportProductError(
+                    index=index,
+                    errors=[
+                        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: "
+                        f"{error['msg']}"
+                        for error in exc.errors()
+                    ],
+                )
+            )
+            continue
+
+        item_errors = _check_constraints(product)
+        if item_errors:
+            errors.append(ImportProductError(index=index, errors=item_errors))
+        else:
+            valid.append((index, product))
+    return valid, errors
+
+
+async def import_products(
+    repository: AsyncRepository[ProductRepository],
+    items: Sequence[Any],
+    atomic: bool = False,
+) -> ProductImportResult:
+    """
+    Importa un lote de productos informando de los errores de cada elemento.
+
+    Los elementos válidos se insertan juntos en una sola transacción; los
+    inválidos se devuelven con sus errores. Con `atomic` basta un elemento
+    inválido para que no se inserte ninguno.
+
+    Args:
+        repository (AsyncRepository[ProductRepository]): Repositorio de productos
+        items (Sequence[Any]): Elementos sin validar (objetos JSON)
+        atomic (bool): Todo o nada
+
+    Returns:
+        ProductImportResult: Productos creados y errores, por posición en el lote
+    """
+    valid, errors = validate_products(items)
+    if errors and atomic:
+        return ProductImportResult(imported=[], errors=errors)
+
+    product_ids = await repository.import_products([product for _, product in valid])
+    return ProductImportResult(
+        imported=[
+            ImportedProduct(index=index, id=product_id)
+            for (index, _), product_id in zip(valid, product_ids)
+        ],
+        errors=errors,
+    )
+
+
+def _check_constraints(product: ImportProduct) -> List[str]:
+    errors = []
+    for region_code in product.regions:
+        if not region_code or len(region_code) > REGION_CODE_MAX_LENGTH:
+            errors.append(
+                f"regions: invalid region code {region_code!r} "
+                f"(1-{REGION_CODE_MAX_LENGTH} characters)"
+            )
+    if len(set(product.regions)) != len(product.regions):
+        errors.append("regions: duplicated region code")
+    languages = [content.lan for content in product.contents]
+    if len(set(languages)) != len(languages):
+        errors.append("contents: duplicated language")
+    return errors
@@ -0,0 +1,368 @@
+import asyncio
+import hashlib
+import re
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence, Set, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import get_settings
+from app.services.logger_service import get_logger_service
+
+# Etiquetas de invalidación de cada familia de recursos
+TAG_PRODUCTS = "products"
+TAG_BLOGS = "blogs"
+TAG_FORUMS = "forums"
+
+# Rutas cacheables y la etiqueta que las invalida
+CACHEABLE_ROUTES: Sequence[Tuple[str, str]] = (
+    (r"^/api/v1/products(/[^/]+)?$", TAG_PRODUCTS),
+    (r"^/api/v1/blogs(/[^/]+(/comments)?)?$", TAG_BLOGS),
+    (r"^/api/v1/forums$", TAG_FORUMS),
+)
+
+Headers = List[Tuple[bytes, bytes]]
+
+# Cabeceras que no se guardan: dependen de la petición o las pone el middleware
+_EXCLUDED_HEADERS = {b"content-length", b"etag", b"cache-control", b"x-cache"}
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: Headers
+    body: bytes
+    etag: str
+    tag: str
+    stored_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: float, stale_ttl: float):
+        """
+        Almacén LRU de respuestas limitado por tamaño en bytes.
+
+        Args:
+            max_bytes (int): Tamaño máximo total de las respuestas guardadas
+            ttl (float): Segundos durante los que una respuesta es fresca
+            stale_ttl (float): Segundos adicionales durante los que se sirve la
+                respuesta caducada mientras se regenera en segundo plano
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def generation(self, tag: str) -> int:
+        """Contador de invalidaciones de la etiqueta; se toma antes de generar la respuesta."""
+        with self._lock:
+            return self._generations.get(tag, 0)
+
+    def get(self, key: str) -> Tuple[Optional[CachedResponse], bool]:
+        """
+        Busca una respuesta guardada.
+
+        Returns:
+            Tuple[Optional[CachedResponse], bool]: La respuesta (o None si no hay
+                ninguna utilizable) y si está caducada y hay que regenerarla
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            age = now - entry.stored_at
+            if age > self.ttl + self.stale_ttl:
+                self._remove(key)
+                self.misses += 1
+                return None, False
+
+            self._entries.move_to_end(key)
+            stale = age > self.ttl
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return entry, stale
+
+    def set(self, key: str, entry: CachedResponse, generation: int) -> bool:
+        """
+        Guarda una respuesta si su etiqueta no se ha invalidado mientras se generaba.
+
+        Returns:
+            bool: True si la respuesta se ha guardado
+        """
+        if entry.size > self.max_bytes:
+            return False
+        with self._lock:
+            if self._generations.get(entry.tag, 0) != generation:
+                return False
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            # Expulsar las menos usadas hasta volver al límite de bytes
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+            return True
+
+    def invalidate(self, *tags: str) -> None:
+        """Descarta todas las respuestas de las etiquetas indicadas."""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in [k for k, e in self._entries.items() if e.tag in tags]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for tag in list(self._generations):
+                self._generations[tag] += 1
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos, fallos y ocupación de la caché."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+def make_etag(body: bytes) -> str:
+    """ETag fuerte derivado del contenido de la respuesta."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comprueba una cabecera If-None-Match contra el ETag actual."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (value.strip() for value in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware ASGI que cachea las respuestas GET del catálogo.
+
+    Añade ETags fuertes, responde 304 a `If-None-Match`, sirve respuestas
+    caducadas mientras las regenera en segundo plano (stale-while-revalidate) y
+    se invalida por etiquetas desde los repositorios tras cada escritura.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: "ResponseCache",
+        routes: Sequence[Tuple[str, str]] = CACHEABLE_ROUTES,
+    ):
+        self.app = app
+        self.cache = cache
+        self.routes: List[Tuple[Pattern[str], str]] = [
+            (re.compile(pattern), tag) for pattern, tag in routes
+        ]
+        self._revalidating: Set[str] = set()
+        self._background: Set[asyncio.Task[None]] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tag = self._tag_for(scope)
+        if tag is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key_for(scope)
+        if_none_match = self._header(scope, b"if-none-match")
+
+        entry, stale = self.cache.get(key)
+        if entry is not None:
+            if stale:
+                self._revalidate(scope, key, tag)
+            await self._send_entry(
+                entry, if_none_match, "STALE" if stale else "HIT", send
+            )
+            return
+
+        generation = self.cache.generation(tag)
+        status, headers, body = await self._render(scope, receive)
+        if status != 200 or not self._storable(headers):
+            await self._send_raw(status, headers, body, send)
+            return
+
+        entry = self._entry(status, headers, body, tag)
+        self.cache.set(key, entry, generation)
+        await self._send_entry(entry, if_none_match, "MISS", send)
+
+    def _tag_for(self, scope: Scope) -> Optional[str]:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        for pattern, tag in self.routes:
+            if pattern.match(scope["path"]):
+                return tag
+        return None
+
+    @staticmethod
+    def _key_for(scope: Scope) -> str:
+        query = scope.get("query_string", b"").decode("latin-1")
+        # Mismos parámetros en distinto orden comparten entrada
+        params = "&".join(sorted(query.split("&"))) if query else ""
+        return f"{scope['path']}?{params}"
+
+    @staticmethod
+    def _header(scope: Scope, name: bytes) -> Optional[str]:
+        for key, value in scope.get("headers", []):
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    @staticmethod
+    def _storable(headers: Headers) -> bool:
+        for key, value in headers:
+            if key == b"set-cookie":
+                return False
+            if key == b"cache-control" and b"no-store" in value:
+                return False
+        return True
+
+    @staticmethod
+    def _entry(status: int, headers: Headers, body: bytes, tag: str) -> CachedResponse:
+        return CachedResponse(
+            status=status,
+            headers=[(k, v) for k, v in headers if k not in _EXCLUDED_HEADERS],
+            body=body,
+            etag=make_etag(body),
+            tag=tag,
+            stored_at=time.monotonic(),
+        )
+
+    async def _render(
+        self, scope: Scope, receive: Receive
+    ) -> Tuple[int, Headers, bytes]:
+        """Ejecuta la aplicación y acumula la respuesta completa."""
+        status = 500
+        headers: Headers = []
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        return status, headers, b"".join(chunks)
+
+    def _revalidate(self, scope: Scope, key: str, tag: str) -> None:
+        # Una sola regeneración en curso por entrada
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        background_scope = dict(scope)
+        background_scope["headers"] = [
+            (k, v) for k, v in scope.get("headers", []) if k != b"if-none-match"
+        ]
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def refresh() -> None:
+            try:
+                generation = self.cache.generation(tag)
+                status, headers, body = await self._render(background_scope, receive)
+                if status == 200 and self._storable(headers):
+                    self.cache.set(
+                        key, self._entry(status, headers, body, tag), generation
+                    )
+            except Exception as e:
+                # La respuesta caducada ya se ha servido: solo registrar el fallo.
+                # Los errores HTTP llegan como respuestas, que no se guardan
+                get_logger_service().log(
+                    entry={
+                        "error": "Error al regenerar una respuesta cacheada",
+                        "path": scope["path"],
+                        "details": str(e),
+                        "traceback": traceback.format_exc(),
+                    },
+                    filename="db_errors",
+                )
+            finally:
+                self._revalidating.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @staticmethod
+    async def _send_entry(
+        entry: CachedResponse, if_none_match: Optional[str], state: str, send: Send
+    ) -> None:
+        cache_headers: Headers = [
+            (b"etag", entry.etag.encode()),
+            (b"cache-control", b"no-cache"),
+            (b"x-cache", state.encode()),
+        ]
+        if if_none_match and etag_matches(if_none_match, entry.etag):
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": cache_headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers = entry.headers + cache_headers
+        headers.append((b"content-length", str(len(entry.body)).encode()))
+        await send(
+            {"type": "http.response.start", "status": entry.status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": entry.body})
+
+    @staticmethod
+    async def _send_raw(status: int, headers: Headers, body: bytes, send: Send) -> None:
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    """
+    Obtiene la caché de respuestas compartida por el middleware y los repositorios.
+
+    Returns:
+        ResponseCache: Caché configurada con los ajustes `response_cache_*`
+    """
+    settings = get_settings()
+    return ResponseCache(
+        max_bytes=settings.response_cache_max_bytes,
+        ttl=settings.response_cache_ttl,
+        stale_ttl=settings.response_cache_stale_ttl,
+    )
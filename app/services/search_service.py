@@ -0,0 +1,433 @@
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, cast, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.db.schemas.models import (
+    Blog,
+    BlogLanContent,
+    Product,
+    ProductLanContent,
+    ProductRegion,
+)
+from app.models import Language
+from app.repository.pagination import Page, decode_cursor, encode_cursor
+
+RELEVANCE_ORDER = "relevance"
+
+# Configuraciones de búsqueda de texto de PostgreSQL (ver database.sql)
+TEXT_SEARCH_CONFIGS = {
+    Language.ES: "es_unaccent",
+    Language.EN: "en_unaccent",
+}
+
+# Peso de cada campo: el nombre/título pesa más que la descripción
+TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Pasa a minúsculas y elimina los acentos ("Jamón" -> "jamon")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Divide un texto normalizado en términos de búsqueda."""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+class InvertedIndex:
+    """Índice invertido en memoria con coincidencia por prefijo y ranking TF-IDF."""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        self._documents: Dict[Hashable, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: Hashable, fields: Iterable[Tuple[str, float]]) -> None:
+        """Indexa (o reindexa) un documento a partir de pares (texto, peso)."""
+        self.remove(doc_id)
+        frequencies: Dict[str, float] = defaultdict(float)
+        for text, weight in fields:
+            for term in tokenize(text or ""):
+                frequencies[term] += weight
+
+        for term, frequency in frequencies.items():
+            if term not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[term][doc_id] = frequency
+        self._documents[doc_id] = set(frequencies)
+
+    def remove(self, doc_id: Hashable) -> None:
+        for term in self._documents.pop(doc_id, ()):
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+    def search(self, query: str) -> Dict[Hashable, float]:
+        """Devuelve los documentos que contienen todos los términos con su puntuación.
+
+        Cada término de la consulta coincide por prefijo, de modo que "jam"
+        encuentra "jamón".
+        """
+        terms = tokenize(query)
+        if not terms:
+            return {}
+
+        total = len(self._documents)
+        scores: Optional[Dict[Hashable, float]] = None
+        for term in terms:
+            term_scores: Dict[Hashable, float] = defaultdict(float)
+            for candidate in self._expand(term):
+                postings = self._postings[candidate]
+                idf = math.log(1 + total / len(postings))
+                for doc_id, frequency in postings.items():
+                    term_scores[doc_id] += frequency * idf
+
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+    def _expand(self, prefix: str) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, prefix)
+        matches = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+
+def _page_from_ranking(
+    ranking: List[Tuple[float, UUID]], limit: int, cursor: Optional[str]
+) -> Page[UUID]:
+    """Pagina una lista de (puntuación, id) ordenada de mayor a menor."""
+    if cursor:
+        after = tuple(decode_cursor(cursor, RELEVANCE_ORDER, (float, UUID)))
+        ranking = [entry for entry in ranking if entry < after]
+
+    page = ranking[: limit + 1]
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(RELEVANCE_ORDER, page[-1])
+    return Page(items=[doc_id for _, doc_id in page], next_cursor=next_cursor)
+
+
+class PostgresSearchBackend:
+    """Búsqueda con columnas tsvector generadas e índices GIN en PostgreSQL."""
+
+    def search_products(
+        self,
+        db: Session,
+        text: str,
+        lan: Optional[Language] = None,
+        region: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Page[UUID]:
+        query = self._ts_query(text, lan)
+        if query is None:
+            return Page(items=[])
+
+        rank = cast(
+            func.max(func.ts_rank(ProductLanContent.search_vector, query)), Float
+        )
+        stmt = (
+            select(ProductLanContent.product_id, rank)
+            .where(ProductLanContent.search_vector.bool_op("@@")(query))
+            .group_by(ProductLanContent.product_id)
+        )
+        if lan:
+            stmt = stmt.where(ProductLanContent.lan == lan.value)
+        if region:
+            stmt = stmt.where(
+                select(ProductRegion.product_id)
+                .where(
+                    ProductRegion.product_id == ProductLanContent.product_id,
+                    ProductRegion.region_code == region,
+                )
+                .exists()
+            )
+        return self._ranked_page(
+            db, stmt, rank, ProductLanContent.product_id, limit, cursor
+        )
+
+    def search_blogs(
+        self,
+        db: Session,
+        text: str,
+        lan: Optional[Language] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Page[UUID]:
+        query = self._ts_query(text, lan)
+        if query is None:
+            return Page(items=[])
+
+        rank = cast(func.max(func.ts_rank(BlogLanContent.search_vector, query)), Float)
+        stmt = (
+            select(BlogLanContent.blog_id, rank)
+            .where(BlogLanContent.search_vector.bool_op("@@")(query))
+            .group_by(BlogLanContent.blog_id)
+        )
+        if lan:
+            stmt = stmt.where(BlogLanContent.lan == lan.value)
+        return self._ranked_page(db, stmt, rank, BlogLanContent.blog_id, limit, cursor)
+
+    def index_product(self, product: Product) -> None:
+        # Las columnas tsvector son generadas: la base de datos las mantiene
+        pass
+
+    def index_product_contents(
+        self,
+        product_id: UUID,
+        regions: Iterable[str],
+        contents: Iterable[Tuple[str, str, str]],
+    ) -> None:
+        pass
+
+    def remove_product(self, product_id: UUID) -> None:
+        pass
+
+    def index_blog(self, blog: Blog) -> None:
+        pass
+
+    def remove_blog(self, blog_id: UUID) -> None:
+        pass
+
+    @staticmethod
+    def _ts_query(text: str, lan: Optional[Language]):
+        terms = tokenize(text)
+        if not terms:
+            return None
+
+        # Prefijos en AND: "jamon ibe" -> "jamon:* & ibe:*"
+        expression = " & ".join(f"{term}:*" for term in terms)
+        languages = [lan] if lan else list(TEXT_SEARCH_CONFIGS)
+        queries = [
+            func.to_tsquery(cast(TEXT_SEARCH_CONFIGS[language], REGCONFIG), expression)
+            for language in languages
+        ]
+        query = queries[0]
+        for other in queries[1:]:
+            query = query.op("||")(other)
+        return query
+
+    @staticmethod
+    def _ranked_page(db, stmt, rank, id_column, limit, cursor) -> Page[UUID]:
+        if cursor:
+            score, last_id = decode_cursor(cursor, RELEVANCE_ORDER, (float, UUID))
+            stmt = stmt.having(
+                tuple_(rank, id_column)
+                < tuple_(literal(score, Float), literal(last_id))
+            )
+        stmt = stmt.order_by(rank.desc(), id_column.desc()).limit(limit + 1)
+        ranking = [(score, doc_id) for doc_id, score in db.execute(stmt)]
+        return _page_from_ranking(ranking, limit, None)
+
+
+class MemorySearchBackend:
+    """Índice invertido en proceso, sin extensiones de PostgreSQL.
+
+    Se carga desde la base de datos en la primera búsqueda y los repositorios lo
+    mantienen al día en cada escritura. Cada proceso tiene su propio índice, por lo
+    que está pensado para desarrollo y pruebas con un único worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._products = InvertedIndex()
+        self._product_regions: Dict[UUID, Set[str]] = {}
+        self._blogs = InvertedIndex()
+
+    def search_products(
+        self,
+        db: Session,
+        text: str,
+        lan: Optional[Language] = None,
+        region: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Page[UUID]:
+        self._ensure_loaded(db)
+        with self._lock:
+            matches = self._products.search(text)
+            regions = self._product_regions
+
+            scores: Dict[UUID, float] = {}
+            for (product_id, content_lan), score in matches.items():
+                if lan and content_lan != lan.value:
+                    continue
+                if region and region not in regions.get(product_id, ()):
+                    continue
+                scores[product_id] = max(score, scores.get(product_id, 0.0))
+
+        ranking = sorted(
+            ((score, product_id) for product_id, score in scores.items()), reverse=True
+        )
+        return _page_from_ranking(ranking, limit, cursor)
+
+    def search_blogs(
+        self,
+        db: Session,
+        text: str,
+        lan: Optional[Language] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Page[UUID]:
+        self._ensure_loaded(db)
+        with self._lock:
+            scores: Dict[UUID, float] = {}
+            for (blog_id, content_lan), score in self._blogs.search(text).items():
+                if lan and content_lan != lan.value:
+                    continue
+                scores[blog_id] = max(score, scores.get(blog_id, 0.0))
+
+        ranking = sorted(
+            ((score, blog_id) for blog_id, score in scores.items()), reverse=True
+        )
+        return _page_from_ranking(ranking, limit, cursor)
+
+    def index_product(self, product: Product) -> None:
+        self.index_product_contents(
+            product.id,
+            [region.region_code for region in product.regions],
+            [
+                (content.lan, content.name, content.description)
+                for content in product.product_lan_contents
+            ],
+        )
+
+    def index_product_contents(
+        self,
+        product_id: UUID,
+        regions: Iterable[str],
+        contents: Iterable[Tuple[str, str, str]],
+    ) -> None:
+        """Indexa un producto a partir de sus regiones y (lan, name, description)."""
+        with self._lock:
+            self._remove_product(product_id)
+            self._product_regions[product_id] = set(regions)
+            for lan, name, description in contents:
+                self._products.add(
+                    (product_id, lan),
+                    [(name, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT)],
+                )
+
+    def remove_product(self, product_id: UUID) -> None:
+        with self._lock:
+            self._remove_product(product_id)
+
+    def index_blog(self, blog: Blog) -> None:
+        with self._lock:
+            self._remove_blog(blog.id)
+            for content in blog.blog_lan_contents:
+                self._blogs.add(
+                    (blog.id, content.lan),
+                    [
+                        (content.title, TITLE_WEIGHT),
+                        (content.description, DESCRIPTION_WEIGHT),
+                    ],
+                )
+
+    def remove_blog(self, blog_id: UUID) -> None:
+        with self._lock:
+            self._remove_blog(blog_id)
+
+    def _remove_product(self, product_id: UUID) -> None:
+        self._product_regions.pop(product_id, None)
+        for language in Language:
+            self._products.remove((product_id, language.value))
+
+    def _remove_blog(self, blog_id: UUID) -> None:
+        for language in Language:
+            self._blogs.remove((blog_id, language.value))
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+
+        contents = db.execute(
+            select(
+                ProductLanContent.product_id,
+                ProductLanContent.lan,
+                ProductLanContent.name,
+                ProductLanContent.description,
+            )
+        ).all()
+        regions = db.execute(
+            select(ProductRegion.product_id, ProductRegion.region_code)
+        ).all()
+        blog_contents = db.execute(
+            select(
+                BlogLanContent.blog_id,
+                BlogLanContent.lan,
+                BlogLanContent.title,
+                BlogLanContent.description,
+            )
+        ).all()
+
+        with self._lock:
+            if self._loaded:
+                return
+            for product_id, region_code in regions:
+                self._product_regions.setdefault(product_id, set()).add(region_code)
+            for product_id, lan, name, description in contents:
+                self._products.add(
+                    (product_id, lan),
+                    [(name, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT)],
+                )
+            for blog_id, lan, title, description in blog_contents:
+                self._blogs.add(
+                    (blog_id, lan),
+                    [(title, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT)],
+                )
+            self._loaded = True
+
+
+SearchBackend = PostgresSearchBackend | MemorySearchBackend
+
+
+@lru_cache
+def get_search_service() -> SearchBackend:
+    """
+    Obtiene el motor de búsqueda configurado en `search_backend`.
+
+    Returns:
+        SearchBackend: Motor de búsqueda de PostgreSQL o en memoria
+    """
+    if get_settings().search_backend == "memory":
+        return MemorySearchBackend()
+    return PostgresSearchBackend()
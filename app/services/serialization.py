@@ -0,0 +1,82 @@
+from typing import Any, Generic, List, Sequence, Type, TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.config.settings import get_settings
+from app.models import Blog, BlogComment, ProductResponse, ResourceAccess, Thread, User
+
+settings = get_settings()
+
+JSON_MEDIA_TYPE = "application/json"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ListSerializer(Generic[ModelT]):
+    def __init__(self, model: Type[ModelT]):
+        """
+        Serializador precompilado de listas de un modelo de respuesta.
+
+        FastAPI valida lo que devuelve la ruta contra `response_model`, lo pasa
+        a tipos de Python (`dump_python`) y después lo codifica con `json`. Aquí
+        la lista se valida una sola vez (o ninguna si ya son instancias del
+        modelo) y pydantic-core la codifica directamente a bytes.
+
+        Args:
+            model (Type[ModelT]): Modelo de cada elemento de la lista
+        """
+        self.model = model
+        self.adapter = TypeAdapter(List[model])
+
+    def render(self, items: Sequence[Any], validated: bool = False) -> bytes:
+        """
+        Codifica la lista en JSON.
+
+        Args:
+            items (Sequence[Any]): Diccionarios u objetos con los atributos del
+                modelo (por ejemplo, filas del ORM), o instancias del modelo
+            validated (bool): Los elementos ya son instancias del modelo y no
+                hace falta validarlos de nuevo
+
+        Returns:
+            bytes: Cuerpo JSON
+        """
+        if not validated:
+            items = self.adapter.validate_python(items, from_attributes=True)
+        return self.adapter.dump_json(items, by_alias=True)
+
+    def response(
+        self, items: Sequence[Any], response: Response, validated: bool = False
+    ) -> Any:
+        """
+        Respuesta de una ruta con `response_model=List[model]`.
+
+        La respuesta se devuelve ya codificada, así que FastAPI no vuelve a
+        validarla ni a serializarla; las cabeceras que la ruta haya puesto en
+        `response` (cursor de paginación) se conservan. Con `fast_json`
+        desactivado devuelve los elementos tal cual para que lo haga FastAPI.
+
+        Args:
+            items (Sequence[Any]): Elementos de la respuesta
+            response (Response): Respuesta inyectada en la ruta
+            validated (bool): Los elementos ya son instancias del modelo
+
+        Returns:
+            Any: `Response` con el cuerpo JSON, o `items` sin `fast_json`
+        """
+        if not settings.fast_json:
+            return items
+        rendered = Response(
+            content=self.render(items, validated), media_type=JSON_MEDIA_TYPE
+        )
+        rendered.headers.raw.extend(response.headers.raw)
+        return rendered
+
+
+PRODUCT_LIST = ListSerializer(ProductResponse)
+BLOG_LIST = ListSerializer(Blog)
+BLOG_COMMENT_LIST = ListSerializer(BlogComment)
+THREAD_LIST = ListSerializer(Thread)
+USER_LIST = ListSerializer(User)
+ACCESS_LIST = ListSerializer(ResourceAccess)
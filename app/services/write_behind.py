@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import traceback
+from collections import defaultdict
+from typing import Callable, Dict, Generic, Hashable, Mapping, Optional, TypeVar
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.services.logger_service import get_logger_service
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+
+
+class WriteBehindCounter(Generic[KeyT]):
+    def __init__(self, description: str):
+        """
+        Acumula en memoria incrementos de contadores y los escribe por lotes.
+
+        Las peticiones solo suman en memoria; una tarea en segundo plano aplica
+        cada intervalo todos los incrementos pendientes en una sola transacción,
+        así que las filas más escritas dejan de bloquearse en cada petición.
+
+        Args:
+            description (str): Qué se acumula, para los mensajes de error
+                (por ejemplo, "los likes acumulados")
+        """
+        self._description = description
+        self._pending: Dict[KeyT, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._apply: Optional[Callable[[Dict[KeyT, int]], None]] = None
+        self._interval = 1.0
+        self._flusher: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        """Indica si los incrementos se están acumulando para escribirlos por lotes."""
+        return self._flusher is not None and not self._flusher.done()
+
+    async def start(
+        self, apply: Callable[[Dict[KeyT, int]], None], interval: float = 1.0
+    ) -> None:
+        """
+        Arranca la tarea que vuelca los incrementos acumulados.
+
+        Args:
+            apply (Callable[[Dict[KeyT, int]], None]): Función síncrona que
+                persiste los incrementos; se ejecuta en un hilo
+            interval (float): Segundos entre volcados
+        """
+        if self.running:
+            return
+        self._apply = apply
+        self._interval = interval
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Detiene la tarea escribiendo antes los incrementos pendientes."""
+        if self._flusher is None:
+            return
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._flusher = None
+        await self.flush()
+
+    def add(self, key: KeyT, delta: int = 1) -> None:
+        """Registra un incremento; es seguro llamarlo desde cualquier hilo."""
+        with self._lock:
+            self._pending[key] += delta
+
+    def add_many(self, deltas: Mapping[KeyT, int]) -> None:
+        """Registra varios incrementos a la vez; es seguro llamarlo desde cualquier hilo."""
+        with self._lock:
+            for key, delta in deltas.items():
+                self._pending[key] += delta
+
+    def pending(self, key: KeyT) -> int:
+        """Incremento de `key` todavía no escrito en la base de datos."""
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    async def flush(self) -> None:
+        """Escribe los incrementos acumulados; si falla, se conservan para el siguiente intento."""
+        with self._lock:
+            if not self._pending or self._apply is None:
+                return
+            deltas, self._pending = dict(self._pending), defaultdict(int)
+
+        try:
+            await asyncio.to_thread(self._apply, deltas)
+        except SQLAlchemyError as e:
+            self.add_many(deltas)
+            get_logger_service().log(
+                entry={
+                    "error": f"Error al volcar {self._description}",
+                    "details": str(e),
+                    "traceback": traceback.format_exc(),
+                },
+                filename="db_errors",
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.flush()
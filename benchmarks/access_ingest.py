@@ -0,0 +1,104 @@
+"""
+Compara el rendimiento de la ingesta de accesos fila a fila (`create`) con la
+ingesta por lotes (`create_many`) contra la base de datos configurada.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.access_ingest --rows 5000 --batch-size 1000
+
+Los accesos se registran con `resourceType=benchmark` y se borran al terminar
+(junto con sus contadores agregados) salvo que se indique --keep.
+"""
+
+import argparse
+import time
+import uuid
+from typing import Callable, List
+
+from sqlalchemy import delete, select
+
+from app.db.connection import create_new_db_session
+from app.db.schemas.models import (
+    ResourceAccess,
+    ResourceAccessDaily,
+    ResourceAccessHourly,
+    User,
+)
+from app.models import AccessDevice, CreateResourceAccess
+from app.repository.resource_repository import ResourceRepository
+
+RESOURCE_TYPE = "benchmark"
+
+
+def make_accesses(user_id: uuid.UUID, rows: int) -> List[CreateResourceAccess]:
+    # Pocos recursos distintos, como en un tráfico real con recursos populares
+    resources = [uuid.uuid4() for _ in range(50)]
+    devices = list(AccessDevice)
+    return [
+        CreateResourceAccess(
+            userId=user_id,
+            resourceType=RESOURCE_TYPE,
+            resourceId=resources[i % len(resources)],
+            accessType="view",
+            deviceType=devices[i % len(devices)],
+        )
+        for i in range(rows)
+    ]
+
+
+def timed(label: str, rows: int, run: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34} {rows:>7} filas  {elapsed:8.2f} s  {rows / elapsed:10.0f} filas/s"
+    )
+    return elapsed
+
+
+def cleanup() -> None:
+    db = create_new_db_session()
+    try:
+        for model in (ResourceAccess, ResourceAccessHourly, ResourceAccessDaily):
+            db.execute(delete(model).where(model.resource_type == RESOURCE_TYPE))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000, help="Accesos por fase")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="No borrar los accesos")
+    args = parser.parse_args()
+
+    db = create_new_db_session()
+    try:
+        user_id = db.execute(select(User.id).limit(1)).scalar_one()
+        repository = ResourceRepository(db)
+        accesses = make_accesses(user_id, args.rows)
+
+        # Un commit por acceso o por lote, como una petición a la API
+        def single_row() -> None:
+            for access in accesses:
+                repository.create(access)
+                db.commit()
+
+        def batched() -> None:
+            for start in range(0, len(accesses), args.batch_size):
+                repository.create_many(accesses[start : start + args.batch_size])
+                db.commit()
+
+        single = timed("Fila a fila (create)", args.rows, single_row)
+        batch = timed(
+            f"Por lotes de {args.batch_size} (create_many)", args.rows, batched
+        )
+        print(f"Aceleración: x{single / batch:.1f}")
+    finally:
+        db.close()
+        if not args.keep:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+"""
+Banco de carga de la API por grupos de rutas (users, products, blogs, forums,
+requests) contra la base de datos configurada.
+
+Arranca `main:app` con uvicorn en un proceso aparte (con la misma configuración
+del entorno: DB_MODE, RESPONSE_CACHE_ENABLED...) y ejecuta cada escenario con
+una concurrencia fija durante un tiempo fijo. Por escenario informa de las
+peticiones por segundo, las latencias p50/p95/p99 y las sentencias SQL por
+petición, que se leen de la cabecera Server-Timing (METRICS_ENABLED=true).
+
+Uso (desde la raíz del proyecto, con la base de datos ya sembrada):
+    python -m benchmarks.api_suite --save benchmarks/baseline.json
+    python -m benchmarks.api_suite --compare benchmarks/baseline.json
+
+Con --compare se marca como regresión cualquier escenario cuyo rendimiento
+baje o cuyo p95 suba más de --tolerance, o que haga más sentencias por
+petición; el proceso termina entonces con código 1. Las escrituras (--writes)
+crean filas de verdad, así que no se incluyen por defecto.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+
+from app.config.settings import get_settings
+from app.db.connection import engine
+from app.routers.pagination import NEXT_CURSOR_HEADER
+from benchmarks.login_storm import percentile
+
+API = "/api/v1"
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin123"
+
+# Escala mínima para que los resultados sean representativos
+TARGET_SCALE = {
+    "products": 10_000,
+    "blog_comments": 100_000,
+    "resource_accesses": 5_000_000,
+}
+DATASET_TABLES = (
+    "users",
+    "products",
+    "blogs",
+    "blog_comments",
+    "threads",
+    "product_requests",
+    "blog_requests",
+    "resource_accesses",
+)
+
+_STATEMENTS = re.compile(r'desc="(\d+) statements"')
+
+
+@dataclass
+class Samples:
+    """Identificadores reales con los que se construyen las rutas."""
+
+    user_id: str
+    product_ids: List[str]
+    blog_ids: List[str]
+    region_ids: List[str]
+    search_terms: List[str]
+
+
+@dataclass
+class Scenario:
+    name: str
+    group: str
+    path: Callable[[random.Random, Samples], str]
+    method: str = "GET"
+    auth: bool = False
+    body: Optional[Callable[[random.Random, Samples], dict]] = None
+    # Seguir el cursor de X-Next-Cursor hasta `--max-pages` páginas
+    paginate: bool = False
+    # Atributo de `Samples` que no puede estar vacío para construir la ruta
+    requires: Optional[str] = None
+
+
+@dataclass
+class ScenarioResult:
+    group: str
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: Optional[float]
+    cache_hit_ratio: float
+
+
+@dataclass
+class Recorder:
+    latencies: List[float] = field(default_factory=list)
+    statements: List[int] = field(default_factory=list)
+    errors: int = 0
+    cache_hits: int = 0
+
+    def add(self, response: httpx.Response, latency: float) -> None:
+        self.latencies.append(latency)
+        if response.status_code >= 400:
+            self.errors += 1
+        if response.headers.get("X-Cache") == "HIT":
+            self.cache_hits += 1
+        match = _STATEMENTS.search(response.headers.get("Server-Timing", ""))
+        if match:
+            self.statements.append(int(match.group(1)))
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        "users.login",
+        "users",
+        lambda rng, s: "/users/auth/login",
+        method="POST",
+        body=lambda rng, s: {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+    ),
+    Scenario("users.me", "users", lambda rng, s: "/users/me", auth=True),
+    Scenario("users.list", "users", lambda rng, s: "/users/", auth=True, paginate=True),
+    Scenario(
+        "users.accesses",
+        "users",
+        lambda rng, s: "/users/accesses",
+        auth=True,
+        paginate=True,
+    ),
+    Scenario("products.list", "products", lambda rng, s: "/products", paginate=True),
+    Scenario(
+        "products.search",
+        "products",
+        lambda rng, s: f"/products?name={rng.choice(s.search_terms)}",
+    ),
+    Scenario(
+        "products.detail",
+        "products",
+        lambda rng, s: f"/products/{rng.choice(s.product_ids)}",
+        requires="product_ids",
+    ),
+    Scenario("blogs.list", "blogs", lambda rng, s: "/blogs", paginate=True),
+    Scenario(
+        "blogs.detail",
+        "blogs",
+        lambda rng, s: f"/blogs/{rng.choice(s.blog_ids)}",
+        requires="blog_ids",
+    ),
+    Scenario(
+        "blogs.comments",
+        "blogs",
+        lambda rng, s: f"/blogs/{rng.choice(s.blog_ids)}/comments",
+        paginate=True,
+        requires="blog_ids",
+    ),
+    Scenario("forums.list", "forums", lambda rng, s: "/forums"),
+    Scenario(
+        "forums.threads",
+        "forums",
+        lambda rng, s: f"/threads/{rng.choice(s.region_ids)}",
+        paginate=True,
+        requires="region_ids",
+    ),
+    Scenario(
+        "requests.products",
+        "requests",
+        lambda rng, s: "/requests/products",
+        auth=True,
+        paginate=True,
+    ),
+    Scenario(
+        "requests.blogs",
+        "requests",
+        lambda rng, s: "/requests/blogs",
+        auth=True,
+        paginate=True,
+    ),
+]
+
+WRITE_SCENARIOS: List[Scenario] = [
+    Scenario(
+        "blogs.comment",
+        "blogs",
+        lambda rng, s: f"/blogs/{rng.choice(s.blog_ids)}/comments",
+        method="POST",
+        auth=True,
+        body=lambda rng, s: {"userId": s.user_id, "comment": "benchmark"},
+        requires="blog_ids",
+    ),
+    Scenario(
+        "forums.create_thread",
+        "forums",
+        lambda rng, s: "/threads",
+        method="POST",
+        auth=True,
+        body=lambda rng, s: {
+            "regionId": rng.choice(s.region_ids),
+            "lan": "es-ES",
+            "title": "benchmark",
+            "description": "benchmark",
+        },
+        requires="region_ids",
+    ),
+    Scenario(
+        "requests.submit_product",
+        "requests",
+        lambda rng, s: "/requests/products",
+        method="POST",
+        auth=True,
+        body=lambda rng, s: {
+            "name": "benchmark",
+            "userId": s.user_id,
+            "description": "benchmark",
+        },
+    ),
+]
+
+
+def dataset_sizes() -> Dict[str, int]:
+    with engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT count(*) FROM {table}")).scalar_one()
+            for table in DATASET_TABLES
+        }
+
+
+def load_samples(user_id: str, size: int) -> Samples:
+    # Ordenar por id (UUID aleatorio) da una muestra repartida y reproducible
+    with engine.connect() as conn:
+
+        def ids(query: str) -> List[str]:
+            return [str(row[0]) for row in conn.execute(text(query), {"n": size})]
+
+        names = ids("SELECT name FROM product_lan_contents ORDER BY id LIMIT :n")
+        return Samples(
+            user_id=user_id,
+            product_ids=ids("SELECT id FROM products ORDER BY id LIMIT :n"),
+            blog_ids=ids("SELECT id FROM blogs ORDER BY id LIMIT :n"),
+            region_ids=ids("SELECT region_id FROM forums ORDER BY region_id"),
+            search_terms=sorted(
+                {word for name in names for word in name.split() if len(word) > 3}
+            )
+            or ["producto"],
+        )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, "METRICS_ENABLED": "true"},
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get(f"{API}/forums")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("La API no ha arrancado a tiempo")
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    samples: Samples,
+    headers: Dict[str, str],
+    rng: random.Random,
+    deadline: float,
+    max_pages: int,
+    recorder: Optional[Recorder],
+) -> None:
+    cursor: Optional[str] = None
+    pages = 0
+    while time.perf_counter() < deadline:
+        path = scenario.path(rng, samples)
+        params = {"cursor": cursor} if cursor else None
+        body = scenario.body(rng, samples) if scenario.body else None
+        start = time.perf_counter()
+        response = await client.request(
+            scenario.method,
+            f"{API}{path}",
+            params=params,
+            json=body,
+            headers=headers if scenario.auth else None,
+        )
+        latency = time.perf_counter() - start
+        if recorder is not None:
+            recorder.add(response, latency)
+
+        if scenario.paginate:
+            pages += 1
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor or pages >= max_pages:
+                cursor, pages = None, 0
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    samples: Samples,
+    headers: Dict[str, str],
+    args: argparse.Namespace,
+) -> ScenarioResult:
+    async def phase(seconds: float, recorder: Optional[Recorder]) -> None:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(
+                worker(
+                    client,
+                    scenario,
+                    samples,
+                    headers,
+                    # Cada cliente recorre la misma secuencia en todas las ejecuciones
+                    random.Random(f"{args.seed}:{scenario.name}:{index}"),
+                    deadline,
+                    args.max_pages,
+                    recorder,
+                )
+                for index in range(args.concurrency)
+            )
+        )
+
+    await phase(args.warmup, None)
+    recorder = Recorder()
+    await phase(args.duration, recorder)
+
+    latencies = recorder.latencies
+    return ScenarioResult(
+        group=scenario.group,
+        requests=len(latencies),
+        errors=recorder.errors,
+        throughput=len(latencies) / args.duration,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        queries_per_request=(
+            sum(recorder.statements) / len(recorder.statements)
+            if recorder.statements
+            else None
+        ),
+        cache_hit_ratio=recorder.cache_hits / len(latencies) if latencies else 0.0,
+    )
+
+
+async def run_suite(args: argparse.Namespace, base_url: str, samples_size: int):
+    scenarios = SCENARIOS + (WRITE_SCENARIOS if args.writes else [])
+    if args.only:
+        scenarios = [
+            scenario
+            for scenario in scenarios
+            if scenario.name in args.only or scenario.group in args.only
+        ]
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=limits
+    ) as client:
+        await wait_until_ready(client, args.startup_timeout)
+        login = await client.post(
+            f"{API}/users/auth/login",
+            json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['bearer']}"}
+        me = await client.get(f"{API}/users/me", headers=headers)
+        me.raise_for_status()
+        samples = load_samples(me.json()["id"], samples_size)
+
+        results: Dict[str, ScenarioResult] = {}
+        for scenario in scenarios:
+            if scenario.requires and not getattr(samples, scenario.requires):
+                print(f"{scenario.name:<26} omitido: no hay {scenario.requires}")
+                continue
+            results[scenario.name] = await run_scenario(
+                client, scenario, samples, headers, args
+            )
+            print_result(scenario.name, results[scenario.name])
+        return results
+
+
+def print_result(name: str, result: ScenarioResult) -> None:
+    queries = (
+        f"{result.queries_per_request:6.2f}"
+        if result.queries_per_request is not None
+        else "     -"
+    )
+    print(
+        f"{name:<26} {result.throughput:9.1f} req/s  "
+        f"p50 {result.p50_ms:8.1f}  p95 {result.p95_ms:8.1f}  "
+        f"p99 {result.p99_ms:8.1f} ms  sql/req {queries}  "
+        f"cache {result.cache_hit_ratio:5.0%}  errores {result.errors}"
+    )
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Imprime la comparación con la línea base y devuelve las regresiones."""
+    for key in ("environment", "dataset"):
+        if current[key] != baseline[key]:
+            print(f"Aviso: {key} distinto de la línea base: {baseline[key]}")
+
+    regressions: List[str] = []
+    print(f"\n{'escenario':<26} {'req/s':>9} {'p95':>9} {'sql/req':>9}")
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        throughput = _change(result["throughput"], base["throughput"])
+        p95 = _change(result["p95_ms"], base["p95_ms"])
+        queries, base_queries = (
+            result["queries_per_request"],
+            base["queries_per_request"],
+        )
+        more_queries = (
+            queries is not None
+            and base_queries is not None
+            and queries > base_queries + 0.5
+        )
+        print(
+            f"{name:<26} {throughput:+8.1%} {p95:+8.1%} "
+            f"{(queries or 0) - (base_queries or 0):+9.2f}"
+        )
+        if throughput < -tolerance or p95 > tolerance or more_queries:
+            regressions.append(name)
+    return regressions
+
+
+def _change(value: float, base: float) -> float:
+    return (value - base) / base if base else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--url", help="API ya arrancada (por defecto se arranca main:app)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Segundos por escenario"
+    )
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--max-pages", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--writes", action="store_true", help="Incluir escrituras")
+    parser.add_argument(
+        "--only", nargs="+", help="Escenarios o grupos a ejecutar (p. ej. products)"
+    )
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--save", help="Guardar los resultados en este JSON")
+    parser.add_argument("--compare", help="Línea base JSON con la que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    dataset = dataset_sizes()
+    for table, minimum in TARGET_SCALE.items():
+        if dataset[table] < minimum:
+            print(
+                f"Aviso: {table} tiene {dataset[table]} filas "
+                f"(se recomiendan al menos {minimum})"
+            )
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        server = start_server(port, args.workers)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        results = asyncio.run(run_suite(args, base_url, args.samples))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "db_mode": settings.db_mode,
+            "response_cache_enabled": settings.response_cache_enabled,
+            "workers": args.workers if args.url is None else None,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+        },
+        "dataset": dataset,
+        "scenarios": {name: asdict(result) for name, result in results.items()},
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResultados guardados en {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        if regressions:
+            print(f"\nRegresiones: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
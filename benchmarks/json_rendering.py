@@ -0,0 +1,193 @@
+"""
+Compara la serialización de los listados de FastAPI (validar contra
+`response_model`, `dump_python` y `json.dumps`) con los serializadores
+precompilados de `app/services/serialization.py`.
+
+Uso (desde la raíz del proyecto; no necesita base de datos):
+    python -m benchmarks.json_rendering --items 50 --seconds 2
+
+Los elementos imitan lo que devuelven las rutas: diccionarios con contenidos
+del ORM (productos, hilos) u objetos del ORM (blogs). Se mide en un solo hilo,
+así que los bytes/s son los de un worker.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.services.serialization import (
+    BLOG_LIST,
+    PRODUCT_LIST,
+    THREAD_LIST,
+    ListSerializer,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_user(index: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        email=f"user{index}@example.com",
+        nick_name=f"user{index}",
+        role="USER",
+        image=None,
+        is_blocked=False,
+        creation_date=NOW - timedelta(days=index),
+    )
+
+
+def make_products(count: int) -> List[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "image": f"https://images.example.com/products/{index}.jpg",
+            "creationDate": NOW - timedelta(minutes=index),
+            "regions": ["ES-AN", "ES-EX"],
+            "productLanContents": [
+                SimpleNamespace(
+                    lan=lan,
+                    name=f"Queso artesano de Extremadura {index}",
+                    description="Elaborado por pequeños productores. " * 4,
+                )
+                for lan in ("es-ES", "en-US")
+            ],
+        }
+        for index in range(count)
+    ]
+
+
+def make_blogs(count: int, comments: int) -> List[SimpleNamespace]:
+    blogs = []
+    for index in range(count):
+        blog_id = uuid.uuid4()
+        blogs.append(
+            SimpleNamespace(
+                id=blog_id,
+                product_id=uuid.uuid4(),
+                image=None,
+                creation_date=NOW - timedelta(minutes=index),
+                blog_lan_contents=[
+                    SimpleNamespace(
+                        blog_id=blog_id,
+                        lan="es-ES",
+                        title=f"Ruta del jamón {index}",
+                        description="Historia y consejos de compra. " * 8,
+                    )
+                ],
+                comments=[
+                    SimpleNamespace(
+                        id=uuid.uuid4(),
+                        blog_id=blog_id,
+                        user=make_user(number),
+                        comment="Muy buena recomendación, gracias.",
+                        image=None,
+                        n_likes=number,
+                        creation_date=NOW - timedelta(seconds=number),
+                    )
+                    for number in range(comments)
+                ],
+            )
+        )
+    return blogs
+
+
+def make_threads(count: int, comments: int) -> List[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "regionId": "ES-AN",
+            "lan": "es-ES",
+            "title": f"Dónde comprar aceite en Andalucía {index}",
+            "description": "Busco productores locales. " * 4,
+            "comments": [
+                {
+                    "id": uuid.uuid4(),
+                    "threadId": uuid.uuid4(),
+                    "user": make_user(number),
+                    "content": "Prueba en la cooperativa del pueblo.",
+                    "creationDate": NOW - timedelta(seconds=number),
+                }
+                for number in range(comments)
+            ],
+            "creationDate": NOW - timedelta(minutes=index),
+        }
+        for index in range(count)
+    ]
+
+
+def measure(label: str, render: Callable[[], bytes], seconds: float) -> None:
+    size = len(render())
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        render()
+        calls += 1
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {label:<30} {calls / elapsed:9.0f} resp/s  "
+        f"{size * calls / elapsed / 1e6:8.1f} MB/s  ({size} bytes)"
+    )
+
+
+def fastapi_render(serializer: ListSerializer, items: List[Any]) -> Callable:
+    # Lo que hace FastAPI con `response_model=List[model]` y la respuesta JSON
+    field = create_model_field(
+        name="Response", type_=List[serializer.model], mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+
+    def render() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=items)
+        )
+        return JSONResponse(content).body
+
+    return render
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=50, help="Elementos por página")
+    parser.add_argument("--comments", type=int, default=5, help="Comentarios por blog")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Segundos por caso")
+    args = parser.parse_args()
+
+    for name, serializer, items in (
+        ("List[ProductResponse]", PRODUCT_LIST, make_products(args.items)),
+        ("List[Blog]", BLOG_LIST, make_blogs(args.items, args.comments)),
+        ("List[Thread]", THREAD_LIST, make_threads(args.items, args.comments)),
+    ):
+        print(f"\n{name} ({args.items} elementos)")
+        validated = serializer.adapter.validate_python(items, from_attributes=True)
+        # Los tres caminos deben producir exactamente el mismo JSON
+        assert fastapi_render(serializer, items)() == serializer.render(items)
+        assert serializer.render(validated, validated=True) == serializer.render(items)
+
+        measure(
+            "FastAPI (response_model)", fastapi_render(serializer, items), args.seconds
+        )
+        measure(
+            "TypeAdapter (validar + JSON)",
+            lambda serializer=serializer, items=items: serializer.render(items),
+            args.seconds,
+        )
+        measure(
+            "TypeAdapter (ya validado)",
+            lambda serializer=serializer, validated=validated: serializer.render(
+                validated, validated=True
+            ),
+            args.seconds,
+        )
+
+
+if __name__ == "__main__":
+    main()
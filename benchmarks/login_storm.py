@@ -0,0 +1,134 @@
+"""
+Mide la latencia de otros endpoints mientras la API recibe una ráfaga de logins.
+
+Uso (con la API arrancada):
+    python benchmarks/login_storm.py --url http://localhost:8000 --logins 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+API = "/api/v1"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def login_worker(
+    client: httpx.AsyncClient,
+    email: str,
+    password: str,
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post(
+            f"{API}/users/auth/login", json={"email": email, "password": password}
+        )
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def probe_worker(
+    client: httpx.AsyncClient,
+    path: str,
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(f"{API}{path}")
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+        await asyncio.sleep(0.01)
+
+
+async def run_phase(args: argparse.Namespace, logins: int) -> dict:
+    limits = httpx.Limits(max_connections=logins + args.probes)
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=60, limits=limits
+    ) as client:
+        deadline = time.perf_counter() + args.duration
+        login_latencies: List[float] = []
+        probe_latencies: List[float] = []
+        login_errors: List[int] = []
+        probe_errors: List[int] = []
+
+        tasks = [
+            login_worker(
+                client,
+                args.email,
+                args.password,
+                deadline,
+                login_latencies,
+                login_errors,
+            )
+            for _ in range(logins)
+        ] + [
+            probe_worker(
+                client, args.probe_path, deadline, probe_latencies, probe_errors
+            )
+            for _ in range(args.probes)
+        ]
+        await asyncio.gather(*tasks)
+
+    return {
+        "logins_per_second": len(login_latencies) / args.duration,
+        "login_errors": len(login_errors),
+        "probe_requests": len(probe_latencies),
+        "probe_errors": len(probe_errors),
+        "probe_p50_ms": percentile(probe_latencies, 50) * 1000,
+        "probe_p99_ms": percentile(probe_latencies, 99) * 1000,
+        "probe_mean_ms": (
+            statistics.fmean(probe_latencies) * 1000 if probe_latencies else 0.0
+        ),
+    }
+
+
+def print_phase(name: str, result: dict) -> None:
+    print(f"\n{name}")
+    for key, value in result.items():
+        print(
+            f"  {key:<18} {value:10.2f}"
+            if isinstance(value, float)
+            else f"  {key:<18} {value:10d}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--logins", type=int, default=100, help="Logins concurrentes")
+    parser.add_argument("--probes", type=int, default=5, help="Clientes de sondeo")
+    parser.add_argument("--probe-path", default="/products")
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Segundos por fase"
+    )
+    args = parser.parse_args()
+
+    # Primero la línea base sin logins y después la ráfaga
+    print_phase("Sin logins", await run_phase(args, 0))
+    print_phase(
+        f"Con {args.logins} logins concurrentes", await run_phase(args, args.logins)
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
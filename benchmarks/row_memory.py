@@ -0,0 +1,210 @@
+"""
+Mide la memoria por fila de los listados: entidades del ORM copiadas después a
+los modelos de respuesta (como hacían las rutas) frente a las proyecciones de
+columnas (filas Core) que devuelven ahora los repositorios.
+
+Uso (desde la raíz del proyecto, contra la base de datos configurada):
+    python -m benchmarks.row_memory --limit 100 --repeat 5
+
+Para cada listado se carga la primera página con una sesión nueva y se valida
+contra el modelo de respuesta. Se informa del pico de memoria asignada
+(tracemalloc) por elemento de la página, de la memoria que siguen ocupando los
+objetos cargados antes de validarlos y del tiempo por página (medido aparte,
+sin tracemalloc, que lo ralentiza todo).
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.config.settings import get_settings
+from app.db.connection import create_new_db_session
+from app.db.schemas.models import (
+    Blog,
+    BlogComment,
+    Product,
+    ResourceAccess,
+    User,
+)
+from app.repository.blog_repository import BlogRepository
+from app.repository.pagination import paginate
+from app.repository.product_repository import ProductRepository
+from app.repository.resource_repository import ResourceRepository
+from app.repository.user_repository import UserRepository
+from app.services.serialization import (
+    ACCESS_LIST,
+    BLOG_LIST,
+    PRODUCT_LIST,
+    USER_LIST,
+    ListSerializer,
+)
+
+settings = get_settings()
+
+Loader = Callable[[Session, int], List[Any]]
+
+
+def orm_products(db: Session, limit: int) -> List[Any]:
+    query = db.query(Product).options(
+        selectinload(Product.regions), selectinload(Product.product_lan_contents)
+    )
+    page = paginate(query, (Product.creation_date, Product.id), limit)
+    return [
+        {
+            "id": product.id,
+            "image": product.image,
+            "creationDate": product.creation_date,
+            "regions": [region.region_code for region in product.regions],
+            "productLanContents": product.product_lan_contents,
+        }
+        for product in page.items
+    ]
+
+
+def orm_blogs(db: Session, limit: int) -> List[Any]:
+    query = db.query(Blog).options(
+        joinedload(Blog.blog_lan_contents),
+        joinedload(Blog.comments).joinedload(BlogComment.user),
+    )
+    return paginate(query, (Blog.creation_date, Blog.id), limit).items
+
+
+def orm_users(db: Session, limit: int) -> List[Any]:
+    return paginate(db.query(User), (User.creation_date, User.id), limit).items
+
+
+def orm_accesses(db: Session, limit: int) -> List[Any]:
+    page = paginate(
+        db.query(ResourceAccess),
+        (ResourceAccess.access_date, ResourceAccess.id),
+        limit,
+    )
+    return [
+        {
+            "id": access.id,
+            "userId": access.user_id,
+            "resourceType": access.resource_type,
+            "resourceId": access.resource_id,
+            "accessType": access.access_type,
+            "accessDate": access.access_date,
+            "deviceType": access.device_type,
+        }
+        for access in page.items
+    ]
+
+
+LISTS: Tuple[Tuple[str, ListSerializer, Loader, Loader], ...] = (
+    (
+        "GET /products",
+        PRODUCT_LIST,
+        orm_products,
+        lambda db, limit: ProductRepository(db).get_all(limit).items,
+    ),
+    (
+        "GET /blogs",
+        BLOG_LIST,
+        orm_blogs,
+        lambda db, limit: (
+            BlogRepository(db)
+            .get_all(limit, comments_limit=settings.page_size_default)
+            .items
+        ),
+    ),
+    (
+        "GET /users/",
+        USER_LIST,
+        orm_users,
+        lambda db, limit: UserRepository(db).get_all(limit).items,
+    ),
+    (
+        "GET /users/accesses",
+        ACCESS_LIST,
+        orm_accesses,
+        lambda db, limit: ResourceRepository(db).get_all(limit).items,
+    ),
+)
+
+
+def measure(
+    serializer: ListSerializer, load: Loader, limit: int, repeat: int
+) -> Tuple[int, float, float, float]:
+    """
+    Carga y valida la primera página `repeat` veces con sesiones nuevas.
+
+    Cada medición se hace dos veces: una sin tracemalloc para el tiempo y otra
+    con él para la memoria.
+
+    Args:
+        serializer (ListSerializer): Serializador del modelo de respuesta
+        load (Loader): Carga la página con la sesión dada
+        limit (int): Tamaño de la página
+        repeat (int): Número de mediciones
+
+    Returns:
+        Tuple[int, float, float, float]: Elementos de la página, pico de bytes
+            por elemento, bytes retenidos por elemento y segundos por página
+            (mínimos de las mediciones)
+    """
+    peaks, retained, seconds = [], [], []
+    rows = 0
+    for _ in range(repeat):
+        for traced in (False, True):
+            db = create_new_db_session()
+            try:
+                # Conexión ya abierta: no contar la del pool
+                db.connection()
+                gc.collect()
+                if traced:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                items = load(db, limit)
+                loaded = tracemalloc.get_traced_memory()[0] if traced else 0
+                serializer.adapter.validate_python(items, from_attributes=True)
+                elapsed = time.perf_counter() - start
+                if traced:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+            finally:
+                db.close()
+
+            rows = len(items) or 1
+            if traced:
+                peaks.append(peak / rows)
+                retained.append(loaded / rows)
+            else:
+                seconds.append(elapsed)
+            del items
+    return rows, min(peaks), min(retained), min(seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=100, help="Tamaño de página")
+    parser.add_argument("--repeat", type=int, default=5, help="Mediciones por caso")
+    args = parser.parse_args()
+
+    print(
+        f"{'listado':<20} {'camino':<6} {'filas':>6} {'pico B/fila':>12} "
+        f"{'retenido B/fila':>16} {'ms/página':>10}"
+    )
+    for name, serializer, orm_load, core_load in LISTS:
+        results = {}
+        for label, load in (("ORM", orm_load), ("Core", core_load)):
+            rows, peak, retained, seconds = measure(
+                serializer, load, args.limit, args.repeat
+            )
+            results[label] = peak
+            print(
+                f"{name:<20} {label:<6} {rows:>6} {peak:>12.0f} "
+                f"{retained:>16.0f} {seconds * 1000:>10.1f}"
+            )
+        if results["Core"]:
+            print(f"{'':<20} pico ORM / Core: {results['ORM'] / results['Core']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
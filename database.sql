@@ -1,3 +1,14 @@
+-- Búsqueda de texto completo sin distinguir acentos
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+ALTER TEXT SEARCH CONFIGURATION es_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+
+CREATE TEXT SEARCH CONFIGURATION en_unaccent (COPY = english);
+ALTER TEXT SEARCH CONFIGURATION en_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, english_stem;
+
 -- Tabla de roles
 CREATE TABLE roles (
     role_name VARCHAR(10) PRIMARY KEY CHECK (role_name IN ('USER', 'EMPLOYEE'))
@@ -48,6 +59,16 @@ CREATE TABLE product_lan_contents (
     lan VARCHAR(5),
     name VARCHAR(255) NOT NULL,
     description TEXT,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        CASE lan
+            WHEN 'en-US' THEN
+                setweight(to_tsvector('en_unaccent', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('en_unaccent', coalesce(description, '')), 'B')
+            ELSE
+                setweight(to_tsvector('es_unaccent', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent', coalesce(description, '')), 'B')
+        END
+    ) STORED,
     FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE,
     FOREIGN KEY (lan) REFERENCES languages(language_code)
 );
@@ -68,6 +89,16 @@ CREATE TABLE blog_lan_contents (
     lan VARCHAR(5),
     title VARCHAR(255) NOT NULL,
     description TEXT,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        CASE lan
+            WHEN 'en-US' THEN
+                setweight(to_tsvector('en_unaccent', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('en_unaccent', coalesce(description, '')), 'B')
+            ELSE
+                setweight(to_tsvector('es_unaccent', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent', coalesce(description, '')), 'B')
+        END
+    ) STORED,
     FOREIGN KEY (blog_id) REFERENCES blogs(id) ON DELETE CASCADE,
     FOREIGN KEY (lan) REFERENCES languages(language_code)
 );
@@ -121,17 +152,42 @@ CREATE TABLE blog_request_comments (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
 );
 
--- Tabla de accesos a recursos
+-- Tabla de accesos a recursos, particionada por mes. La aplicación crea al
+-- arrancar las particiones del mes actual y de los siguientes
+-- (python -m app.cli.accesses partitions); mientras tanto, la partición DEFAULT
+-- recoge los accesos
 CREATE TABLE resource_accesses (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     user_id UUID,
     resource_type VARCHAR(255) NOT NULL,
     resource_id UUID NOT NULL,
     access_type VARCHAR(255) NOT NULL,
-    access_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    access_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     device_type VARCHAR(10),
+    PRIMARY KEY (id, access_date),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
     FOREIGN KEY (device_type) REFERENCES access_devices(device_type)
+) PARTITION BY RANGE (access_date);
+
+CREATE TABLE resource_accesses_default PARTITION OF resource_accesses DEFAULT;
+
+-- Contadores de accesos agregados por hora y por día (analítica)
+CREATE TABLE resource_access_hourly (
+    bucket TIMESTAMP NOT NULL,
+    resource_type VARCHAR(255) NOT NULL,
+    resource_id UUID NOT NULL,
+    device_type VARCHAR(10) NOT NULL,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, resource_type, resource_id, device_type)
+);
+
+CREATE TABLE resource_access_daily (
+    bucket TIMESTAMP NOT NULL,
+    resource_type VARCHAR(255) NOT NULL,
+    resource_id UUID NOT NULL,
+    device_type VARCHAR(10) NOT NULL,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, resource_type, resource_id, device_type)
 );
 
 -- Tabla de foros
@@ -163,6 +219,32 @@ CREATE TABLE thread_comments (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
 );
 
+-- Índices para la paginación por cursor (creation_date, id)
+CREATE INDEX ix_users_creation_date_id ON users (creation_date, id);
+CREATE INDEX ix_products_creation_date_id ON products (creation_date, id);
+CREATE INDEX ix_blogs_creation_date_id ON blogs (creation_date, id);
+CREATE INDEX ix_product_requests_creation_date_id ON product_requests (creation_date, id);
+CREATE INDEX ix_blog_requests_creation_date_id ON blog_requests (creation_date, id);
+CREATE INDEX ix_resource_accesses_access_date_id ON resource_accesses (access_date, id);
+CREATE INDEX ix_resource_accesses_id ON resource_accesses (id);
+CREATE INDEX ix_threads_region_id_creation_date_id ON threads (region_id, creation_date, id);
+
+-- Índices GIN para la búsqueda de texto completo
+CREATE INDEX ix_product_lan_contents_search_vector ON product_lan_contents USING GIN (search_vector);
+CREATE INDEX ix_blog_lan_contents_search_vector ON blog_lan_contents USING GIN (search_vector);
+
+-- Índices sobre claves foráneas y columnas de filtro
+CREATE INDEX ix_blog_comments_blog_id_creation_date_id ON blog_comments (blog_id, creation_date, id);
+CREATE INDEX ix_thread_comments_thread_id ON thread_comments (thread_id);
+CREATE INDEX ix_product_regions_region_code ON product_regions (region_code, product_id);
+CREATE INDEX ix_product_lan_contents_product_id ON product_lan_contents (product_id);
+CREATE INDEX ix_blog_lan_contents_blog_id ON blog_lan_contents (blog_id);
+CREATE INDEX ix_resource_accesses_user_id ON resource_accesses (user_id);
+CREATE INDEX ix_resource_accesses_resource ON resource_accesses (resource_type, resource_id);
+CREATE UNIQUE INDEX ix_users_email_lower ON users (lower(email));
+CREATE INDEX ix_resource_access_hourly_resource ON resource_access_hourly (resource_type, resource_id, bucket);
+CREATE INDEX ix_resource_access_daily_resource ON resource_access_daily (resource_type, resource_id, bucket);
+
 -- Insertar datos iniciales
 INSERT INTO roles (role_name) VALUES ('USER'), ('EMPLOYEE');
 INSERT INTO languages (language_code) VALUES ('es-ES'), ('en-US');
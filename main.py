@@ -3,17 +3,34 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import HTTPBearer
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 
 # from app.database import Database, create_mock_data
+from app.config.settings import get_settings
+from app.db.connection import engine
+from app.db.partitions import ensure_partitions
 from app.models import AccessDevice
-from app.routers import blogs, forums, products, requests, users
-from app.services.logger_service import LoggerService
+from app.repository.blog_repository import apply_like_deltas
+from app.repository.pagination import InvalidCursor
+from app.repository.resource_repository import apply_rollup_deltas
+from app.routers import analytics, blogs, forums, products, requests, users
+from app.routers.pagination import NEXT_CURSOR_HEADER
+from app.services.forum_registry import refresh_forum_registry
+from app.services.like_aggregator import get_like_aggregator
+from app.services.logger_service import get_logger_service
+from app.services.metrics import METRICS_PATH, MetricsMiddleware, get_metrics
+from app.services.password_service import shutdown_hash_executor
+from app.services.response_cache import ResponseCacheMiddleware, get_response_cache
+from app.services.rollup_aggregator import get_rollup_aggregator
 
 security = HTTPBearer()
+settings = get_settings()
 
 # Inicializar el servicio de logs
-logger = LoggerService()
+logger = get_logger_service()
 
 # Asegurar que el directorio logs existe
 os.makedirs("logs", exist_ok=True)
@@ -25,7 +42,68 @@ async def lifespan(app: FastAPI):
     """Manejador de eventos del ciclo de vida de la aplicación."""
     # Inicializar datos mock al arrancar
     # create_mock_data()
-    yield
+
+    # Escribir los logs por lotes desde una tarea en segundo plano
+    if settings.log_buffered:
+        await logger.start(
+            max_queue_size=settings.log_queue_size,
+            batch_size=settings.log_batch_size,
+            flush_interval=settings.log_flush_interval,
+            overflow=settings.log_overflow_policy,
+        )
+
+    # Cargar los foros por región (datos de referencia) una sola vez
+    try:
+        await refresh_forum_registry()
+    except SQLAlchemyError as e:
+        # Se reintentará en la primera petición que los necesite
+        logger.log(
+            entry={
+                "error": "Error al cargar el registro de foros",
+                "details": str(e),
+            },
+            filename="db_errors",
+        )
+
+    # Preparar las particiones mensuales de resource_accesses
+    try:
+        await run_in_threadpool(
+            ensure_partitions, engine, settings.access_partitions_ahead
+        )
+    except SQLAlchemyError as e:
+        # Mientras tanto, los accesos van a la partición DEFAULT
+        logger.log(
+            entry={
+                "error": "Error al crear las particiones de accesos",
+                "details": str(e),
+            },
+            filename="db_errors",
+        )
+
+    # Acumular los likes de comentarios y escribirlos por lotes
+    like_aggregator = get_like_aggregator()
+    if settings.like_write_behind:
+        await like_aggregator.start(
+            apply_like_deltas, interval=settings.like_flush_interval
+        )
+
+    # Acumular los contadores de accesos por hora y escribirlos por lotes
+    rollup_aggregator = get_rollup_aggregator()
+    if settings.access_rollup_write_behind:
+        await rollup_aggregator.start(
+            apply_rollup_deltas, interval=settings.access_rollup_flush_interval
+        )
+
+    try:
+        yield
+    finally:
+        # Escribir los likes y contadores pendientes antes de apagar
+        await like_aggregator.stop()
+        await rollup_aggregator.stop()
+        # Esperar a que terminen los procesos de bcrypt sin bloquear el bucle
+        await run_in_threadpool(shutdown_hash_executor)
+        # Vaciar la cola de logs antes de apagar
+        await logger.stop()
 
 
 # Inicializar la aplicación FastAPI
@@ -38,6 +116,10 @@ app = FastAPI(
     redoc_url="/api/v1/redoc",
 )
 
+# Cachear los GET del catálogo (dentro de CORS: sus cabeceras dependen del origen)
+if settings.response_cache_enabled:
+    app.add_middleware(ResponseCacheMiddleware, cache=get_response_cache())
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +127,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "X-Cache", "Server-Timing"],
 )
 
 # Incluir routers
@@ -53,6 +136,14 @@ app.include_router(products.router, prefix="/api/v1")
 app.include_router(blogs.router, prefix="/api/v1")
 app.include_router(requests.router, prefix="/api/v1")
 app.include_router(forums.router, prefix="/api/v1")
+app.include_router(analytics.router, prefix="/api/v1")
+
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    """Responde 400 cuando el cursor de paginación no es válido."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 
 # Configurar seguridad global
 app.swagger_ui_init_oauth = {"usePkceWithAuthorizationCodeGrant": True}
@@ -66,7 +157,7 @@ async def log_requests(request: Request, call_next):
     device_type = AccessDevice.MOBILE if "mobile" in user_agent else AccessDevice.WEB
 
     # Registrar el acceso usando el servicio de logs
-    logger.log_access(
+    await logger.alog_access(
         path=request.url.path,
         method=request.method,
         device_type=device_type,
@@ -75,3 +166,16 @@ async def log_requests(request: Request, call_next):
 
     response = await call_next(request)
     return response
+
+
+# Medir cada petición (el último middleware añadido es el más externo: incluye
+# el registro de accesos y la caché de respuestas)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, metrics=get_metrics())
+
+    @app.get(METRICS_PATH, include_in_schema=False)
+    async def metrics():
+        """Métricas del proceso en el formato de texto de Prometheus."""
+        return PlainTextResponse(
+            get_metrics().render(), media_type="text/plain; version=0.0.4"
+        )
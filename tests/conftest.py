@@ -0,0 +1,76 @@
+"""
+Fixtures comunes de las pruebas.
+
+Las pruebas usan la base de datos configurada (variables `DB_*` o `.env`) y se
+omiten si no está disponible. Cada una se ejecuta dentro de una transacción
+que se deshace al terminar, así que la base de datos queda como estaba.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.connection import SessionLocal, engine
+
+# Sentencias de control de la transacción de la prueba, que no cuentan
+_TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+StatementCapture = Callable[[], ContextManager[List[str]]]
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Engine:
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as e:
+        pytest.skip(f"Base de datos no disponible: {e.orig}")
+    return engine
+
+
+@pytest.fixture
+def db(db_engine: Engine) -> Iterator[Session]:
+    """Sesión como las de la API dentro de una transacción que se deshace."""
+    with db_engine.connect() as conn:
+        transaction = conn.begin()
+        # Los commit() de los repositorios solo liberan savepoints
+        session = SessionLocal(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+@pytest.fixture
+def statements(db: Session) -> StatementCapture:
+    """
+    Captura las sentencias SQL que envía `db` dentro de un bloque `with`.
+
+    Uso:
+        with statements() as sent:
+            repository.search(...)
+        assert len(sent) == 3
+    """
+
+    @contextmanager
+    def capture() -> Iterator[List[str]]:
+        captured: List[str] = []
+        conn = db.connection()
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+                captured.append(statement)
+
+        event.listen(conn, "before_cursor_execute", listener)
+        try:
+            yield captured
+        finally:
+            event.remove(conn, "before_cursor_execute", listener)
+
+    return capture
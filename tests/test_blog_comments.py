@@ -0,0 +1,68 @@
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db.schemas.models import BlogComment
+from app.models import (
+    BlogLanContent,
+    CreateBlog,
+    CreateBlogComment,
+    CreateProductBase,
+    Language,
+    Role,
+    UserRegister,
+)
+from app.repository.blog_repository import BlogRepository
+from app.repository.product_repository import ProductRepository
+from app.repository.user_repository import UserRepository
+
+
+def test_comments_of_deleted_users_do_not_shorten_pages(db: Session):
+    suffix = uuid.uuid4().hex[:12]
+    user = UserRepository(db).create(
+        UserRegister(
+            email=f"blog-comments-{suffix}@example.com",
+            nick_name=f"blog-comments-{suffix}",
+            role=Role.USER,
+            password="-",
+        ),
+        hashed_password="-",
+    )
+    product = ProductRepository(db).create(CreateProductBase(image="-", regions=[]))
+    repository = BlogRepository(db)
+    blog = repository.create(
+        CreateBlog(
+            productId=product.id,
+            contents=[
+                BlogLanContent(
+                    blog_id=uuid.uuid4(), lan=Language.ES, title="-", description="-"
+                )
+            ],
+        )
+    )
+    comments = [
+        repository.add_comment(
+            blog.id, CreateBlogComment(userId=user.id, comment=str(i)), user.id
+        )
+        for i in range(5)
+    ]
+    # Los dos más recientes, de un usuario ya borrado
+    db.execute(
+        update(BlogComment)
+        .where(BlogComment.id.in_([comment.id for comment in comments[-2:]]))
+        .values(user_id=None)
+    )
+    remaining = {comment.id for comment in comments[:3]}
+
+    first = repository.get_comments(blog.id, 2)
+    assert len(first.items) == 2 and first.next_cursor
+    second = repository.get_comments(blog.id, 2, first.next_cursor)
+    assert {c["id"] for c in first.items + second.items} == remaining
+
+    blog_detail, _ = repository.get_detail(blog.id, 3)
+    assert {c["id"] for c in blog_detail["comments"]} == remaining
+
+    listed = repository.get_all(100, comments_limit=3)
+    (embedded,) = [item for item in listed.items if item["id"] == blog.id]
+    assert {c["id"] for c in embedded["comments"]} == remaining
@@ -0,0 +1,142 @@
+import threading
+import types
+import uuid
+from typing import Iterator, List
+from uuid import UUID
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+import app.repository.blog_repository as blog_repository_module
+from app.db.connection import SessionLocal, unit_of_work
+from app.db.schemas.models import Blog, BlogComment
+from app.models import (
+    BlogLanContent,
+    CreateBlog,
+    CreateBlogComment,
+    CreateProductBase,
+    Language,
+    Role,
+    UserRegister,
+)
+from app.repository.blog_repository import BlogRepository
+from app.repository.product_repository import ProductRepository
+from app.repository.user_repository import UserRepository
+
+
+def create_comment(db: Session) -> BlogComment:
+    suffix = uuid.uuid4().hex[:12]
+    user = UserRepository(db).create(
+        UserRegister(
+            email=f"likes-{suffix}@example.com",
+            nick_name=f"likes-{suffix}",
+            role=Role.USER,
+            password="-",
+        ),
+        hashed_password="likes",
+    )
+    product = ProductRepository(db).create(
+        CreateProductBase(image="likes", regions=["ES"])
+    )
+    blog = BlogRepository(db).create(
+        CreateBlog(
+            productId=product.id,
+            contents=[
+                BlogLanContent(
+                    blog_id=uuid.uuid4(),
+                    lan=Language.ES,
+                    title="likes",
+                    description="-",
+                )
+            ],
+        )
+    )
+    return BlogRepository(db).add_comment(
+        blog.id, CreateBlogComment(userId=user.id, comment="-"), user.id
+    )
+
+
+@pytest.fixture
+def committed_comment(db_engine: Engine) -> Iterator[BlogComment]:
+    """Comentario confirmado, visible desde otras conexiones; se borra al terminar."""
+    with unit_of_work() as db:
+        comment = create_comment(db)
+        db.flush()
+        db.expunge(comment)
+    try:
+        yield comment
+    finally:
+        with unit_of_work() as db:
+            product_id = (
+                db.query(Blog.product_id).filter(Blog.id == comment.blog_id).scalar()
+            )
+            ProductRepository(db).delete(product_id)
+            UserRepository(db).delete(comment.user_id)
+
+
+def test_concurrent_likes_are_not_lost(committed_comment: BlogComment):
+    workers, likes_per_worker = 4, 25
+    start = threading.Barrier(workers)
+    errors: List[BaseException] = []
+
+    def like(comment_id: UUID, user_id: UUID) -> None:
+        try:
+            start.wait()
+            for _ in range(likes_per_worker):
+                # Una transacción por like, como cada petición de la API
+                with unit_of_work() as db:
+                    assert BlogRepository(db).like_comment(comment_id, user_id)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(
+            target=like, args=(committed_comment.id, committed_comment.user_id)
+        )
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    with SessionLocal() as db:
+        n_likes = (
+            db.query(BlogComment.n_likes)
+            .filter(BlogComment.id == committed_comment.id)
+            .scalar()
+        )
+    assert n_likes == committed_comment.n_likes + workers * likes_per_worker
+
+
+@pytest.fixture
+def like_aggregator(monkeypatch) -> types.SimpleNamespace:
+    added: List[UUID] = []
+    aggregator = types.SimpleNamespace(running=True, add=added.append, added=added)
+    monkeypatch.setattr(
+        blog_repository_module, "get_like_aggregator", lambda: aggregator
+    )
+    return aggregator
+
+
+def test_write_behind_like_waits_for_commit(db: Session, like_aggregator):
+    comment = create_comment(db)
+    db.commit()
+
+    assert BlogRepository(db).like_comment(comment.id, comment.user_id)
+    assert like_aggregator.added == []
+
+    db.commit()
+    assert like_aggregator.added == [comment.id]
+
+
+def test_write_behind_like_is_discarded_on_rollback(db: Session, like_aggregator):
+    comment = create_comment(db)
+    db.commit()
+
+    BlogRepository(db).like_comment(comment.id, comment.user_id)
+    db.rollback()
+
+    assert like_aggregator.added == []
@@ -0,0 +1,41 @@
+import asyncio
+import json
+import threading
+
+from app.services.logger_service import LoggerService
+
+
+def read_entries(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_buffered_entries_are_written_on_stop(tmp_path):
+    logger = LoggerService(base_dir=str(tmp_path))
+
+    async def run() -> None:
+        await logger.start(batch_size=100, flush_interval=60)
+        logger.log({"n": 1}, "test")
+        # Desde un hilo del threadpool se delega al bucle
+        thread = threading.Thread(target=logger.log, args=({"n": 2}, "test"))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        assert not (tmp_path / "test.txt").exists()
+        await logger.stop()
+
+    asyncio.run(run())
+    assert sorted(entry["n"] for entry in read_entries(tmp_path / "test.txt")) == [1, 2]
+
+
+def test_submit_without_loop_writes_synchronously(tmp_path):
+    # Un hilo que registra justo cuando stop() ha dejado _loop a None
+    logger = LoggerService(base_dir=str(tmp_path))
+    logger._submit(("test", {"n": 1}))
+
+    # ... o con el bucle ya cerrado
+    loop = asyncio.new_event_loop()
+    loop.close()
+    logger._loop = loop
+    logger._submit(("test", {"n": 2}))
+
+    assert [entry["n"] for entry in read_entries(tmp_path / "test.txt")] == [1, 2]
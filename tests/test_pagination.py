@@ -0,0 +1,93 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import DateTime, Integer, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.repository.pagination import (
+    InvalidCursor,
+    SortOrder,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from main import app
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    creation_date: Mapped[datetime] = mapped_column(DateTime)
+
+
+def raw_cursor(payload) -> str:
+    encoded = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    values = [datetime(2024, 2, 29, 23, 59, 59, 123456), uuid.uuid4()]
+    cursor = encode_cursor("newest", values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "newest", [datetime, uuid.UUID]) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        raw_cursor(["no", "es", "un", "objeto"]),
+        raw_cursor({"s": "newest"}),
+        raw_cursor({"s": "newest", "k": ["2024-01-01T00:00:00", "no-es-un-uuid"]}),
+        raw_cursor({"s": "newest", "k": ["ayer", str(uuid.uuid4())]}),
+        raw_cursor({"s": "newest", "k": ["2024-01-01T00:00:00"]}),
+        # Cursor de otro orden: las claves no significan lo mismo
+        raw_cursor({"s": "oldest", "k": ["2024-01-01T00:00:00", str(uuid.uuid4())]}),
+    ],
+    ids=["base64", "json", "keys", "uuid", "date", "length", "order"],
+)
+def test_malformed_or_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "newest", [datetime, uuid.UUID])
+
+
+@pytest.mark.parametrize("sort", list(SortOrder))
+def test_equal_timestamps_are_ordered_by_id(sort):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    same = datetime(2024, 1, 1)
+    with Session(engine) as db:
+        db.add_all(
+            [Item(id=id, creation_date=same) for id in (3, 1, 4, 2)]
+            + [Item(id=5, creation_date=datetime(2024, 1, 2))]
+        )
+        db.flush()
+
+        seen, cursor = [], None
+        while True:
+            page = paginate(
+                db.query(Item), (Item.creation_date, Item.id), 2, cursor, sort
+            )
+            seen += [item.id for item in page.items]
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+    # Ninguna fila se repite ni se salta entre páginas con la misma fecha
+    expected = [5, 4, 3, 2, 1] if sort.descending else [1, 2, 3, 4, 5]
+    assert seen == expected
+
+
+def test_invalid_cursor_is_a_bad_request():
+    # Sin lifespan: el cursor se rechaza antes de consultar la base de datos
+    response = TestClient(app).get("/api/v1/products", params={"cursor": "x"})
+    assert response.status_code == 400
@@ -0,0 +1,99 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.partitions import (
+    DEFAULT_PARTITION,
+    _create_partition,
+    add_months,
+    list_partitions,
+    month_start,
+    partition_name,
+    retention_cutoff,
+)
+from app.db.schemas.models import ResourceAccess
+from app.models import AccessDevice
+
+# Mes muy lejano, sin partición propia en ninguna base de datos de pruebas
+FAR_MONTH = date(2999, 12, 1)
+
+
+@pytest.mark.parametrize(
+    "value, months, expected",
+    [
+        (date(2024, 1, 31), 1, date(2024, 2, 1)),
+        (date(2024, 11, 15), 1, date(2024, 12, 1)),
+        (date(2024, 12, 1), 1, date(2025, 1, 1)),
+        (date(2024, 1, 1), -1, date(2023, 12, 1)),
+        (date(2024, 3, 31), -14, date(2023, 1, 1)),
+        (date(2024, 6, 30), 0, date(2024, 6, 1)),
+    ],
+)
+def test_add_months_returns_the_first_day_of_the_month(value, months, expected):
+    assert add_months(value, months) == expected
+
+
+def test_month_start_and_partition_name():
+    assert month_start(date(2024, 2, 29)) == date(2024, 2, 1)
+    assert partition_name(date(2024, 2, 1)) == "resource_accesses_y2024m02"
+    assert partition_name(date(2025, 12, 1)) == "resource_accesses_y2025m12"
+
+
+@pytest.mark.parametrize(
+    "today, retention_months, expected",
+    [
+        (date(2024, 5, 20), 12, datetime(2023, 5, 1)),
+        (date(2024, 5, 1), 0, datetime(2024, 5, 1)),
+        (date(2024, 1, 31), 1, datetime(2023, 12, 1)),
+    ],
+)
+def test_retention_keeps_the_current_month_and_full_months_before(
+    today, retention_months, expected
+):
+    assert retention_cutoff(today, retention_months) == expected
+
+
+def insert_access(db: Session, access_date: datetime) -> ResourceAccess:
+    access = ResourceAccess(
+        resource_type="product",
+        resource_id=uuid.uuid4(),
+        access_type="GET",
+        access_date=access_date,
+        device_type=AccessDevice.WEB,
+    )
+    db.add(access)
+    db.flush()
+    return access
+
+
+def stored_in(db: Session, access: ResourceAccess) -> str:
+    return db.execute(
+        text("SELECT tableoid::regclass::text FROM resource_accesses WHERE id = :id"),
+        {"id": access.id},
+    ).scalar_one()
+
+
+def test_new_partition_takes_its_rows_from_the_default_partition(db: Session):
+    name = partition_name(FAR_MONTH)
+    first = insert_access(db, datetime(2999, 12, 1))
+    last = insert_access(db, datetime(2999, 12, 31, 23, 59, 59))
+    next_month = insert_access(db, datetime(3000, 1, 1))
+    assert {stored_in(db, a) for a in (first, last, next_month)} == {DEFAULT_PARTITION}
+
+    conn = db.connection()
+    _create_partition(conn, name, FAR_MONTH, add_months(FAR_MONTH, 1))
+
+    assert stored_in(db, first) == name
+    assert stored_in(db, last) == name
+    assert stored_in(db, next_month) == DEFAULT_PARTITION
+
+    # Los accesos nuevos del mes ya van directamente a su partición
+    assert stored_in(db, insert_access(db, datetime(2999, 12, 15))) == name
+
+    partitions = {partition.name: partition for partition in list_partitions(conn)}
+    assert DEFAULT_PARTITION not in partitions
+    assert partitions[name].start == datetime(2999, 12, 1)
+    assert partitions[name].end == datetime(3000, 1, 1)
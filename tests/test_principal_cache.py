@@ -0,0 +1,153 @@
+import types
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+import app.repository.user_repository as user_repository_module
+import app.services.principal_cache as principal_cache_module
+from app.models import Role, UserRegister
+from app.repository.user_repository import UserRepository
+from app.services.principal_cache import PrincipalCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(
+        principal_cache_module, "time", types.SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+def cached(cache: PrincipalCache, email: str, principal: object = None) -> object:
+    principal = principal or object()
+    cache.set(email, principal, cache.generation)
+    return principal
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PrincipalCache(max_size=10, ttl=30)
+    principal = cached(cache, "a@example.com")
+
+    clock.now += 29
+    assert cache.get("a@example.com") is principal
+    clock.now += 2
+    assert cache.get("a@example.com") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(max_size=2, ttl=30)
+    first = cached(cache, "a@example.com")
+    cached(cache, "b@example.com")
+
+    # Leer "a" la deja como la más reciente: sale "b"
+    assert cache.get("a@example.com") is first
+    cached(cache, "c@example.com")
+
+    assert cache.get("b@example.com") is None
+    assert cache.get("a@example.com") is first
+    assert cache.stats()["size"] == 2
+
+
+def test_hits_and_misses_are_counted():
+    cache = PrincipalCache(max_size=10, ttl=30)
+    cache.get("a@example.com")
+    cached(cache, "a@example.com")
+    cache.get("a@example.com")
+    cache.get("a@example.com")
+
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_reads_taken_before_an_invalidation_are_not_cached():
+    cache = PrincipalCache(max_size=10, ttl=30)
+    generation = cache.generation
+    cache.invalidate("a@example.com")
+    cache.set("a@example.com", object(), generation)
+
+    assert cache.get("a@example.com") is None
+
+
+def test_zero_size_disables_the_cache():
+    cache = PrincipalCache(max_size=0, ttl=30)
+    cached(cache, "a@example.com")
+
+    assert not cache.enabled
+    assert cache.get("a@example.com") is None
+
+
+@pytest.fixture
+def cache(monkeypatch) -> PrincipalCache:
+    cache = PrincipalCache(max_size=10, ttl=30)
+    monkeypatch.setattr(user_repository_module, "get_principal_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def user(db: Session):
+    suffix = uuid.uuid4().hex[:12]
+    user = UserRepository(db).create(
+        UserRegister(
+            email=f"principal-cache-{suffix}@example.com",
+            nick_name=f"principal-cache-{suffix}",
+            role=Role.USER,
+            password="-",
+        ),
+        hashed_password="principal-cache",
+    )
+    db.commit()
+    return user
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda repository, user: repository.update(user.id, {"image": "other"}),
+        lambda repository, user: repository.block_user(user.id),
+        lambda repository, user: repository.unblock_user(user.id),
+        lambda repository, user: repository.delete(user.id),
+    ],
+    ids=["update", "block_user", "unblock_user", "delete"],
+)
+def test_user_writes_invalidate_after_commit(db: Session, cache, user, write):
+    email = user.email
+    cached(cache, email)
+
+    write(UserRepository(db), user)
+    # Hasta el commit otras peticiones siguen viendo el valor confirmado
+    assert cache.get(email) is not None
+
+    db.commit()
+    assert cache.get(email) is None
+
+
+def test_email_change_invalidates_both_emails(db: Session, cache, user):
+    previous_email = user.email
+    new_email = f"renamed-{previous_email}"
+    cached(cache, previous_email)
+    cached(cache, new_email)
+
+    UserRepository(db).update(user.id, {"email": new_email})
+    db.commit()
+
+    assert cache.get(previous_email) is None
+    assert cache.get(new_email) is None
+
+
+def test_rolled_back_writes_keep_the_cache(db: Session, cache, user):
+    principal = cached(cache, user.email)
+
+    UserRepository(db).block_user(user.id)
+    db.rollback()
+
+    assert cache.get(user.email) is principal
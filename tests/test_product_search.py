@@ -0,0 +1,86 @@
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import ImportProduct, ImportProductContent, Language
+from app.repository.product_repository import ProductRepository
+from app.services.search_service import get_search_service
+
+# Productos del catálogo grande; caben en una sola página
+MANY = 25
+
+
+@dataclass
+class Catalog:
+    region: str
+    word: str
+    product_ids: List[uuid.UUID]
+
+
+def import_catalog(db: Session, count: int) -> Catalog:
+    # Región y palabra propias: cada búsqueda encuentra solo este catálogo
+    word = "".join(chr(ord("a") + int(digit, 16)) for digit in uuid.uuid4().hex[:12])
+    region = f"T{uuid.uuid4().hex[:9]}"
+    products = [
+        ImportProduct(
+            regions=[region],
+            contents=[
+                ImportProductContent(
+                    lan=Language.ES, name=f"{word} {index}", description="prueba"
+                ),
+                ImportProductContent(
+                    lan=Language.EN, name=f"{word} {index}", description="test"
+                ),
+            ],
+        )
+        for index in range(count)
+    ]
+    product_ids = ProductRepository(db).import_products(products)
+
+    # Lo que hace el import tras el commit (con el motor en memoria)
+    search_service = get_search_service()
+    for product_id, product in zip(product_ids, products):
+        search_service.index_product_contents(
+            product_id,
+            product.regions,
+            [(c.lan.value, c.name, c.description) for c in product.contents],
+        )
+    return Catalog(region=region, word=word, product_ids=product_ids)
+
+
+@pytest.mark.parametrize(
+    "use_text, use_region",
+    [(False, True), (True, False), (True, True)],
+    ids=["region", "text", "text+region"],
+)
+def test_search_statement_count_does_not_depend_on_result_size(
+    db: Session, statements, use_text: bool, use_region: bool
+):
+    one = import_catalog(db, 1)
+    many = import_catalog(db, MANY)
+    repository = ProductRepository(db)
+
+    def search(catalog: Catalog) -> List[Dict[str, Any]]:
+        page = repository.search(
+            name=catalog.word if use_text else None,
+            region=catalog.region if use_region else None,
+            limit=MANY * 2,
+        )
+        return page.items
+
+    # Primera búsqueda fuera de la cuenta: carga del índice en memoria
+    search(one)
+
+    with statements() as single:
+        found = search(one)
+    assert [product["id"] for product in found] == one.product_ids
+
+    with statements() as multiple:
+        found = search(many)
+    assert sorted(product["id"] for product in found) == sorted(many.product_ids)
+    assert all(len(product["productLanContents"]) == 2 for product in found)
+
+    assert len(single) == len(multiple), multiple
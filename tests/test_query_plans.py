@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.query_plans import check_query_plans
+from app.models import Role, UserRegister
+from app.repository.user_repository import UserRepository
+
+
+def test_hot_queries_use_indexes(db: Session):
+    failures = [
+        f"{result.name}: Seq Scan en {', '.join(result.sequential_scans)}"
+        for result in check_query_plans(db)
+        if not result.ok
+    ]
+    assert not failures, "\n".join(failures)
+
+
+def test_each_checked_statement_has_its_own_name(db: Session):
+    names = [result.name for result in check_query_plans(db)]
+    assert len(set(names)) == len(names)
+
+
+def test_email_is_unique_ignoring_case(db: Session):
+    repository = UserRepository(db)
+    user = UserRegister(
+        email="Plan.Check@Example.com",
+        nick_name="plan-check-1",
+        role=Role.USER,
+        password="-",
+    )
+    created = repository.create(user, hashed_password="-")
+    assert repository.get_by_email("plan.check@example.com").id == created.id
+
+    duplicate = user.model_copy(
+        update={"email": "plan.check@example.com", "nick_name": "plan-check-2"}
+    )
+    with pytest.raises(IntegrityError):
+        repository.create(duplicate, hashed_password="-")
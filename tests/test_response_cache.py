@@ -0,0 +1,233 @@
+import asyncio
+import types
+from typing import List, Tuple
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+import app.repository.product_repository as product_repository_module
+import app.services.response_cache as response_cache_module
+from app.models import CreateProductBase
+from app.repository.product_repository import ProductRepository
+from app.services.response_cache import (
+    TAG_PRODUCTS,
+    CachedResponse,
+    ResponseCache,
+    ResponseCacheMiddleware,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(
+        response_cache_module, "time", types.SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+class Catalog:
+    """Aplicación de prueba que cuenta cuántas veces se genera cada respuesta."""
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.renders = 0
+        self.fail = False
+        self.app = Starlette(routes=[Route("/api/v1/products", self.products)])
+
+    async def products(self, request: Request) -> JSONResponse:
+        self.renders += 1
+        if self.fail:
+            raise RuntimeError("catálogo no disponible")
+        return JSONResponse({"version": self.version, "query": str(request.url.query)})
+
+
+def run(
+    middleware: ResponseCacheMiddleware, *requests: Tuple[str, dict]
+) -> List[httpx.Response]:
+    """Envía las peticiones en orden y espera a las regeneraciones pendientes."""
+
+    async def send_all() -> List[httpx.Response]:
+        transport = httpx.ASGITransport(app=middleware)
+        responses = []
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            for url, headers in requests:
+                responses.append(await client.get(url, headers=headers))
+                await asyncio.gather(*middleware._background)
+        return responses
+
+    return asyncio.run(send_all())
+
+
+def cache_for(
+    catalog: Catalog, **kwargs
+) -> Tuple[ResponseCache, ResponseCacheMiddleware]:
+    options = {"max_bytes": 1 << 20, "ttl": 30, "stale_ttl": 60, **kwargs}
+    cache = ResponseCache(**options)
+    return cache, ResponseCacheMiddleware(catalog.app, cache=cache)
+
+
+def test_repeated_requests_share_a_stable_etag(clock):
+    catalog = Catalog()
+    _, middleware = cache_for(catalog)
+
+    first, second, reordered = run(
+        middleware,
+        ("/api/v1/products?a=1&b=2", {}),
+        ("/api/v1/products?a=1&b=2", {}),
+        ("/api/v1/products?b=2&a=1", {}),
+    )
+
+    assert [r.headers["x-cache"] for r in (first, second, reordered)] == [
+        "MISS",
+        "HIT",
+        "HIT",
+    ]
+    assert first.headers["etag"] == second.headers["etag"] == reordered.headers["etag"]
+    assert second.content == first.content
+    assert catalog.renders == 1
+
+
+def test_if_none_match_gets_not_modified(clock):
+    catalog = Catalog()
+    _, middleware = cache_for(catalog)
+    (first,) = run(middleware, ("/api/v1/products", {}))
+    etag = first.headers["etag"]
+
+    matching, weak, other = run(
+        middleware,
+        ("/api/v1/products", {"if-none-match": etag}),
+        ("/api/v1/products", {"if-none-match": f'"otro", W/{etag}'}),
+        ("/api/v1/products", {"if-none-match": '"otro"'}),
+    )
+
+    assert matching.status_code == 304
+    assert matching.content == b""
+    assert matching.headers["etag"] == etag
+    assert weak.status_code == 304
+    assert other.status_code == 200
+    assert other.content == first.content
+
+
+def test_stale_response_is_served_while_it_is_regenerated(clock):
+    catalog = Catalog()
+    cache, middleware = cache_for(catalog)
+    run(middleware, ("/api/v1/products", {}))
+
+    catalog.version = 2
+    clock.now += 31
+    stale, fresh = run(middleware, ("/api/v1/products", {}), ("/api/v1/products", {}))
+
+    assert stale.headers["x-cache"] == "STALE"
+    assert stale.json()["version"] == 1
+    assert fresh.headers["x-cache"] == "HIT"
+    assert fresh.json()["version"] == 2
+    assert catalog.renders == 2
+
+    # Pasado también el margen se regenera antes de responder
+    clock.now += 91
+    (expired,) = run(middleware, ("/api/v1/products", {}))
+    assert expired.headers["x-cache"] == "MISS"
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_failed_regeneration_keeps_the_stale_response(clock, monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        response_cache_module,
+        "get_logger_service",
+        lambda: types.SimpleNamespace(
+            log=lambda entry, filename: logged.append(filename)
+        ),
+    )
+    catalog = Catalog()
+    _, middleware = cache_for(catalog)
+    run(middleware, ("/api/v1/products", {}))
+
+    catalog.fail = True
+    clock.now += 31
+    stale, again = run(middleware, ("/api/v1/products", {}), ("/api/v1/products", {}))
+
+    assert stale.status_code == again.status_code == 200
+    assert again.headers["x-cache"] == "STALE"
+    assert logged == ["db_errors", "db_errors"]
+
+
+def test_uncacheable_responses_pass_through(clock):
+    catalog = Catalog()
+
+    async def private(request: Request) -> PlainTextResponse:
+        response = PlainTextResponse("privado")
+        response.set_cookie("session", "1")
+        return response
+
+    catalog.app.add_route("/api/v1/products/private", private)
+    _, middleware = cache_for(catalog)
+
+    first, second = run(
+        middleware, ("/api/v1/products/private", {}), ("/api/v1/products/private", {})
+    )
+
+    assert "x-cache" not in first.headers
+    assert "x-cache" not in second.headers
+
+
+def entry(size: int, tag: str = TAG_PRODUCTS) -> CachedResponse:
+    return CachedResponse(
+        status=200, headers=[], body=b"x" * size, etag='"x"', tag=tag, stored_at=0
+    )
+
+
+def test_least_recently_used_responses_are_evicted_by_size(clock):
+    cache = ResponseCache(max_bytes=250, ttl=1e9, stale_ttl=0)
+    for key in ("a", "b"):
+        cache.set(key, entry(100), cache.generation(TAG_PRODUCTS))
+
+    cache.get("a")
+    cache.set("c", entry(100), cache.generation(TAG_PRODUCTS))
+
+    assert cache.get("b") == (None, False)
+    assert cache.get("a")[0] is not None
+    assert cache.get("c")[0] is not None
+    assert cache.stats()["bytes"] == 200
+
+    # Una respuesta mayor que toda la caché no se guarda ni expulsa nada
+    assert not cache.set("d", entry(300), cache.generation(TAG_PRODUCTS))
+    assert cache.stats()["entries"] == 2
+
+
+def test_responses_rendered_during_an_invalidation_are_not_stored(clock):
+    cache = ResponseCache(max_bytes=1000, ttl=30, stale_ttl=0)
+    generation = cache.generation(TAG_PRODUCTS)
+    cache.invalidate(TAG_PRODUCTS)
+
+    assert not cache.set("a", entry(10), generation)
+
+
+def test_writes_invalidate_their_tag_after_commit(db: Session, monkeypatch):
+    cache = ResponseCache(max_bytes=1000, ttl=1e9, stale_ttl=0)
+    monkeypatch.setattr(product_repository_module, "get_response_cache", lambda: cache)
+    cache.set("products", entry(10), cache.generation(TAG_PRODUCTS))
+    cache.set("blogs", entry(10, "blogs"), cache.generation("blogs"))
+
+    ProductRepository(db).create(CreateProductBase(image="cache", regions=["ES"]))
+    assert cache.get("products")[0] is not None
+
+    db.commit()
+    assert cache.get("products") == (None, False)
+    assert cache.get("blogs")[0] is not None
@@ -0,0 +1,139 @@
+import uuid
+from typing import Any, List
+
+import pytest
+
+from app.db.schemas.models import (
+    Blog,
+    BlogLanContent,
+    Product,
+    ProductLanContent,
+    ProductRegion,
+)
+from app.models import Language
+from app.services.search_service import InvertedIndex, MemorySearchBackend
+
+
+class EmptyCatalog:
+    """Hace de sesión para la carga inicial del índice: la base de datos está vacía."""
+
+    def execute(self, statement: Any) -> "EmptyCatalog":
+        return self
+
+    def all(self) -> List[Any]:
+        return []
+
+
+db = EmptyCatalog()
+
+
+def make_product(name: str, description: str = "", regions=("ES",), lan=Language.ES):
+    return Product(
+        id=uuid.uuid4(),
+        regions=[ProductRegion(region_code=region) for region in regions],
+        product_lan_contents=[
+            ProductLanContent(lan=lan.value, name=name, description=description)
+        ],
+    )
+
+
+@pytest.fixture
+def backend() -> MemorySearchBackend:
+    return MemorySearchBackend()
+
+
+def search(backend: MemorySearchBackend, text: str, **filters) -> List[uuid.UUID]:
+    return backend.search_products(db, text, **filters).items
+
+
+def test_matching_ignores_accents_and_case():
+    index = InvertedIndex()
+    index.add("jamon", [("Jamón ibérico de bellota", 1.0)])
+    assert set(index.search("jamon")) == {"jamon"}
+    assert set(index.search("JAMÓN IBERICO")) == {"jamon"}
+    assert index.search("bellotas") == {}
+
+
+def test_terms_match_by_prefix_and_all_are_required():
+    index = InvertedIndex()
+    index.add("jamon", [("Jamón ibérico", 1.0)])
+    index.add("queso", [("Queso ibérico", 1.0)])
+    assert set(index.search("ibe")) == {"jamon", "queso"}
+    assert set(index.search("jam ibe")) == {"jamon"}
+    # Solo prefijos, no subcadenas
+    assert index.search("amon") == {}
+
+
+def test_title_matches_rank_above_description_matches(backend):
+    in_description = make_product("Embutido", "jamón curado")
+    in_name = make_product("Jamón", "curado")
+    repeated = make_product("Jamón", "jamón de jamones")
+    for product in (in_description, in_name, repeated):
+        backend.index_product(product)
+
+    assert search(backend, "jamon") == [repeated.id, in_name.id, in_description.id]
+
+
+def test_relevance_cursor_walks_every_match_once(backend):
+    products = [make_product("Aceite", "aceite " * n) for n in range(7)]
+    for product in products:
+        backend.index_product(product)
+
+    seen, cursor = [], None
+    while True:
+        page = backend.search_products(db, "aceite", limit=3, cursor=cursor)
+        assert len(page.items) <= 3
+        seen += page.items
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    # De más a menos relevante y sin repetir ni saltar ninguno
+    assert seen == [product.id for product in reversed(products)]
+
+
+def test_filters_by_region_and_language(backend):
+    spanish = make_product("Aceite", regions=("ES-AN",))
+    english = make_product("Aceite", regions=("ES-AN", "PT"), lan=Language.EN)
+    backend.index_product(spanish)
+    backend.index_product(english)
+
+    assert set(search(backend, "aceite", region="ES-AN")) == {spanish.id, english.id}
+    assert search(backend, "aceite", region="PT") == [english.id]
+    assert search(backend, "aceite", lan=Language.ES) == [spanish.id]
+
+
+def test_index_follows_create_add_content_and_delete(backend):
+    # create: el repositorio indexa el producto tras el commit
+    product = make_product("Aceite de oliva")
+    backend.index_product(product)
+    assert search(backend, "oliva") == [product.id]
+
+    # add_content: se reindexa con el contenido nuevo
+    product.product_lan_contents.append(
+        ProductLanContent(lan=Language.EN.value, name="Olive oil", description="")
+    )
+    backend.index_product(product)
+    assert search(backend, "olive", lan=Language.EN) == [product.id]
+    assert search(backend, "oliva") == [product.id]
+
+    # delete
+    backend.remove_product(product.id)
+    assert search(backend, "oliva") == []
+    assert search(backend, "olive") == []
+
+
+def test_blog_index_follows_create_and_delete(backend):
+    blog = Blog(
+        id=uuid.uuid4(),
+        blog_lan_contents=[
+            BlogLanContent(
+                lan=Language.ES.value, title="Recetas de jamón", description="-"
+            )
+        ],
+    )
+    backend.index_blog(blog)
+    assert backend.search_blogs(db, "jamon").items == [blog.id]
+
+    backend.remove_blog(blog.id)
+    assert backend.search_blogs(db, "jamon").items == []
@@ -0,0 +1,211 @@
+"""
+Sentencias SQL de cada ruta de escritura de los repositorios.
+
+Cada escritura debe costar sus INSERT/UPDATE (más la comprobación de que existe
+la fila padre cuando la hay) sin SELECT posteriores para releer valores por
+defecto. Se cuenta también el commit de la unidad de trabajo, que aquí solo
+libera un savepoint.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Callable
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.schemas.models import Blog, Product, ResourceAccess, User
+from app.models import (
+    AccessDevice,
+    BlogLanContent,
+    CreateBlog,
+    CreateBlogComment,
+    CreateBlogRequest,
+    CreateProductBase,
+    CreateProductContent,
+    CreateProductRequest,
+    CreateResourceAccess,
+    CreateThreadComment,
+    Language,
+    Role,
+    UserRegister,
+)
+from app.repository.blog_repository import BlogRepository
+from app.repository.forum_repository import ForumRepository
+from app.repository.product_repository import ProductRepository
+from app.repository.request_repository import RequestRepository
+from app.repository.resource_repository import ResourceRepository
+from app.repository.user_repository import UserRepository
+from app.services.rollup_aggregator import get_rollup_aggregator
+
+
+def create_user(db: Session) -> User:
+    suffix = uuid.uuid4().hex[:12]
+    return UserRepository(db).create(
+        UserRegister(
+            email=f"round-trips-{suffix}@example.com",
+            nick_name=f"round-trips-{suffix}",
+            role=Role.USER,
+            password="-",
+        ),
+        hashed_password="round-trips",
+    )
+
+
+def create_product(db: Session) -> Product:
+    return ProductRepository(db).create(
+        CreateProductBase(image="round-trips", regions=["ES", "PT"])
+    )
+
+
+def create_blog(db: Session, product: Product) -> Blog:
+    return BlogRepository(db).create(
+        CreateBlog(
+            productId=product.id,
+            contents=[
+                BlogLanContent(
+                    blog_id=uuid.uuid4(),
+                    lan=Language.ES,
+                    title="round-trips",
+                    description="-",
+                )
+            ],
+        )
+    )
+
+
+def create_access(db: Session, user: User) -> ResourceAccess:
+    return ResourceRepository(db).create(
+        CreateResourceAccess(
+            userId=user.id,
+            resourceType="round-trips",
+            resourceId=uuid.uuid4(),
+            accessType="view",
+            deviceType=AccessDevice.WEB,
+        )
+    )
+
+
+@pytest.fixture
+def count_round_trips(db: Session, statements):
+    """Ejecuta una escritura y su commit y comprueba que no supera `budget` sentencias."""
+
+    def check(budget: int, call: Callable[[], Any]) -> Any:
+        with statements() as sent:
+            result = call()
+            db.commit()
+        assert len(sent) <= budget, "\n".join(" ".join(s.split()) for s in sent)
+        return result
+
+    return check
+
+
+def test_user_create(db: Session, count_round_trips):
+    count_round_trips(1, lambda: create_user(db))
+
+
+def test_product_create(db: Session, count_round_trips):
+    # INSERT del producto + INSERT (executemany) de las regiones
+    count_round_trips(2, lambda: create_product(db))
+
+
+def test_product_add_content(db: Session, count_round_trips):
+    product = create_product(db)
+    # SELECT del producto + SELECT de sus regiones y de sus contenidos (selectinload,
+    # el índice de búsqueda los necesita al publicar) + INSERT del contenido
+    count_round_trips(
+        4,
+        lambda: ProductRepository(db).add_content(
+            product.id,
+            CreateProductContent(lan=Language.ES, name="round-trips", description="-"),
+        ),
+    )
+
+
+def test_blog_create(db: Session, count_round_trips):
+    product = create_product(db)
+    count_round_trips(2, lambda: create_blog(db, product))
+
+
+def test_blog_add_comment(db: Session, count_round_trips):
+    user = create_user(db)
+    blog = create_blog(db, create_product(db))
+    # Comprobación de que existe el blog + INSERT
+    count_round_trips(
+        2,
+        lambda: BlogRepository(db).add_comment(
+            blog.id, CreateBlogComment(userId=user.id, comment="-"), user.id
+        ),
+    )
+
+
+def test_forum_create_thread_and_comment(db: Session, count_round_trips):
+    forums = ForumRepository(db).get_all_forums()
+    if not forums:
+        pytest.skip("No hay foros en la base de datos")
+    user = create_user(db)
+    thread = count_round_trips(
+        1,
+        lambda: ForumRepository(db).create_thread(
+            forums[0].region_id, Language.ES, "round-trips", "-"
+        ),
+    )
+    count_round_trips(
+        2,
+        lambda: ForumRepository(db).add_thread_comment(
+            thread.id,
+            CreateThreadComment(threadId=thread.id, userId=user.id, content="-"),
+            user.id,
+        ),
+    )
+
+
+def test_request_create_product_request(db: Session, count_round_trips):
+    user = create_user(db)
+    count_round_trips(
+        1,
+        lambda: RequestRepository(db).create_product_request(
+            CreateProductRequest(name="round-trips", userId=user.id, description="-"),
+            user.id,
+        ),
+    )
+
+
+def test_request_create_blog_request(db: Session, count_round_trips):
+    user = create_user(db)
+    product = create_product(db)
+    count_round_trips(
+        1,
+        lambda: RequestRepository(db).create_blog_request(
+            CreateBlogRequest(
+                title="round-trips",
+                productId=product.id,
+                userId=user.id,
+                description="-",
+            ),
+            user.id,
+        ),
+    )
+
+
+def test_resource_create_inline_rollups(db: Session, count_round_trips):
+    user = create_user(db)
+    # Sin la API arrancada: INSERT del acceso + UPSERT por hora y por día
+    count_round_trips(3, lambda: create_access(db, user))
+
+
+def test_resource_create_write_behind_rollups(db: Session, count_round_trips):
+    user = create_user(db)
+    applied = []
+
+    async def run() -> None:
+        rollup_aggregator = get_rollup_aggregator()
+        await rollup_aggregator.start(applied.append, interval=3600)
+        try:
+            # Solo el INSERT del acceso; los contadores quedan en memoria
+            count_round_trips(1, lambda: create_access(db, user))
+        finally:
+            await rollup_aggregator.stop()
+
+    asyncio.run(run())
+    assert [sum(deltas.values()) for deltas in applied] == [1]